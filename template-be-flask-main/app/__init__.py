@@ -0,0 +1,29 @@
+"""
+Application Package
+===================
+create_app() membangun Flask app (Student API). Flask di-import di dalam
+factory supaya package ini tetap bisa di-import oleh FastAPI app
+(app.main) tanpa dependency Flask.
+"""
+
+
+def create_app(config_class=None):
+    """
+    Application factory
+
+    Args:
+        config_class: Class konfigurasi (default: get_config() dari FLASK_ENV)
+    """
+    from flask import Flask
+
+    from config import get_config
+    from app.api import api_bp
+    from app.utils.instrumentation import init_request_instrumentation
+
+    app = Flask(__name__)
+    app.config.from_object(config_class or get_config())
+
+    init_request_instrumentation(app)
+    app.register_blueprint(api_bp, url_prefix='/api')
+
+    return app
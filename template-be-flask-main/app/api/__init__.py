@@ -12,6 +12,9 @@ Endpoints:
 
 from flask import Blueprint, jsonify
 
+from app.core.tracing import route_metrics
+from app.utils.response import success_response
+
 api_bp = Blueprint('api', __name__)
 
 
@@ -29,7 +32,7 @@ def api_info():
         'study_case': 'Student Management & GPA Prediction',
         'endpoints': {
             'students': {
-                'GET /api/students': 'Get all students',
+                'GET /api/students': 'Get students (paginated, filter & sort)',
                 'GET /api/students/<id>': 'Get student by ID',
                 'POST /api/students': 'Create new student',
                 'PUT /api/students/<id>': 'Update student',
@@ -38,13 +41,34 @@ def api_info():
             },
             'predictions': {
                 'POST /api/predict/gpa': 'Predict student GPA',
-                'POST /api/predict/batch': 'Batch GPA prediction'
+                'POST /api/predict/batch': 'Batch GPA prediction',
+                'GET /api/predict/model': 'Get active model info',
+                'POST /api/predict/model/reload': 'Hot reload model',
+                'GET /api/predict/cache': 'Prediction cache statistics',
+                'GET /api/predict/scheduler': 'Micro-batching scheduler statistics'
+            },
+            'metrics': {
+                'GET /api/metrics/routes': 'Latency per route & in-flight requests'
             }
         },
         'documentation': 'See README.md for full documentation'
     })
 
 
+@api_bp.route('/metrics/routes', methods=['GET'])
+def get_route_metrics():
+    """
+    Request Metrics
+
+    GET /api/metrics/routes
+
+    Histogram latency per route, status codes dan request in-flight.
+    Tambahkan ?profile=1 ke endpoint mana pun (development) untuk
+    folded stacks yang bisa dibuka di speedscope / flamegraph.pl.
+    """
+    return success_response(data=route_metrics.snapshot())
+
+
 # Import controllers (harus setelah blueprint definition)
 from app.api.controllers import student_controller
 from app.api.controllers import prediction_controller
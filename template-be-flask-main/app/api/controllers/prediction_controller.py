@@ -15,6 +15,7 @@ from app.api.schemas.student_schema import (
     prediction_request_schema,
     prediction_response_schema
 )
+from app.utils.exceptions import AppException
 from app.utils.response import success_response, error_response
 
 
@@ -70,6 +71,12 @@ def predict_gpa():
             status_code=400
         )
 
+    except AppException as e:
+        return error_response(
+            message=e.message,
+            status_code=e.status_code
+        )
+
     except Exception as e:
         return error_response(
             message="Gagal melakukan prediksi",
@@ -118,21 +125,20 @@ def predict_batch():
                 status_code=400
             )
 
-        # Validate each item
-        validated_data = []
-        for idx, item in enumerate(data_list):
-            try:
-                validated = prediction_request_schema.load(item)
-                validated_data.append(validated)
-            except ValidationError as e:
-                return error_response(
-                    message=f"Validasi gagal pada item index {idx}",
-                    errors=e.messages,
-                    status_code=400
-                )
-
-        # Call ML service for batch prediction
-        predictions = prediction_service.batch_predict(validated_data)
+        # Validate seluruh batch langsung ke arrays
+        try:
+            study_hours, attendance_rate = prediction_request_schema.load_batch(data_list)
+        except ValidationError as e:
+            idx, messages = next(iter(e.messages.items()))
+            return error_response(
+                message=f"Validasi gagal pada item index {idx}",
+                errors=messages,
+                status_code=400
+            )
+
+        # Call ML service for vectorized batch prediction
+        result = prediction_service.predict_arrays(study_hours, attendance_rate)
+        predictions = prediction_service.to_records(result)
 
         return success_response(
             data={'predictions': predictions, 'count': len(predictions)},
@@ -144,3 +150,124 @@ def predict_batch():
             message="Gagal melakukan batch prediction",
             status_code=500
         )
+
+
+@api_bp.route('/predict/model', methods=['GET'])
+def get_model_info():
+    """
+    Get info model aktif dan versi yang tersedia
+
+    GET /api/predict/model
+
+    Response:
+        200: Active model dan list versi di ML_MODELS_PATH
+    """
+    try:
+        registry = prediction_service.registry
+        active = registry.get()
+
+        return success_response(
+            data={
+                'active': active.to_dict(),
+                'available_versions': [version for version, _ in registry.available_versions()]
+            },
+            message="Berhasil mengambil info model"
+        )
+
+    except Exception as e:
+        return error_response(
+            message="Gagal mengambil info model",
+            status_code=500
+        )
+
+
+@api_bp.route('/predict/model/reload', methods=['POST'])
+def reload_model():
+    """
+    Hot reload model tanpa restart
+
+    POST /api/predict/model/reload
+
+    Request Body (optional):
+        {
+            "version": "string"  (default: versi terbaru)
+        }
+
+    Response:
+        200: Model baru aktif
+        400: Versi tidak ditemukan / warm-up gagal
+
+    Example:
+        curl -X POST http://localhost:5000/api/predict/model/reload \\
+             -H "Content-Type: application/json" \\
+             -d '{"version": "2.0.0"}'
+    """
+    try:
+        json_data = request.get_json(silent=True) or {}
+        loaded = prediction_service.registry.load(json_data.get('version'))
+
+        return success_response(
+            data=loaded.to_dict(),
+            message=f"Model versi {loaded.version} aktif"
+        )
+
+    except ValueError as e:
+        return error_response(
+            message=str(e),
+            status_code=400
+        )
+
+    except Exception as e:
+        return error_response(
+            message="Gagal reload model",
+            status_code=500
+        )
+
+
+@api_bp.route('/predict/cache', methods=['GET'])
+def get_cache_stats():
+    """
+    Get statistik prediction cache
+
+    GET /api/predict/cache
+
+    Response:
+        200: Size, hits, misses, hit rate
+    """
+    try:
+        return success_response(
+            data=prediction_service.cache.info(),
+            message="Berhasil mengambil statistik cache"
+        )
+
+    except Exception as e:
+        return error_response(
+            message="Gagal mengambil statistik cache",
+            status_code=500
+        )
+
+
+@api_bp.route('/predict/scheduler', methods=['GET'])
+def get_scheduler_stats():
+    """
+    Get statistik micro-batching scheduler
+
+    GET /api/predict/scheduler
+
+    Response:
+        200: Konfigurasi, queue depth dan batch size histograms
+    """
+    try:
+        scheduler = prediction_service.scheduler
+        data = scheduler.stats() if scheduler else {'enabled': False}
+
+        return success_response(
+            data=data,
+            message="Berhasil mengambil statistik scheduler"
+        )
+
+    except Exception as e:
+        return error_response(
+            message="Gagal mengambil statistik scheduler",
+            status_code=500
+        )
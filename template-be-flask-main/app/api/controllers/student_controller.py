@@ -21,28 +21,54 @@ from app.api.schemas.student_schema import (
     student_schema,
     students_schema,
     student_create_schema,
-    student_update_schema
+    student_update_schema,
+    student_list_query_schema
 )
-from app.utils.response import success_response, error_response
+from app.utils.response import success_response, error_response, paginated_response
 
 
 @api_bp.route('/students', methods=['GET'])
 def get_students():
     """
-    Get all students
+    Get students (paginated)
 
     GET /api/students
 
+    Query Parameters:
+        page: int (default 1)
+        per_page: int (default 20, max 100)
+        sort: id | name | study_hours | attendance_rate | gpa (default id)
+        order: asc | desc (default asc)
+        gpa_min, gpa_max: float (optional)
+        attendance_min, attendance_max: float (optional)
+        name: string, prefix nama (optional)
+
     Response:
-        200: List of students
+        200: List of students + pagination meta
+        400: Validation error
+
+    Example:
+        curl "http://localhost:5000/api/students?page=2&per_page=50&sort=gpa&order=desc&attendance_min=80"
     """
     try:
-        students = student_service.get_all_students()
+        params = student_list_query_schema.load(request.args)
+
+        students, total = student_service.get_students_page(**params)
         data = students_schema.dump(students)
 
-        return success_response(
-            data=data,
-            message=f"Berhasil mengambil {len(data)} students"
+        return paginated_response(
+            items=data,
+            total=total,
+            page=params['page'],
+            per_page=params['per_page'],
+            message=f"Berhasil mengambil {len(data)} dari {total} students"
+        )
+
+    except ValidationError as e:
+        return error_response(
+            message="Validasi gagal",
+            errors=e.messages,
+            status_code=400
         )
 
     except Exception as e:
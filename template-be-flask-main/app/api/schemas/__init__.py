@@ -15,6 +15,7 @@ from app.api.schemas.student_schema import (
     StudentSchema,
     StudentCreateSchema,
     StudentUpdateSchema,
+    StudentListQuerySchema,
     PredictionRequestSchema,
     PredictionResponseSchema
 )
@@ -23,6 +24,7 @@ __all__ = [
     'StudentSchema',
     'StudentCreateSchema',
     'StudentUpdateSchema',
+    'StudentListQuerySchema',
     'PredictionRequestSchema',
     'PredictionResponseSchema'
 ]
@@ -7,10 +7,25 @@ Menggunakan Marshmallow untuk validation dan serialization.
 Memisahkan representasi API dari domain model.
 """
 
-from marshmallow import Schema, fields, validate, validates, ValidationError
+import numpy as np
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError, EXCLUDE
 
+from app.core.tracing import timed
 
-class StudentSchema(Schema):
+
+class TimedSchema(Schema):
+    """Base schema: load dicatat sebagai phase validation, dump sebagai serialization"""
+
+    def load(self, *args, **kwargs):
+        with timed('validation'):
+            return super().load(*args, **kwargs)
+
+    def dump(self, *args, **kwargs):
+        with timed('serialization'):
+            return super().dump(*args, **kwargs)
+
+
+class StudentSchema(TimedSchema):
     """Schema untuk response Student (full data)"""
 
     id = fields.Int(dump_only=True)
@@ -23,7 +38,7 @@ class StudentSchema(Schema):
     updated_at = fields.DateTime(dump_only=True)
 
 
-class StudentCreateSchema(Schema):
+class StudentCreateSchema(TimedSchema):
     """
     Schema untuk create Student request
 
@@ -81,7 +96,7 @@ class StudentCreateSchema(Schema):
     )
 
 
-class StudentUpdateSchema(Schema):
+class StudentUpdateSchema(TimedSchema):
     """
     Schema untuk update Student request
     All fields optional (partial update)
@@ -119,7 +134,75 @@ class StudentUpdateSchema(Schema):
     )
 
 
-class PredictionRequestSchema(Schema):
+class StudentListQuerySchema(TimedSchema):
+    """
+    Schema untuk query parameters GET /api/students
+
+    Parameters:
+    - page, per_page: pagination (per_page max 100)
+    - sort, order: field sorting dan arah (asc/desc)
+    - gpa_min, gpa_max: filter range GPA
+    - attendance_min, attendance_max: filter range attendance rate
+    - name: filter prefix nama (case-insensitive)
+    """
+
+    class Meta:
+        unknown = EXCLUDE
+
+    page = fields.Int(
+        load_default=1,
+        validate=[validate.Range(min=1, error="Page minimal 1")]
+    )
+
+    per_page = fields.Int(
+        load_default=20,
+        validate=[validate.Range(min=1, max=100, error="Per page harus 1-100")]
+    )
+
+    sort = fields.Str(
+        load_default='id',
+        validate=[
+            validate.OneOf(
+                ['id', 'name', 'study_hours', 'attendance_rate', 'gpa'],
+                error="Sort harus salah satu dari: {choices}"
+            )
+        ]
+    )
+
+    order = fields.Str(
+        load_default='asc',
+        validate=[validate.OneOf(['asc', 'desc'], error="Order harus asc atau desc")]
+    )
+
+    gpa_min = fields.Float(
+        validate=[validate.Range(min=0, max=4.0, error="GPA harus 0-4.0")]
+    )
+
+    gpa_max = fields.Float(
+        validate=[validate.Range(min=0, max=4.0, error="GPA harus 0-4.0")]
+    )
+
+    attendance_min = fields.Float(
+        validate=[validate.Range(min=0, max=100, error="Attendance rate harus 0-100%")]
+    )
+
+    attendance_max = fields.Float(
+        validate=[validate.Range(min=0, max=100, error="Attendance rate harus 0-100%")]
+    )
+
+    name = fields.Str(
+        validate=[validate.Length(max=100, error="Nama maksimal 100 karakter")]
+    )
+
+    @validates_schema
+    def validate_ranges(self, data, **kwargs):
+        """Pastikan batas bawah tidak lebih besar dari batas atas"""
+        for low, high in (('gpa_min', 'gpa_max'), ('attendance_min', 'attendance_max')):
+            if low in data and high in data and data[low] > data[high]:
+                raise ValidationError(f"{low} tidak boleh lebih besar dari {high}", low)
+
+
+class PredictionRequestSchema(TimedSchema):
     """
     Schema untuk GPA prediction request
 
@@ -148,8 +231,73 @@ class PredictionRequestSchema(Schema):
         }
     )
 
+    # Field yang diharapkan per item pada batch
+    BATCH_FIELDS = ('study_hours', 'attendance_rate')
+
+    def load_batch(self, items: list):
+        """
+        Validate batch items langsung ke NumPy arrays
+
+        Fast path: ambil kolom dan cek range secara vectorized.
+        Jika ada item yang tidak lolos, fallback ke load() per item
+        agar pesan error sama dengan single request.
+
+        Args:
+            items: List of dicts dengan 'study_hours' dan 'attendance_rate'
+
+        Returns:
+            Tuple (study_hours, attendance_rate) sebagai float64 arrays
+
+        Raises:
+            ValidationError: messages di-key dengan index item pertama yang gagal
+        """
+        with timed('validation'):
+            try:
+                if any(len(item) != 2 for item in items):
+                    raise TypeError
+                study_hours = [item['study_hours'] for item in items]
+                attendance_rate = [item['attendance_rate'] for item in items]
+            except (TypeError, KeyError):
+                return self._load_batch_slow(items)
+
+            # np.asarray mengubah bool yang bercampur angka jadi 0/1, sedangkan
+            # load() menolaknya ("Not a valid number.")
+            if bool in set(map(type, study_hours)) or bool in set(map(type, attendance_rate)):
+                return self._load_batch_slow(items)
+            study_hours = np.asarray(study_hours)
+            attendance_rate = np.asarray(attendance_rate)
+
+            numeric = 'iuf'
+            if len(items) and (study_hours.dtype.kind not in numeric or attendance_rate.dtype.kind not in numeric):
+                return self._load_batch_slow(items)
+
+            study_hours = study_hours.astype(np.float64, copy=False)
+            attendance_rate = attendance_rate.astype(np.float64, copy=False)
+            valid = (
+                (study_hours >= 0) & (study_hours <= 168)
+                & (attendance_rate >= 0) & (attendance_rate <= 100)
+            )
+            if not valid.all():
+                return self._load_batch_slow(items)
+
+            return study_hours, attendance_rate
+
+    def _load_batch_slow(self, items: list):
+        """Validasi per item dengan marshmallow (dipakai jika fast path gagal)"""
+        validated = []
+        for idx, item in enumerate(items):
+            try:
+                validated.append(self.load(item))
+            except ValidationError as e:
+                raise ValidationError({idx: e.messages})
+
+        return (
+            np.array([item['study_hours'] for item in validated], dtype=np.float64),
+            np.array([item['attendance_rate'] for item in validated], dtype=np.float64)
+        )
+
 
-class PredictionResponseSchema(Schema):
+class PredictionResponseSchema(TimedSchema):
     """Schema untuk prediction response"""
 
     predicted_gpa = fields.Float(required=True)
@@ -164,5 +312,6 @@ student_schema = StudentSchema()
 students_schema = StudentSchema(many=True)
 student_create_schema = StudentCreateSchema()
 student_update_schema = StudentUpdateSchema()
+student_list_query_schema = StudentListQuerySchema()
 prediction_request_schema = PredictionRequestSchema()
 prediction_response_schema = PredictionResponseSchema()
@@ -5,6 +5,51 @@ class Settings(BaseSettings):
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
 
+    # Validate every response against its response_model (slower, useful in development)
+    VALIDATE_RESPONSES: bool = False
+
+    # ETag / conditional GET untuk endpoint analytics (0 = client selalu revalidate)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_MAX_AGE: int = 0
+    # Interval poll versi graph (GraphMeta) supaya import dari worker/proses lain
+    # meng-invalidate ETag dan cache di worker ini (0 = tidak poll)
+    GRAPH_VERSION_POLL_SECONDS: float = 1.0
+
+    # Kompresi response (Brotli jika package brotli ter-install, fallback GZip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Instrumentation query Cypher (PROFILE menambah overhead, aktifkan saat tuning)
+    QUERY_SLOW_MS: float = 500.0
+    QUERY_SLOW_LOG_SIZE: int = 100
+    QUERY_PROFILE: bool = False
+
+    # Kalender kerja untuk klasifikasi overtime saat import
+    # (weekend: ISO weekday dipisah koma, mis. "6,7"; holidays: "2019-12-25,2020-01-01")
+    OVERTIME_WORK_START_HOUR: int = 7
+    OVERTIME_WORK_END_HOUR: int = 18
+    OVERTIME_WEEKEND_DAYS: str = ""
+    OVERTIME_HOLIDAYS: str = ""
+    OVERTIME_TIMEZONE: str = ""
+
+    # GET /dashboard: panel dihitung paralel, masing-masing dengan session sendiri
+    DASHBOARD_MAX_WORKERS: int = 8
+    DASHBOARD_PANEL_TIMEOUT: float = 30.0
+
+    # SSE /events: bump graph version di-debounce, aggregates opsional ikut dikirim
+    EVENTS_DEBOUNCE_MS: int = 250
+    EVENTS_PUSH_AGGREGATES: bool = False
+
+    # Cache columnar hasil parse CSV event log ("" = di samping file CSV)
+    EVENT_LOG_CACHE_ENABLED: bool = True
+    EVENT_LOG_CACHE_DIR: str = ""
+
+    # ?profile=1 sampling profiler (hanya untuk development)
+    PROFILING_ENABLED: bool = False
+    PROFILE_INTERVAL_MS: float = 1.0
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,7 @@
+"""
+Core Package
+============
+Cross-cutting concerns untuk FastAPI app (responses, middleware, instrumentation)
+
+Tidak bergantung pada Flask, sehingga aman di-import oleh routers.
+"""
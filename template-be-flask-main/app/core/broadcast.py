@@ -0,0 +1,108 @@
+"""
+Broadcast
+=========
+Fan-out Server-Sent Events ke banyak subscriber tanpa queue per client
+
+Broadcaster hanya menyimpan event terakhir dan satu asyncio.Event yang
+diganti setiap publish. Subscriber menunggu Event tersebut lalu membaca
+event terakhir, jadi:
+
+    - publish O(1): set() satu Event membangunkan semua subscriber
+    - tidak ada task/queue per client; client lambat langsung lompat ke
+      event terbaru (event lama tidak perlu dikirim, yang penting versi)
+    - keepalive memakai satu timer bersama, bukan timeout per client
+
+Semua state diakses dari thread event loop; publish dari thread lain
+lewat publish_threadsafe. close() membangunkan semua subscriber dan
+mengakhiri stream-nya, jadi shutdown tidak menunggu client disconnect.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+
+KEEPALIVE_SECONDS = 15.0
+RETRY_MS = 3000
+
+
+def format_event(event_id: str, event: str, data: Any) -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), orjson.dumps(data))
+
+
+class Broadcaster:
+    """Event terakhir + wakeup bersama untuk subscriber SSE"""
+
+    def __init__(self, keepalive_seconds: float = KEEPALIVE_SECONDS):
+        self.keepalive_seconds = keepalive_seconds
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.subscribers = 0
+        self._latest: Optional[bytes] = None
+        self._latest_id: Optional[str] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._keepalive: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Dipanggil saat startup dari event loop aplikasi"""
+        self.loop = loop
+        self._closed = False
+        self._changed = asyncio.Event()
+        self._keepalive = loop.call_later(self.keepalive_seconds, self._tick)
+
+    def close(self) -> None:
+        """Hentikan keepalive dan akhiri semua stream subscriber"""
+        if self._keepalive is not None:
+            self._keepalive.cancel()
+            self._keepalive = None
+        self._closed = True
+        if self._changed is not None:
+            self._wake()
+        self.loop = None
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _tick(self) -> None:
+        self._wake()
+        self._keepalive = self.loop.call_later(self.keepalive_seconds, self._tick)
+
+    def publish(self, event_id: str, event: str, data: Any) -> None:
+        """Publish dari thread event loop"""
+        self._latest = format_event(event_id, event, data)
+        self._latest_id = event_id
+        self._wake()
+
+    def publish_threadsafe(self, event_id: str, event: str, data: Any) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.publish, event_id, event, data)
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream SSE untuk satu client
+
+        Event terakhir dikirim segera jika id-nya berbeda dari Last-Event-ID,
+        jadi client yang reconnect langsung sinkron.
+        """
+        if self._changed is None:
+            raise RuntimeError("Broadcaster is not bound to an event loop")
+        self.subscribers += 1
+        try:
+            yield b"retry: %d\n\n" % RETRY_MS
+            sent_id = last_event_id
+            while not self._closed:
+                # Ambil Event sebelum membaca _latest: publish yang terjadi
+                # selama yield di bawah sudah men-set Event ini, jadi wait()
+                # langsung selesai (bukan menunggu keepalive berikutnya)
+                changed = self._changed
+                if self._latest is not None and self._latest_id != sent_id:
+                    sent_id = self._latest_id
+                    yield self._latest
+                await changed.wait()
+                if self._closed:
+                    break
+                if self._latest_id == sent_id:
+                    yield b": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
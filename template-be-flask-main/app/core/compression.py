@@ -0,0 +1,208 @@
+"""
+Compression
+===========
+Middleware kompresi response (Brotli jika tersedia, fallback GZip)
+
+Response JSON analytics (/bpmn/data, /users/collaboration,
+/organization/utilization) besar dan sangat repetitif. Middleware ini:
+
+    - Memilih encoding dari Accept-Encoding (br > gzip, q=0 dihormati)
+    - Hanya mengompres body >= minimum_size dan content-type yang cocok
+    - Melewatkan streaming response (more_body) dan text/event-stream
+    - Mencatat rasio kompresi dan CPU time per route (compression_stats)
+
+Body di atas offload_size dikompres di thread pool supaya event loop
+tidak terblokir.
+"""
+
+import gzip
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import timed
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli optional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Parse Accept-Encoding menjadi {encoding: q}"""
+    encodings = {}
+    for part in value.split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[token.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    encodings = parse_accept_encoding(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    if brotli is not None and encodings.get("br", wildcard) > 0:
+        return "br"
+    if encodings.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class CompressionStats:
+    """Akumulasi bytes dan CPU time kompresi per (route, encoding)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def record(self, route: str, encoding: str, raw: int, compressed: int, cpu_ms: float) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(
+                (route, encoding),
+                {"responses": 0, "raw_bytes": 0, "compressed_bytes": 0, "cpu_ms": 0.0}
+            )
+            entry["responses"] += 1
+            entry["raw_bytes"] += raw
+            entry["compressed_bytes"] += compressed
+            entry["cpu_ms"] += cpu_ms
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = [(key, dict(entry)) for key, entry in self._routes.items()]
+        return [
+            {
+                "route": route,
+                "encoding": encoding,
+                "responses": entry["responses"],
+                "raw_bytes": entry["raw_bytes"],
+                "compressed_bytes": entry["compressed_bytes"],
+                "ratio": round(entry["raw_bytes"] / max(entry["compressed_bytes"], 1), 2),
+                "cpu_ms_total": round(entry["cpu_ms"], 2),
+                "cpu_ms_mean": round(entry["cpu_ms"] / entry["responses"], 3),
+            }
+            for (route, encoding), entry in sorted(items)
+        ]
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware kompresi Brotli/GZip
+
+    Args:
+        app: ASGI app
+        minimum_size: Body lebih kecil dari ini dikirim apa adanya
+        gzip_level: Level gzip (1-9)
+        brotli_quality: Quality brotli (0-11)
+        offload_size: Body >= ini dikompres di thread pool
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        offload_size: int = 256 * 1024
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message.get("headers", []))
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or content_type.startswith("text/event-stream")
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming response atau body kecil: kirim tanpa kompresi
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            with timed("compression"):
+                if len(body) >= self.offload_size:
+                    compressed, cpu_ms = await anyio.to_thread.run_sync(self._compress, body, encoding)
+                else:
+                    compressed, cpu_ms = self._compress(body, encoding)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", scope["path"])
+            compression_stats.record(route_path, encoding, len(body), len(compressed), cpu_ms)
+            logger.debug(
+                "compressed %s %s: %d -> %d bytes (%.1fx) in %.2f ms",
+                route_path, encoding, len(body), len(compressed),
+                len(body) / max(len(compressed), 1), cpu_ms
+            )
+
+            headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send({**start_message, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, body: bytes, encoding: str) -> Tuple[bytes, float]:
+        started = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        return compressed, (time.thread_time() - started) * 1000
@@ -0,0 +1,117 @@
+"""
+HTTP Cache
+==========
+ETag + conditional GET berbasis graph version
+
+Semua endpoint analytics bersifat read-only terhadap data graph, jadi
+response hanya berubah setelah graph version naik (load-data, clear,
+project). ETag dihitung dari epoch dan graph version, path dan
+query parameters (diurutkan), tanpa membaca body atau menyentuh Neo4j
+(versi di-poll di background, lihat graph_version):
+
+    - Request dengan If-None-Match yang cocok langsung dijawab 304
+      di middleware, endpoint tidak dipanggil sama sekali.
+    - Response 200 lainnya diberi header ETag dan Cache-Control, kecuali
+      response yang sudah membawa Cache-Control no-store (mis. dashboard
+      dengan panel gagal): diteruskan apa adanya tanpa ETag.
+
+Versi dan epoch-nya dibaca dari GraphMeta, jadi semua worker memberi
+ETag yang sama dan import dari worker/proses lain membuat ETag lama
+invalid paling lambat setelah GRAPH_VERSION_POLL_SECONDS.
+"""
+
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.graph_version import graph_version
+
+
+def compute_etag(epoch: str, version: int, path: str, query_string: bytes) -> str:
+    """Weak ETag dari (graph epoch, graph version, path, query terurut)"""
+    params = sorted(p for p in query_string.split(b"&") if p)
+    digest = hashlib.blake2b(
+        b"\0".join([epoch.encode(), str(version).encode(), path.encode()] + params),
+        digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Perbandingan weak: abaikan prefix W/
+    opaque = etag[2:]
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ETagMiddleware:
+    """
+    ASGI middleware untuk ETag / If-None-Match
+
+    Args:
+        app: ASGI app
+        path_prefixes: Hanya path dengan prefix ini yang di-cache
+        max_age: Detik response boleh dipakai tanpa revalidasi
+            (0 = "no-cache", client selalu revalidate dengan If-None-Match)
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: Iterable[str] = ("/",), max_age: int = 0):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.cache_control = f"private, max-age={max_age}" if max_age > 0 else "no-cache"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Versi diambil sebelum endpoint jalan: jika data berubah di tengah
+        # request, ETag ini otomatis mismatch pada request berikutnya.
+        epoch, version = graph_version.snapshot()
+        etag = compute_etag(epoch, version, scope["path"], scope.get("query_string", b""))
+
+        if_none_match = _header(scope["headers"], b"if-none-match")
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [
+                    (b"etag", etag.encode()),
+                    (b"cache-control", self.cache_control.encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] == 200
+                and "no-store" not in (_header(message.get("headers", []), b"cache-control") or "")
+            ):
+                headers: List[Tuple[bytes, bytes]] = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in (b"etag", b"cache-control")
+                ]
+                headers.append((b"etag", etag.encode()))
+                headers.append((b"cache-control", self.cache_control.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _header(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
@@ -0,0 +1,148 @@
+"""
+Instrumentation
+===============
+Request timing untuk FastAPI (Server-Timing, histogram per route, profiler)
+
+RequestTimingMiddleware membuka RequestTiming per request, menghitung
+request in-flight dan menambahkan header Server-Timing. TimedRoute
+membungkus endpoint supaya waktu handler bisa dipisah dari sisa request:
+
+    service = waktu handler - db - serialization di dalam handler
+    other   = total - semua phase lain (routing, parsing params,
+              dependencies, validasi response_model jika VALIDATE_RESPONSES
+              aktif, middleware lain); bukan waktu validasi murni
+
+Jika PROFILING_ENABLED aktif, request dengan ?profile=1 dijalankan di
+bawah SamplingProfiler dan response-nya diganti folded stacks
+(text/plain) yang bisa dibuka dengan speedscope atau flamegraph.pl.
+Profiler men-sample thread event loop dan thread worker yang menjalankan
+handler sync, jadi request lain yang berjalan bersamaan bisa ikut tercatat.
+"""
+
+import functools
+import inspect
+import threading
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import (
+    SamplingProfiler,
+    current_timing,
+    end_request_timing,
+    route_metrics,
+    start_request_timing,
+)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    def account(timing, started_ms: float, inner_before: float) -> None:
+        inner = timing.phases.get("db", 0.0) + timing.phases.get("serialization", 0.0) - inner_before
+        timing.add("service", max(timing.elapsed_ms() - started_ms - inner, 0.0))
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            timing = current_timing()
+            if timing is None:
+                return await endpoint(*args, **kwargs)
+            started_ms = timing.elapsed_ms()
+            inner_before = timing.phases.get("db", 0.0) + timing.phases.get("serialization", 0.0)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                account(timing, started_ms, inner_before)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            timing = current_timing()
+            if timing is None:
+                return endpoint(*args, **kwargs)
+            timing.thread_ids.add(threading.get_ident())
+            started_ms = timing.elapsed_ms()
+            inner_before = timing.phases.get("db", 0.0) + timing.phases.get("serialization", 0.0)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                account(timing, started_ms, inner_before)
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute yang mengukur waktu handler untuk phase "service" """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware: Server-Timing, latency per route, in-flight, profiler
+
+    Args:
+        app: ASGI app
+        profiling_enabled: Izinkan ?profile=1 (hanya untuk development)
+        profile_interval_ms: Interval sampling profiler
+    """
+
+    def __init__(self, app: ASGIApp, profiling_enabled: bool = False, profile_interval_ms: float = 1.0):
+        self.app = app
+        self.profiling_enabled = profiling_enabled
+        self.profile_interval_ms = profile_interval_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.profiling_enabled and b"profile=1" in scope.get("query_string", b"").split(b"&"):
+            await self._profile(scope, receive, send)
+            return
+
+        timing, token = start_request_timing()
+        route_metrics.request_started()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = timing.elapsed_ms()
+                timing.add("other", max(total_ms - sum(timing.phases.values()), 0.0))
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.server_timing(total_ms).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = getattr(scope.get("route"), "path", scope["path"] if status != 404 else "<unmatched>")
+            route_metrics.observe(scope["method"], route, status, timing.elapsed_ms())
+            route_metrics.request_finished()
+            end_request_timing(token)
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def discard(message: Message) -> None:
+            pass
+
+        timing, token = start_request_timing()
+        profiler = SamplingProfiler(interval_ms=self.profile_interval_ms, timing=timing).start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+            end_request_timing(token)
+
+        body = profiler.folded().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,70 @@
+"""
+Metrics Helpers
+===============
+Histogram sederhana (thread-safe) untuk instrumentation in-process
+
+Bucket berupa batas atas kumulatif seperti format Prometheus:
+count untuk bucket "le=x" adalah jumlah observasi <= x.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> List[float]:
+    """Buat batas bucket start, start*factor, ..., sebanyak count"""
+    return [start * factor ** i for i in range(count)]
+
+
+class Histogram:
+    """Histogram dengan bucket tetap, count, sum, min dan max"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimasi quantile dari batas bucket (batas atas bucket yang memuat q)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            cumulative = 0
+            for idx, bucket_count in enumerate(self._counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    return self.buckets[idx] if idx < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Data histogram dalam bentuk dict (JSON-serializable)"""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.buckets, self._counts):
+                cumulative += bucket_count
+                buckets[f"{bound:g}"] = cumulative
+            buckets['+Inf'] = self.count
+            return {
+                'count': self.count,
+                'sum': round(self.sum, 6),
+                'min': self.min,
+                'max': self.max,
+                'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+                'buckets': buckets
+            }
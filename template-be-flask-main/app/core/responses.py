@@ -0,0 +1,49 @@
+"""
+Responses
+=========
+JSON response berbasis orjson untuk FastAPI
+
+FastJSONResponse dipakai sebagai default_response_class app. Endpoint yang
+service-nya sudah mengembalikan shape persis seperti response_model bisa
+memakai json_response() untuk melewati validasi pydantic per item;
+response_model tetap dipakai untuk dokumentasi OpenAPI.
+
+Set VALIDATE_RESPONSES=true (mis. saat development) untuk kembali
+memvalidasi setiap response terhadap response_model.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.core.tracing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson optional
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse yang di-render dengan orjson (fallback ke json stdlib)"""
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialization"):
+            if orjson is None:
+                return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+    """
+    Return content langsung sebagai FastJSONResponse (tanpa re-validasi)
+
+    Jika settings.VALIDATE_RESPONSES aktif, content dikembalikan apa adanya
+    sehingga FastAPI memvalidasinya terhadap response_model; headers lalu
+    harus di-set juga di parameter Response milik endpoint.
+    """
+    if settings.VALIDATE_RESPONSES:
+        return content
+    return FastJSONResponse(content, headers=headers)
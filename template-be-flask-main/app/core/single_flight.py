@@ -0,0 +1,71 @@
+"""
+Single Flight
+=============
+Coalescing panggilan concurrent yang identik
+
+Jika beberapa thread memanggil do(key, fn) dengan key yang sama selagi
+panggilan pertama masih berjalan, hanya panggilan pertama (leader) yang
+menjalankan fn; sisanya menunggu dan menerima hasil (atau exception) yang
+sama. Tidak ada caching: begitu leader selesai, panggilan berikutnya
+menjalankan fn lagi.
+
+Hasil dibagi ke semua caller sebagai object yang sama, jadi caller tidak
+boleh memodifikasinya.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Gabungkan panggilan concurrent dengan key sama menjadi satu komputasi"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                call.waiters += 1
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,211 @@
+"""
+Tracing
+=======
+Instrumentation request-level yang dipakai bersama FastAPI dan Flask
+
+Setiap request membawa RequestTiming di contextvar. Kode di bawahnya
+menambahkan durasi per phase lewat timed(phase):
+
+    - validation:    load schema marshmallow (Flask)
+    - db:            query Cypher (QueryExecutor)
+    - serialization: marshmallow dump / render JSON
+    - service:       sisa waktu handler di luar db dan serialization
+    - compression:   kompresi body oleh CompressionMiddleware
+    - other:         sisa total request di luar phase di atas (FastAPI)
+
+Di luar request, timed() hanya mengukur lalu membuang hasilnya.
+
+RouteMetrics menyimpan histogram latency per (method, route) dan jumlah
+request in-flight. SamplingProfiler mengambil stack thread request secara
+periodik dan menghasilkan folded stacks ("a;b;c 12") yang bisa langsung
+dibaca flamegraph.pl atau speedscope.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from app.core.metrics import Histogram, exponential_buckets
+
+PHASES = ("validation", "service", "db", "serialization", "compression", "other")
+
+
+class RequestTiming:
+    """Akumulasi durasi (ms) per phase untuk satu request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.open_phases: Set[str] = set()
+        # Thread worker yang menjalankan handler sync (untuk profiler)
+        self.thread_ids: Set[int] = set()
+
+    def add(self, phase: str, ms: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """Nilai header Server-Timing, mis. "db;dur=12.3, total;dur=20.1" """
+        total_ms = self.elapsed_ms() if total_ms is None else total_ms
+        parts = [f"{phase};dur={self.phases[phase]:.2f}" for phase in PHASES if phase in self.phases]
+        parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> Tuple[RequestTiming, Any]:
+    """Buat RequestTiming baru untuk request aktif; return (timing, token)"""
+    timing = RequestTiming()
+    return timing, _current_timing.set(timing)
+
+
+def end_request_timing(token: Any) -> None:
+    _current_timing.reset(token)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current_timing.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Tambahkan durasi block ke phase request aktif (nested block tidak dihitung dua kali)"""
+    timing = _current_timing.get()
+    if timing is None or phase in timing.open_phases:
+        yield
+        return
+    timing.open_phases.add(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, (time.perf_counter() - started) * 1000)
+        timing.open_phases.discard(phase)
+
+
+class RouteMetrics:
+    """Histogram latency per route dan counter request in-flight"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._status: Dict[Tuple[str, str], Counter] = {}
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def observe(self, method: str, route: str, status: int, ms: float) -> None:
+        key = (method, route)
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram(exponential_buckets(1, 2, 16))
+                self._status[key] = Counter()
+            self._status[key][str(status)] += 1
+        histogram.observe(ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = [
+                (key, self._latency[key], dict(self._status[key])) for key in sorted(self._latency)
+            ]
+            in_flight, peak = self._in_flight, self._peak_in_flight
+        routes = []
+        for (method, route), histogram, status in entries:
+            routes.append({
+                "method": method,
+                "route": route,
+                "status": status,
+                "p50_ms": histogram.quantile(0.5),
+                "p99_ms": histogram.quantile(0.99),
+                "latency_ms": histogram.snapshot(),
+            })
+        return {"in_flight": in_flight, "peak_in_flight": peak, "routes": routes}
+
+
+route_metrics = RouteMetrics()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler untuk satu thread
+
+    Args:
+        thread_id: Thread yang di-sample (default: thread pemanggil)
+        interval_ms: Jarak antar sample
+        timing: Jika diberikan, thread di timing.thread_ids (handler sync
+            yang jalan di threadpool) ikut di-sample
+
+    Selama profiling, sys.setswitchinterval diturunkan ke interval supaya
+    thread sampler mendapat GIL cukup sering; nilai lama dikembalikan saat
+    stop. Hanya untuk development.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        interval_ms: float = 1.0,
+        timing: Optional[RequestTiming] = None
+    ):
+        self.thread_id = thread_id or threading.get_ident()
+        self.timing = timing
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> "SamplingProfiler":
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            thread_ids = {self.thread_id}
+            if self.timing is not None:
+                thread_ids.update(self.timing.thread_ids)
+            frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Folded stacks, satu baris per stack unik: "root;...;leaf count" """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
@@ -22,3 +22,7 @@ def get_db():
         yield session
     finally:
         session.close()
+
+def get_session_factory():
+    # Untuk endpoint yang membuka beberapa session sekaligus (mis. /dashboard)
+    return neo4j_driver.get_session
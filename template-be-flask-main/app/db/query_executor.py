@@ -0,0 +1,159 @@
+"""
+Query Executor
+==============
+Wrapper instrumented di atas session.run untuk semua query Cypher service
+
+Setiap query diberi nama (mis. "analytics.role_interactions") lalu:
+
+    - Hasil di-fetch eager (list of Record) dan summary di-consume
+    - Wall time, jumlah rows, result_available_after dan
+      result_consumed_after dari server dicatat ke histogram per nama
+    - Jika QUERY_PROFILE aktif, query dijalankan dengan PROFILE dan total
+      db hits dari profile tree ikut dicatat
+    - Query di atas QUERY_SLOW_MS masuk slow log dan di-log sebagai warning
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from neo4j import Record, Session
+
+from app.config import settings
+from app.core.metrics import Histogram, exponential_buckets
+from app.core.tracing import timed
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS_MS = exponential_buckets(1, 2, 16)
+_ROW_BUCKETS = exponential_buckets(1, 4, 12)
+
+
+def total_db_hits(profile: Optional[Dict[str, Any]]) -> int:
+    """Jumlahkan dbHits dari seluruh operator di profile tree"""
+    if not profile:
+        return 0
+    return profile.get("dbHits", 0) + sum(total_db_hits(child) for child in profile.get("children", []))
+
+
+class QueryStats:
+    """Histogram dan counter untuk satu nama query"""
+
+    def __init__(self):
+        self.wall_ms = Histogram(_LATENCY_BUCKETS_MS)
+        self.server_available_ms = Histogram(_LATENCY_BUCKETS_MS)
+        self.server_consumed_ms = Histogram(_LATENCY_BUCKETS_MS)
+        self.rows = Histogram(_ROW_BUCKETS)
+        self.db_hits = Histogram(exponential_buckets(10, 4, 12))
+        self.slow_count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.wall_ms.count,
+            "slow": self.slow_count,
+            "wall_ms": {**self.wall_ms.snapshot(), "p50": self.wall_ms.quantile(0.5), "p99": self.wall_ms.quantile(0.99)},
+            "server_available_ms": self.server_available_ms.snapshot(),
+            "server_consumed_ms": self.server_consumed_ms.snapshot(),
+            "rows": self.rows.snapshot(),
+            "db_hits": self.db_hits.snapshot(),
+        }
+
+
+class QueryMetrics:
+    """Registry QueryStats per nama query + slow log"""
+
+    def __init__(self, slow_log_size: int = 100):
+        self._stats: Dict[str, QueryStats] = {}
+        self._slow_log: deque = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def stats(self, name: str) -> QueryStats:
+        with self._lock:
+            if name not in self._stats:
+                self._stats[name] = QueryStats()
+            return self._stats[name]
+
+    def record_slow(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._slow_log.append(entry)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = sorted(self._stats.items())
+        return {name: stats.snapshot() for name, stats in items}
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(reversed(self._slow_log))
+
+
+query_metrics = QueryMetrics(slow_log_size=settings.QUERY_SLOW_LOG_SIZE)
+
+
+class QueryExecutor:
+    """
+    Jalankan Cypher lewat session dengan instrumentation
+
+    Args:
+        session: Neo4j session
+        metrics: Registry tujuan (default query_metrics global)
+    """
+
+    def __init__(self, session: Session, metrics: QueryMetrics = query_metrics):
+        self.session = session
+        self.metrics = metrics
+
+    def run(self, name: str, query: str, **params: Any) -> List[Record]:
+        """
+        Jalankan query dan kembalikan semua records
+
+        Args:
+            name: Nama stabil untuk metrics (bukan teks query)
+            query: Cypher query
+            **params: Query parameters
+        """
+        profile = settings.QUERY_PROFILE
+        with timed("db"):
+            started = time.perf_counter()
+            result = self.session.run(f"PROFILE {query}" if profile else query, parameters=params)
+            records = list(result)
+            summary = result.consume()
+            wall_ms = (time.perf_counter() - started) * 1000
+
+        stats = self.metrics.stats(name)
+        stats.wall_ms.observe(wall_ms)
+        stats.rows.observe(len(records))
+        if summary.result_available_after is not None:
+            stats.server_available_ms.observe(summary.result_available_after)
+        if summary.result_consumed_after is not None:
+            stats.server_consumed_ms.observe(summary.result_consumed_after)
+        db_hits = total_db_hits(summary.profile) if profile else None
+        if db_hits is not None:
+            stats.db_hits.observe(db_hits)
+
+        if wall_ms >= settings.QUERY_SLOW_MS:
+            stats.slow_count += 1
+            entry = {
+                "name": name,
+                "at": time.time(),
+                "wall_ms": round(wall_ms, 2),
+                "rows": len(records),
+                "result_available_after": summary.result_available_after,
+                "result_consumed_after": summary.result_consumed_after,
+                "db_hits": db_hits,
+                "parameters": sorted(params),
+            }
+            self.metrics.record_slow(entry)
+            logger.warning(
+                "slow query %s: %.1f ms, %d rows (available_after=%s ms, consumed_after=%s ms, db_hits=%s)",
+                name, wall_ms, len(records),
+                summary.result_available_after, summary.result_consumed_after, db_hits
+            )
+        return records
+
+    def single(self, name: str, query: str, **params: Any) -> Optional[Record]:
+        """Jalankan query dan kembalikan record pertama (atau None)"""
+        records = self.run(name, query, **params)
+        return records[0] if records else None
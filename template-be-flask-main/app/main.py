@@ -1,12 +1,45 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.config import settings
 from app.db.neo4j import neo4j_driver
-from app.routers import organization, roles, users, bpmn
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import ETagMiddleware
+from app.core.instrumentation import RequestTimingMiddleware
+from app.core.responses import FastJSONResponse
+from app.services.graph_version import graph_version
+from app.services.notifications import close_on_exit_signals, start_notifications, stop_notifications
+from app.routers import organization, roles, users, bpmn, metrics, dashboard, events
 
 app = FastAPI(
     title="Organizational Mining API",
     description="API for analyzing organizational structures from process data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
+
+# ETag / If-None-Match (di dalam CORS supaya 304 tetap membawa header CORS)
+if settings.HTTP_CACHE_ENABLED:
+    app.add_middleware(
+        ETagMiddleware,
+        path_prefixes=("/organization", "/roles", "/users", "/bpmn", "/dashboard"),
+        max_age=settings.HTTP_CACHE_MAX_AGE,
+    )
+
+# Brotli / GZip (di luar ETag, jadi 304 tidak ikut dikompres)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Server-Timing, latency per route, in-flight, ?profile=1
+app.add_middleware(
+    RequestTimingMiddleware,
+    profiling_enabled=settings.PROFILING_ENABLED,
+    profile_interval_ms=settings.PROFILE_INTERVAL_MS,
 )
 
 # CORS
@@ -20,6 +53,12 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
+    # SSE /events
+    start_notifications(asyncio.get_running_loop())
+    close_on_exit_signals(asyncio.get_running_loop())
+    # Versi graph bersama (import dari worker lain / run_analysis.py)
+    graph_version.start_polling(neo4j_driver.get_session, settings.GRAPH_VERSION_POLL_SECONDS)
+
     # Verify connection
     try:
         with neo4j_driver.get_session() as session:
@@ -30,12 +69,17 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    graph_version.stop_polling()
+    stop_notifications()
     neo4j_driver.close()
 
 app.include_router(organization.router)
 app.include_router(roles.router)
 app.include_router(users.router)
 app.include_router(bpmn.router)
+app.include_router(metrics.router)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 
 @app.get("/")
 async def root():
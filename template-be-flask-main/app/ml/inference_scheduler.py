@@ -0,0 +1,165 @@
+"""
+Inference Scheduler
+===================
+Micro-batching untuk single predictions yang datang bersamaan
+
+Request yang masuk dalam rentang max_wait_ms (atau sampai max_batch_size
+item) dikumpulkan lalu dijalankan sekali lewat jalur batch prediction.
+Hasil dikembalikan ke masing-masing pemanggil lewat Future.
+
+Jika antrian kosong setelah item pertama, batch langsung dijalankan tanpa
+menunggu: request tunggal tidak membayar max_wait_ms, dan request yang
+datang selama batch berjalan terkumpul untuk batch berikutnya.
+
+Worker thread dijalankan saat submit pertama (lazy) dan dijalankan ulang
+jika mati. predict() menunggu paling lama timeout lalu raise
+InferenceTimeout.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.metrics import Histogram, exponential_buckets
+
+
+# predict_fn(study_hours, attendance_rate) -> list of prediction dicts
+BatchPredictFn = Callable[[np.ndarray, np.ndarray], List[Dict[str, Any]]]
+
+
+class InferenceTimeout(Exception):
+    """Hasil prediction tidak datang dalam timeout (worker macet/mati)"""
+
+
+class InferenceScheduler:
+    """Kumpulkan single predictions menjadi batch"""
+
+    def __init__(
+        self,
+        predict_fn: BatchPredictFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        timeout_ms: float = 5000.0
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            predict_fn: Fungsi batch prediction
+            max_batch_size: Jumlah item maksimal per batch
+            max_wait_ms: Waktu tunggu maksimal untuk mengisi batch
+            timeout_ms: Default waktu tunggu hasil di predict()
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout_ms / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        buckets = exponential_buckets(1, 2, max(1, max_batch_size).bit_length() + 1)
+        self.batch_size_histogram = Histogram(buckets)
+        self.queue_depth_histogram = Histogram(exponential_buckets(1, 2, 12))
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, study_hours: float, attendance_rate: float) -> Future:
+        """
+        Masukkan satu input ke antrian
+
+        Returns:
+            Future yang berisi prediction dict
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((study_hours, attendance_rate, future))
+        return future
+
+    def predict(self, study_hours: float, attendance_rate: float, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Submit lalu tunggu hasilnya (blocking)
+
+        Raises:
+            InferenceTimeout: hasil tidak datang dalam timeout (default self.timeout)
+        """
+        future = self.submit(study_hours, attendance_rate)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise InferenceTimeout("Prediction timed out") from None
+
+    def stats(self) -> Dict[str, Any]:
+        """Konfigurasi, counters dan histograms scheduler"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'timeout_ms': self.timeout * 1000.0,
+            'running': self._worker is not None and self._worker.is_alive(),
+            'queue_depth': self._queue.qsize(),
+            'batches': self.batches,
+            'items': self.items,
+            'batch_size': self.batch_size_histogram.snapshot(),
+            'queue_depth_at_dispatch': self.queue_depth_histogram.snapshot()
+        }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name='inference-scheduler', daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> list:
+        """
+        Blok sampai ada item, lalu isi batch sampai penuh atau timeout.
+        Tanpa item lain di antrian, batch berisi satu item langsung dijalankan.
+        """
+        batch = [self._queue.get()]
+        if self._queue.empty():
+            return batch
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            # Future yang sudah di-cancel (pemanggil timeout) dilewati
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            self.queue_depth_histogram.observe(len(batch) + self._queue.qsize())
+            self.batch_size_histogram.observe(len(batch))
+            self.batches += 1
+            self.items += len(batch)
+
+            futures = [item[2] for item in batch]
+            try:
+                study_hours = np.fromiter((item[0] for item in batch), dtype=np.float64, count=len(batch))
+                attendance_rate = np.fromiter((item[1] for item in batch), dtype=np.float64, count=len(batch))
+                predictions = self.predict_fn(study_hours, attendance_rate)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for future, prediction in zip(futures, predictions):
+                future.set_result(prediction)
@@ -0,0 +1,233 @@
+"""
+Model Registry
+==============
+Loader untuk trained models di ML_MODELS_PATH
+
+Fitur:
+- Lazy loading: model baru di-load saat prediksi pertama, bukan saat import
+- Versioned artifacts: <name>-<version>.<ext>, versi terbaru dipilih otomatis
+- Memory-mapped arrays untuk artifact joblib (mmap_mode='r')
+- Warm-up dengan dummy batch sebelum model dipakai
+- Hot reload: swap ke versi baru secara atomic tanpa restart
+- Artifact yang gagal di-load atau di-warm-up saat prediksi pertama
+  dicatat di log lalu diganti fallback, bukan membuat setiap prediksi gagal
+
+Prediksi yang sedang berjalan tetap memakai model lama karena memegang
+referensi LoadedModel miliknya sendiri.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """Model yang sudah di-load dan di-warm-up"""
+
+    version: str
+    model: Any
+    path: Optional[str] = None
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'version': self.version,
+            'path': self.path,
+            'loaded_at': self.loaded_at.isoformat()
+        }
+
+
+class LinearModel:
+    """
+    Linear model sederhana dari artifact .npz
+
+    Arrays:
+        coef: shape (n_features,)
+        intercept: scalar
+        version: string (optional)
+    """
+
+    def __init__(self, coef: np.ndarray, intercept: float):
+        self.coef = coef
+        self.intercept = intercept
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.coef + self.intercept
+
+
+def _load_joblib(path: Path) -> Tuple[Any, Optional[str]]:
+    """Load artifact joblib/pickle, arrays besar di-memory-map"""
+    import joblib
+
+    artifact = joblib.load(path, mmap_mode='r')
+    # Bundle {'model': ..., 'version': ...} atau model dengan atribut model_version
+    if isinstance(artifact, dict) and 'model' in artifact:
+        return artifact['model'], artifact.get('version')
+    return artifact, getattr(artifact, 'model_version', None)
+
+
+def _load_npz(path: Path) -> Tuple[Any, Optional[str]]:
+    """Load LinearModel dari artifact .npz"""
+    with np.load(path, allow_pickle=False) as arrays:
+        model = LinearModel(
+            coef=np.asarray(arrays['coef'], dtype=np.float64),
+            intercept=float(arrays['intercept'])
+        )
+        version = str(arrays['version']) if 'version' in arrays.files else None
+    return model, version
+
+
+def _version_key(version: str) -> tuple:
+    """Sort key untuk versi: bagian angka dibandingkan sebagai int"""
+    return tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part)
+        for part in re.split(r'[.\-+]', version)
+    )
+
+
+class ModelRegistry:
+    """
+    Registry untuk versioned model artifacts
+
+    Model harus punya method predict(features) dengan features
+    berbentuk (n, 2): kolom study_hours dan attendance_rate.
+    """
+
+    WARMUP_BATCH_SIZE = 8
+
+    def __init__(self, models_path: Path, name: str, fallback: LoadedModel):
+        """
+        Initialize registry
+
+        Args:
+            models_path: Folder artifacts (ML_MODELS_PATH)
+            name: Prefix nama artifact, mis. 'gpa_model'
+            fallback: Model yang dipakai jika belum ada artifact
+        """
+        self.models_path = Path(models_path)
+        self.name = name
+        self.fallback = fallback
+        self._active: Optional[LoadedModel] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[LoadedModel], None]] = []
+        self._loaders: Dict[str, Callable[[Path], Tuple[Any, Optional[str]]]] = {
+            '.joblib': _load_joblib,
+            '.pkl': _load_joblib,
+            '.npz': _load_npz,
+        }
+
+    def register_loader(self, suffix: str, loader: Callable[[Path], Tuple[Any, Optional[str]]]) -> None:
+        """Tambah loader untuk format artifact lain (return: model, version)"""
+        self._loaders[suffix] = loader
+
+    def on_swap(self, listener: Callable[[LoadedModel], None]) -> None:
+        """Register callback yang dipanggil setiap kali model aktif berganti"""
+        self._listeners.append(listener)
+
+    def available_versions(self) -> List[Tuple[str, Path]]:
+        """
+        List artifacts yang tersedia, urut dari versi terlama
+
+        Returns:
+            List of (version, path)
+        """
+        if not self.models_path.is_dir():
+            return []
+
+        pattern = re.compile(rf'^{re.escape(self.name)}-(?P<version>.+)$')
+        artifacts = []
+        for path in self.models_path.iterdir():
+            match = pattern.match(path.stem)
+            if match and path.suffix in self._loaders:
+                artifacts.append((match.group('version'), path))
+        return sorted(artifacts, key=lambda artifact: _version_key(artifact[0]))
+
+    def get(self) -> LoadedModel:
+        """
+        Get model aktif, load versi terbaru saat pertama kali dipanggil.
+        Jika artifact terbaru gagal di-load/warm-up, fallback yang dipakai
+        sampai load() berikutnya berhasil.
+
+        Returns:
+            LoadedModel aktif
+        """
+        active = self._active
+        if active is None:
+            with self._lock:
+                if self._active is None:
+                    try:
+                        loaded = self._load_latest()
+                    except Exception:  # noqa: BLE001 - artifact rusak / dependency loader tidak ada
+                        logger.exception("Gagal load model %s, memakai fallback %s", self.name, self.fallback.version)
+                        loaded = self.fallback
+                    self._swap(loaded)
+                active = self._active
+        return active
+
+    def load(self, version: Optional[str] = None) -> LoadedModel:
+        """
+        Load (atau reload) model lalu swap secara atomic
+
+        Args:
+            version: Versi yang diinginkan, default versi terbaru
+
+        Returns:
+            LoadedModel yang baru aktif
+
+        Raises:
+            ValueError: Jika versi tidak ditemukan atau warm-up gagal
+        """
+        with self._lock:
+            if version is None:
+                loaded = self._load_latest()
+            elif version == self.fallback.version:
+                loaded = self.fallback
+            else:
+                artifacts = dict(self.available_versions())
+                if version not in artifacts:
+                    raise ValueError(f"Model versi {version} tidak ditemukan")
+                loaded = self._load_artifact(version, artifacts[version])
+            self._swap(loaded)
+            return loaded
+
+    def _load_latest(self) -> LoadedModel:
+        artifacts = self.available_versions()
+        if not artifacts:
+            self._warm_up(self.fallback.model)
+            return self.fallback
+        version, path = artifacts[-1]
+        return self._load_artifact(version, path)
+
+    def _load_artifact(self, version: str, path: Path) -> LoadedModel:
+        model, artifact_version = self._loaders[path.suffix](path)
+        self._warm_up(model)
+        return LoadedModel(
+            version=artifact_version or version,
+            model=model,
+            path=str(path)
+        )
+
+    def _warm_up(self, model: Any) -> None:
+        """Jalankan dummy batch agar lazy init / JIT model terjadi sebelum traffic"""
+        dummy = np.zeros((self.WARMUP_BATCH_SIZE, 2), dtype=np.float64)
+        output = np.asarray(model.predict(dummy))
+        if output.size != self.WARMUP_BATCH_SIZE:
+            raise ValueError(
+                f"Warm-up gagal: model mengembalikan {output.size} nilai untuk "
+                f"{self.WARMUP_BATCH_SIZE} input"
+            )
+
+    def _swap(self, loaded: LoadedModel) -> None:
+        # Assignment referensi bersifat atomic; pemanggil get() melihat
+        # model lama atau model baru, tidak pernah keadaan setengah jadi
+        self._active = loaded
+        for listener in self._listeners:
+            listener(loaded)
@@ -0,0 +1,78 @@
+"""
+Prediction Cache
+================
+Bounded LRU cache untuk hasil prediksi
+
+Key terdiri dari model_version dan input yang sudah di-quantize,
+sehingga slider/dashboard yang mengirim input sama berulang kali
+tidak memicu inference ulang. Cache di-clear saat model berganti.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class PredictionCache:
+    """Thread-safe LRU cache dengan hit/miss counters"""
+
+    def __init__(self, max_size: int = 10000, precision: int = 2):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Jumlah entry maksimal (0 = cache nonaktif)
+            precision: Jumlah desimal untuk quantize input
+        """
+        self.max_size = max_size
+        self.precision = precision
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def quantize(self, value: float) -> float:
+        """Bulatkan input ke precision cache"""
+        return round(value, self.precision)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Get entry dan tandai sebagai paling baru dipakai"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """Simpan entry, buang entry paling lama jika penuh"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, *args) -> None:
+        """Kosongkan cache (dipakai juga sebagai listener model swap)"""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict[str, Any]:
+        """Statistik cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'precision': self.precision,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -8,31 +8,106 @@ Contoh ini menggunakan simple rule-based model untuk demonstrasi.
 
 Cara integrate real ML model:
 1. Train model (scikit-learn, TensorFlow, PyTorch, etc)
-2. Save model ke ml_models/ folder (joblib, pickle, .h5, etc)
-3. Load model di __init__ method
-4. Update predict() method untuk menggunakan trained model
+2. Save model ke ml_models/ folder sebagai gpa_model-<version>.joblib
+3. ModelRegistry otomatis load versi terbaru saat prediksi pertama
+4. Hot reload via POST /api/predict/model/reload setelah upload versi baru
+
+Semua prediksi lewat satu jalur vectorized (predict_arrays).
+Single prediction diperlakukan sebagai batch berisi satu item.
 """
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pathlib import Path
 
+import numpy as np
+
+from app.ml.model_registry import ModelRegistry, LoadedModel
+from app.ml.prediction_cache import PredictionCache
+from app.ml.inference_scheduler import InferenceScheduler, InferenceTimeout
+from app.utils.exceptions import ServiceUnavailableException
+
+
+# Batas bawah GPA untuk setiap bucket explanation (urut naik)
+EXPLANATION_THRESHOLDS = np.array([2.5, 3.0, 3.5])
+
+# Explanation per bucket, index sesuai hasil np.searchsorted terhadap thresholds
+EXPLANATIONS = (
+    "Below average. Strongly recommended untuk meningkatkan study hours dan attendance.",
+    "Average performance. Consider meningkatkan study hours atau attendance.",
+    "Good performance. Pertahankan study hours dan attendance Anda.",
+    "Excellent performance! Study hours dan attendance sangat baik.",
+)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Round ke 2 desimal, hasil identik dengan built-in round(x, 2)
+
+    np.round bisa berbeda dari round() untuk nilai yang sangat dekat
+    dengan .xx5, jadi nilai-nilai itu saja yang dibulatkan ulang per item.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for idx in np.flatnonzero(near_half):
+        rounded[idx] = round(float(values[idx]), 2)
+    return rounded
+
+
+class RuleBasedModel:
+    """
+    Simple rule-based model untuk demonstrasi
+
+    GPA = 1.0 + (study_hours / 168) * 1.5 + (attendance_rate / 100) * 1.5
+    Dipakai sebagai fallback jika belum ada artifact di ml_models/.
+    """
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        normalized_study = np.minimum(features[:, 0] / 168, 1.0)
+        normalized_attendance = np.minimum(features[:, 1] / 100, 1.0)
+        return 1.0 + normalized_study * 1.5 + normalized_attendance * 1.5
+
 
 class PredictionService:
     """
     Service untuk GPA prediction
 
-    Simple rule-based model untuk demonstrasi.
-    Ganti dengan trained ML model untuk production.
+    Model di-load lazy dari ml_models/ lewat ModelRegistry.
+    Tanpa artifact, memakai simple rule-based model.
     """
 
     def __init__(self):
-        """Initialize prediction service"""
-        self.model_version = "1.0.0-simple"
-        self.model_path = Path(__file__).parent.parent.parent / "ml_models"
+        """Initialize prediction service (tanpa load model)"""
+        default_path = Path(__file__).parent.parent.parent / "ml_models"
+        self.model_path = Path(os.getenv('ML_MODELS_PATH', default_path))
+        self.registry = ModelRegistry(
+            models_path=self.model_path,
+            name='gpa_model',
+            fallback=LoadedModel(version="1.0.0-simple", model=RuleBasedModel())
+        )
+
+        # LRU cache untuk single prediction, di-clear saat model berganti
+        self.cache = PredictionCache(
+            max_size=int(os.getenv('PREDICTION_CACHE_SIZE', 10000)),
+            precision=int(os.getenv('PREDICTION_CACHE_PRECISION', 2))
+        )
+        self.registry.on_swap(self.cache.clear)
+
+        # Micro-batching untuk single predictions yang datang bersamaan
+        self.scheduler = None
+        if os.getenv('PREDICTION_BATCHING_ENABLED', '1') == '1':
+            self.scheduler = InferenceScheduler(
+                predict_fn=lambda study, attendance: self.to_records(self.predict_arrays(study, attendance)),
+                max_batch_size=int(os.getenv('PREDICTION_MAX_BATCH_SIZE', 32)),
+                max_wait_ms=float(os.getenv('PREDICTION_MAX_WAIT_MS', 2.0)),
+                timeout_ms=float(os.getenv('PREDICTION_TIMEOUT_MS', 5000))
+            )
 
-        # Untuk production: Load trained model
-        # self.model = joblib.load(self.model_path / "gpa_model.pkl")
+    @property
+    def model_version(self) -> str:
+        """Versi model yang sedang aktif"""
+        return self.registry.get().version
 
     def predict_gpa(self, study_hours: float, attendance_rate: float) -> Dict[str, Any]:
         """
@@ -45,44 +120,117 @@ class PredictionService:
         Returns:
             Dictionary dengan predicted_gpa, confidence, dll
 
-        Simple Formula (untuk demonstrasi):
-            GPA = 1.0 + (study_hours / 168) * 1.5 + (attendance_rate / 100) * 1.5
-            Range: 1.0 - 4.0
+        Model aktif dari registry; tanpa artifact memakai RuleBasedModel
+        (range 1.0 - 4.0). Input di-quantize ke PREDICTION_CACHE_PRECISION
+        dan hasilnya di-cache per model_version.
+        """
+        if not self.cache.enabled:
+            return self._predict_single(study_hours, attendance_rate)
+
+        study_key = self.cache.quantize(study_hours)
+        attendance_key = self.cache.quantize(attendance_rate)
+        key = (self.model_version, study_key, attendance_key)
+
+        prediction = self.cache.get(key)
+        if prediction is None:
+            prediction = self._predict_single(study_key, attendance_key)
+            self.cache.put(key, prediction)
+
+        return {**prediction, 'study_hours': study_hours, 'attendance_rate': attendance_rate}
+
+    def _predict_single(self, study_hours: float, attendance_rate: float) -> Dict[str, Any]:
+        """Prediksi satu input lewat scheduler, atau sebagai batch berisi satu item"""
+        if self.scheduler is not None:
+            try:
+                return self.scheduler.predict(study_hours, attendance_rate)
+            except InferenceTimeout:
+                raise ServiceUnavailableException("Prediction service sedang sibuk, coba lagi")
 
-        Untuk production, ganti dengan:
-            features = np.array([[study_hours, attendance_rate]])
-            prediction = self.model.predict(features)
+        result = self.predict_arrays(
+            np.array([study_hours], dtype=np.float64),
+            np.array([attendance_rate], dtype=np.float64)
+        )
+        return self.to_records(result)[0]
+
+    def predict_arrays(self, study_hours: np.ndarray, attendance_rate: np.ndarray) -> Dict[str, np.ndarray]:
         """
+        Vectorized prediction untuk seluruh batch sekaligus
 
-        # Simple rule-based calculation
-        # Normalize inputs
-        normalized_study = min(study_hours / 168, 1.0)
-        normalized_attendance = min(attendance_rate / 100, 1.0)
+        Args:
+            study_hours: Array float64 weekly study hours (0-168)
+            attendance_rate: Array float64 attendance percentage (0-100)
 
-        # Calculate GPA (1.0 - 4.0 scale)
-        base_gpa = 1.0
-        study_contribution = normalized_study * 1.5
-        attendance_contribution = normalized_attendance * 1.5
+        Returns:
+            Dictionary of arrays: study_hours, attendance_rate,
+            predicted_gpa, confidence, explanation_index, dan model_version
+        """
+        # Ambil referensi model sekali per batch, aman terhadap hot reload
+        loaded = self.registry.get()
+        features = np.column_stack((study_hours, attendance_rate))
 
-        predicted_gpa = base_gpa + study_contribution + attendance_contribution
+        # Calculate GPA, ensure within valid range (0.0 - 4.0)
+        predicted_gpa = np.asarray(loaded.model.predict(features), dtype=np.float64).reshape(-1)
+        predicted_gpa = np.clip(predicted_gpa, 0.0, 4.0)
 
-        # Ensure within valid range
-        predicted_gpa = max(0.0, min(4.0, predicted_gpa))
+        # Normalize inputs
+        normalized_study = np.minimum(study_hours / 168, 1.0)
+        normalized_attendance = np.minimum(attendance_rate / 100, 1.0)
 
         # Calculate confidence (simple heuristic)
         # Higher confidence when both metrics are balanced
-        balance_factor = 1.0 - abs(normalized_study - normalized_attendance)
+        balance_factor = 1.0 - np.abs(normalized_study - normalized_attendance)
         confidence = 0.7 + (balance_factor * 0.3)  # 0.7 - 1.0
 
         return {
-            'predicted_gpa': round(predicted_gpa, 2),
             'study_hours': study_hours,
             'attendance_rate': attendance_rate,
-            'confidence': round(confidence, 2),
-            'model_version': self.model_version,
-            'explanation': self._get_explanation(predicted_gpa, study_hours, attendance_rate)
+            'predicted_gpa': predicted_gpa,
+            'confidence': confidence,
+            'explanation_index': self._get_explanation_index(predicted_gpa),
+            'model_version': loaded.version
         }
 
+    def to_records(self, result: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        Convert hasil predict_arrays ke list of dicts (format response API)
+
+        Args:
+            result: Output dari predict_arrays
+
+        Returns:
+            List of predictions
+        """
+        model_version = result['model_version']
+        return [
+            {
+                'predicted_gpa': gpa,
+                'study_hours': study,
+                'attendance_rate': attendance,
+                'confidence': confidence,
+                'model_version': model_version,
+                'explanation': EXPLANATIONS[bucket]
+            }
+            for gpa, study, attendance, confidence, bucket in zip(
+                _round2(result['predicted_gpa']).tolist(),
+                result['study_hours'].tolist(),
+                result['attendance_rate'].tolist(),
+                _round2(result['confidence']).tolist(),
+                result['explanation_index'].tolist()
+            )
+        ]
+
+    def _get_explanation_index(self, gpa: np.ndarray) -> np.ndarray:
+        """
+        Map predicted GPA ke bucket explanation
+
+        Args:
+            gpa: Array predicted GPA (belum dibulatkan)
+
+        Returns:
+            Array index ke EXPLANATIONS
+        """
+        return np.searchsorted(EXPLANATION_THRESHOLDS, gpa, side='right')
+
     def _get_explanation(self, gpa: float, study_hours: float, attendance_rate: float) -> str:
         """
         Generate explanation for prediction
@@ -95,14 +243,7 @@ class PredictionService:
         Returns:
             Human-readable explanation
         """
-        if gpa >= 3.5:
-            return "Excellent performance! Study hours dan attendance sangat baik."
-        elif gpa >= 3.0:
-            return "Good performance. Pertahankan study hours dan attendance Anda."
-        elif gpa >= 2.5:
-            return "Average performance. Consider meningkatkan study hours atau attendance."
-        else:
-            return "Below average. Strongly recommended untuk meningkatkan study hours dan attendance."
+        return EXPLANATIONS[int(self._get_explanation_index(np.array([gpa]))[0])]
 
     def batch_predict(self, data: list) -> list:
         """
@@ -114,15 +255,9 @@ class PredictionService:
         Returns:
             List of predictions
         """
-        predictions = []
-        for item in data:
-            prediction = self.predict_gpa(
-                study_hours=item['study_hours'],
-                attendance_rate=item['attendance_rate']
-            )
-            predictions.append(prediction)
-
-        return predictions
+        study_hours = np.fromiter((item['study_hours'] for item in data), dtype=np.float64, count=len(data))
+        attendance_rate = np.fromiter((item['attendance_rate'] for item in data), dtype=np.float64, count=len(data))
+        return self.to_records(self.predict_arrays(study_hours, attendance_rate))
 
 
 # Singleton instance
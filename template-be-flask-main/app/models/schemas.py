@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class OrganizationEvolution(BaseModel):
     phase: str
@@ -24,6 +24,8 @@ class UserCollaboration(BaseModel):
 class BPMNData(BaseModel):
     nodes: List[dict]
     edges: List[dict]
+    start_activities: List[dict] = []
+    end_activities: List[dict] = []
 
 class MonthlyInteraction(BaseModel):
     month: str
@@ -43,6 +45,23 @@ class OvertimeRisk(BaseModel):
 class ProjectDuration(BaseModel):
     case_id: str
     duration_days: int
+    duration_hours: Optional[float] = None
+    event_count: Optional[int] = None
+    people_count: Optional[int] = None
+    role_count: Optional[int] = None
+    first_event: Optional[str] = None
+    last_event: Optional[str] = None
+
+class DurationBin(BaseModel):
+    lower_hours: float
+    upper_hours: float
+    count: int
+
+class ProjectDurationDistribution(BaseModel):
+    count: int
+    mean_hours: float
+    percentiles: dict
+    histogram: List[DurationBin]
 
 class HandoverFlow(BaseModel):
     source_role: str
@@ -53,3 +72,63 @@ class UtilizationMetric(BaseModel):
     day: int
     hour: int
     count: int
+
+class ProcessVariant(BaseModel):
+    rank: int
+    activities: List[str]
+    length: int
+    frequency: int
+    case_share: float
+    mean_duration_hours: float
+    p50_duration_hours: float
+    p95_duration_hours: float
+
+class UserCentrality(BaseModel):
+    name: str
+    role: Optional[str] = None
+    degree: int
+    weighted_degree: float
+    betweenness: float
+    pagerank: float
+    component: int
+
+class Community(BaseModel):
+    id: int
+    size: int
+    members: List[dict]
+
+class CommunityResult(BaseModel):
+    algorithm: str
+    modularity: float
+    communities: List[Community]
+
+class DashboardPanel(BaseModel):
+    ok: bool
+    ms: float
+    data: Any = None
+    error: Optional[str] = None
+    state: Optional[str] = None
+
+class Dashboard(BaseModel):
+    filters: Dict[str, Optional[str]]
+    panels: Dict[str, DashboardPanel]
+
+class Dataset(BaseModel):
+    name: str
+    cases: int
+    events: int
+    first_event: str
+    last_event: str
+
+class RejectedRow(BaseModel):
+    line: int
+    reason: str
+
+class ImportResult(BaseModel):
+    source_file: str
+    accepted: int
+    rejected: int
+    rejected_reasons: Dict[str, int]
+    errors: List[RejectedRow]
+    written: int
+    projected: bool
@@ -13,11 +13,61 @@ Dalam aplikasi production, bisa diganti dengan:
 Tanpa perlu mengubah service layer atau layer di atasnya.
 """
 
-from typing import List, Optional
+from bisect import bisect_left, bisect_right, insort
+import heapq
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from app.models.student import Student
 
 
+# Karakter Unicode terbesar, dipakai sebagai batas atas prefix search
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class _SortedIndex:
+    """
+    Sorted index untuk satu field Student
+
+    Menyimpan pasangan (key, id) yang selalu terurut sehingga range
+    query dan pagination cukup memakai bisect, tanpa sort ulang.
+    """
+
+    def __init__(self, key_func: Callable[[Student], Any]):
+        self.key_func = key_func
+        self._entries: List[Tuple[Any, int]] = []
+
+    def add(self, student: Student) -> None:
+        insort(self._entries, (self.key_func(student), student.id))
+
+    def remove(self, student: Student) -> None:
+        entry = (self.key_func(student), student.id)
+        idx = bisect_left(self._entries, entry)
+        if idx < len(self._entries) and self._entries[idx] == entry:
+            del self._entries[idx]
+
+    def range(self, low: Any = None, high: Any = None) -> Tuple[int, int]:
+        """Posisi [start, end) untuk key di antara low dan high (inklusif)"""
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        end = len(self._entries) if high is None else bisect_right(self._entries, (high, math.inf))
+        return start, max(start, end)
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Posisi [start, end) untuk key string yang diawali prefix"""
+        start = bisect_left(self._entries, (prefix,))
+        end = bisect_left(self._entries, (prefix + _MAX_CHAR,))
+        return start, end
+
+    def ids(self, start: int, end: int, descending: bool = False) -> List[int]:
+        entries = self._entries[start:end]
+        if descending:
+            entries.reverse()
+        return [student_id for _, student_id in entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class StudentRepository:
     """
     Repository untuk mengelola persistence Student entity
@@ -26,11 +76,32 @@ class StudentRepository:
     membuat code lebih testable dan maintainable.
     """
 
+    # Field yang bisa dipakai untuk sorting/filtering di find_page
+    SORTABLE_FIELDS = ('id', 'name', 'study_hours', 'attendance_rate', 'gpa')
+
     def __init__(self):
         """Initialize in-memory storage"""
         self._storage: dict[int, Student] = {}
         self._current_id = 1
 
+        # Sorted indexes, di-maintain setiap create/update/delete.
+        # GPA None diurutkan paling akhir.
+        self._indexes: Dict[str, _SortedIndex] = {
+            'id': _SortedIndex(lambda s: s.id),
+            'name': _SortedIndex(lambda s: s.name.casefold()),
+            'study_hours': _SortedIndex(lambda s: s.study_hours),
+            'attendance_rate': _SortedIndex(lambda s: s.attendance_rate),
+            'gpa': _SortedIndex(lambda s: (s.gpa is None, s.gpa or 0.0)),
+        }
+
+    def _index_add(self, student: Student) -> None:
+        for index in self._indexes.values():
+            index.add(student)
+
+    def _index_remove(self, student: Student) -> None:
+        for index in self._indexes.values():
+            index.remove(student)
+
     def create(self, student: Student) -> Student:
         """
         Create new student
@@ -45,6 +116,7 @@ class StudentRepository:
         student.created_at = datetime.utcnow()
         student.updated_at = datetime.utcnow()
         self._storage[self._current_id] = student
+        self._index_add(student)
         self._current_id += 1
         return student
 
@@ -69,6 +141,102 @@ class StudentRepository:
         """
         return list(self._storage.values())
 
+    def find_page(
+        self,
+        offset: int = 0,
+        limit: int = 20,
+        sort_by: str = 'id',
+        descending: bool = False,
+        gpa_min: Optional[float] = None,
+        gpa_max: Optional[float] = None,
+        attendance_min: Optional[float] = None,
+        attendance_max: Optional[float] = None,
+        name_prefix: Optional[str] = None
+    ) -> Tuple[List[Student], int]:
+        """
+        Get satu halaman students dengan filter dan sorting
+
+        Memakai sorted indexes sehingga hanya student di halaman yang
+        di-materialize. Filter dengan range tersempit dipakai sebagai
+        driver, filter lain dicek per kandidat.
+
+        Args:
+            offset: Jumlah data yang dilewati
+            limit: Jumlah data maksimal dalam halaman
+            sort_by: Field untuk sorting (lihat SORTABLE_FIELDS)
+            descending: True untuk urutan menurun
+            gpa_min, gpa_max: Range GPA (student tanpa GPA tidak ikut)
+            attendance_min, attendance_max: Range attendance rate
+            name_prefix: Prefix nama (case-insensitive)
+
+        Returns:
+            Tuple (list student di halaman, total student yang match)
+        """
+        if sort_by not in self._indexes:
+            raise ValueError(f"Field sort tidak valid: {sort_by}")
+
+        # Range posisi per filter aktif pada index masing-masing
+        ranges: Dict[str, Tuple[int, int]] = {}
+        predicates: Dict[str, Callable[[Student], bool]] = {}
+
+        if gpa_min is not None or gpa_max is not None:
+            low = (False, gpa_min) if gpa_min is not None else (False,)
+            high = (False, gpa_max) if gpa_max is not None else (False, math.inf)
+            ranges['gpa'] = self._indexes['gpa'].range(low, high)
+            predicates['gpa'] = lambda s: (
+                s.gpa is not None
+                and (gpa_min is None or s.gpa >= gpa_min)
+                and (gpa_max is None or s.gpa <= gpa_max)
+            )
+
+        if attendance_min is not None or attendance_max is not None:
+            ranges['attendance_rate'] = self._indexes['attendance_rate'].range(
+                attendance_min, attendance_max
+            )
+            predicates['attendance_rate'] = lambda s: (
+                (attendance_min is None or s.attendance_rate >= attendance_min)
+                and (attendance_max is None or s.attendance_rate <= attendance_max)
+            )
+
+        if name_prefix:
+            prefix = name_prefix.casefold()
+            ranges['name'] = self._indexes['name'].prefix_range(prefix)
+            predicates['name'] = lambda s: s.name.casefold().startswith(prefix)
+
+        sort_index = self._indexes[sort_by]
+
+        # Fast path: tanpa filter, atau satu-satunya filter ada di field sort.
+        # Halaman langsung di-slice dari sort index.
+        if not ranges or set(ranges) == {sort_by}:
+            start, end = ranges.get(sort_by, (0, len(sort_index)))
+            total = end - start
+            if descending:
+                page_start, page_end = max(start, end - offset - limit), end - offset
+            else:
+                page_start, page_end = start + offset, min(end, start + offset + limit)
+            ids = sort_index.ids(page_start, page_end, descending) if page_start < page_end else []
+            return [self._storage[student_id] for student_id in ids], total
+
+        # Driver = filter dengan kandidat paling sedikit
+        driver = min(ranges, key=lambda field: ranges[field][1] - ranges[field][0])
+        checks = [check for field, check in predicates.items() if field != driver]
+        candidates = [
+            student for student in (
+                self._storage[student_id]
+                for student_id in self._indexes[driver].ids(*ranges[driver])
+            )
+            if all(check(student) for check in checks)
+        ]
+
+        total = len(candidates)
+        if offset >= total:
+            return [], total
+
+        sort_key = lambda s: (sort_index.key_func(s), s.id)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        page = select(offset + limit, candidates, key=sort_key)[offset:]
+        return page, total
+
     def find_by_email(self, email: str) -> Optional[Student]:
         """
         Find student by email
@@ -102,7 +270,9 @@ class StudentRepository:
         student.updated_at = datetime.utcnow()
         # Preserve created_at from original
         student.created_at = self._storage[student_id].created_at
+        self._index_remove(self._storage[student_id])
         self._storage[student_id] = student
+        self._index_add(student)
         return student
 
     def delete(self, student_id: int) -> bool:
@@ -116,7 +286,7 @@ class StudentRepository:
             True if deleted, False if not found
         """
         if student_id in self._storage:
-            del self._storage[student_id]
+            self._index_remove(self._storage.pop(student_id))
             return True
         return False
 
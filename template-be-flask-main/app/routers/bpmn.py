@@ -1,18 +1,39 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from neo4j import Session
 from app.db.neo4j import get_db
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
 from app.services.analytics import AnalyticsService
+from app.services.process_discovery import ProcessDiscoveryService
 from app.models.schemas import BPMNData
 
 router = APIRouter(
     prefix="/bpmn",
-    tags=["BPMN"]
+    tags=["BPMN"],
+    route_class=TimedRoute
 )
 
 @router.get("/data", response_model=BPMNData)
-async def get_bpmn_data(session: Session = Depends(get_db)):
+def get_bpmn_data(
+    min_activity_frequency: int = Query(1, ge=1, description="Hide activities occurring fewer times than this"),
+    min_edge_frequency: int = Query(1, ge=1, description="Hide directly-follows edges observed fewer times than this"),
+    edge_ratio: float = Query(0.0, ge=0.0, le=1.0, description="Hide edges weaker than this fraction of the strongest outgoing edge of their source"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
     """
-    Get data structured for BPMN conversion.
+    Get the activity-level directly-follows graph (process discovery).
+    """
+    service = ProcessDiscoveryService(session)
+    return json_response(service.get_directly_follows_graph(min_activity_frequency, min_edge_frequency, edge_ratio, dataset))
+
+@router.get("/roles", response_model=BPMNData)
+def get_bpmn_roles(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Get the role interaction graph (Role nodes, INTERACTS_WITH weights).
     """
     service = AnalyticsService(session)
-    return service.get_bpmn_data()
+    return json_response(service.get_bpmn_data(dataset))
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Query, Response
+from typing import Callable
+from app.db.neo4j import get_session_factory
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
+from app.services.dashboard import DashboardService
+from app.services.time_keys import MONTH_PATTERN
+from app.models.schemas import Dashboard
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    route_class=TimedRoute
+)
+
+@router.get("", response_model=Dashboard)
+def get_dashboard(
+    start_month: str = Query(None, pattern=MONTH_PATTERN, description="Start month (YYYY-MM) for the evolution panels"),
+    end_month: str = Query(None, pattern=MONTH_PATTERN, description="End month (YYYY-MM) for the evolution panels"),
+    role: str = Query(None, description="Only this role in the overtime panel"),
+    dataset: str = Query(None, description="Only data imported from this source file (all panels)"),
+    session_factory: Callable = Depends(get_session_factory),
+    response: Response = None
+):
+    """
+    All dashboard panels in one response, computed concurrently.
+    A failing panel is reported as {"ok": false, "error": ...} without failing the others.
+    A timed-out panel also reports whether it is still "running" or "queued".
+    Responses with a failed panel are sent with Cache-Control: no-store and no ETag.
+    """
+    service = DashboardService(session_factory)
+    dashboard = service.get_dashboard(start_month, end_month, role, dataset)
+    if service.is_degraded(dashboard):
+        response.headers["Cache-Control"] = "no-store"
+    return json_response(dashboard, headers=dict(response.headers))
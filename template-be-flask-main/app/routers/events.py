@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+from app.core.instrumentation import TimedRoute
+from app.services.notifications import graph_events
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"],
+    route_class=TimedRoute
+)
+
+@router.get("")
+async def stream_events(last_event_id: str = Header(None)):
+    """
+    Server-Sent Events stream: a `graph-version` event whenever imported data changes.
+    The current version is sent on connect (unless it matches Last-Event-ID).
+    """
+    return StreamingResponse(
+        graph_events.subscribe(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
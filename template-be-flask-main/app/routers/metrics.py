@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+from app.core.compression import compression_stats
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
+from app.core.tracing import route_metrics
+from app.db.query_executor import query_metrics
+from app.services.analytics import analytics_flight
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    route_class=TimedRoute
+)
+
+@router.get("/queries", response_model=dict)
+async def get_query_metrics():
+    """
+    Per-query latency, server timing, rows and db hits histograms.
+    """
+    return json_response(query_metrics.snapshot())
+
+@router.get("/slow-queries", response_model=list)
+async def get_slow_queries():
+    """
+    Most recent queries slower than QUERY_SLOW_MS (newest first).
+    """
+    return json_response(query_metrics.slow_queries())
+
+@router.get("/compression", response_model=list)
+async def get_compression_metrics():
+    """
+    Compression ratio and CPU time per route and encoding.
+    """
+    return json_response(compression_stats.snapshot())
+
+@router.get("/routes", response_model=dict)
+async def get_route_metrics():
+    """
+    Latency histogram and status counts per route, plus in-flight requests.
+    """
+    return json_response(route_metrics.snapshot())
+
+@router.get("/coalescing", response_model=dict)
+async def get_coalescing_metrics():
+    """
+    Analytics calls executed vs. served from an identical in-flight call.
+    """
+    return json_response(analytics_flight.snapshot())
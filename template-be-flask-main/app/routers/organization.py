@@ -1,104 +1,164 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List
 from neo4j import Session
 from app.db.neo4j import get_db
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
 from app.services.analytics import AnalyticsService
 from app.services.importer import DataImporter
+from app.services.time_keys import MONTH_PATTERN, YEAR_PATTERN
+from app.services.upload_import import UploadError, import_stream, open_upload
+from app.services.variants import VariantService
 import os
-from app.models.schemas import OrganizationEvolution
+from app.models.schemas import Dataset, ImportResult, OrganizationEvolution, OvertimeRisk, ProcessVariant, ProjectDuration, ProjectDurationDistribution
 
 router = APIRouter(
     prefix="/organization",
-    tags=["Organization"]
+    tags=["Organization"],
+    route_class=TimedRoute
 )
 
 @router.get("/evolution", response_model=OrganizationEvolution)
-async def get_organization_evolution(
-    start_month: str = Query(..., description="Start month (YYYY-MM)"),
-    end_month: str = Query(..., description="End month (YYYY-MM)"),
+def get_organization_evolution(
+    start_month: str = Query(..., pattern=MONTH_PATTERN, description="Start month (YYYY-MM)"),
+    end_month: str = Query(..., pattern=MONTH_PATTERN, description="End month (YYYY-MM)"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    exact: bool = Query(True, description="Exact distinct users/roles (bitset union). false: HyperLogLog estimate (~1.6% error), constant size per month"),
     session: Session = Depends(get_db)
 ):
     """
     Get organization evolution statistics for a given period.
     """
     service = AnalyticsService(session)
-    return service.get_organization_evolution(start_month, end_month)
+    return json_response(service.get_organization_evolution(start_month, end_month, dataset, exact))
 
 @router.get("/evolution-trend", response_model=List[OrganizationEvolution])
-async def get_organization_evolution_trend(
-    start_month: str = Query(..., description="Start month (YYYY-MM)"),
-    end_month: str = Query(..., description="End month (YYYY-MM)"),
+def get_organization_evolution_trend(
+    start_month: str = Query(..., pattern=MONTH_PATTERN, description="Start month (YYYY-MM)"),
+    end_month: str = Query(..., pattern=MONTH_PATTERN, description="End month (YYYY-MM)"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Get organization evolution trend (monthly) for a given period.
     """
     service = AnalyticsService(session)
-    return service.get_organization_evolution_trend(start_month, end_month)
+    return json_response(service.get_organization_evolution_trend(start_month, end_month, dataset))
 
 @router.get("/interactions-trend", response_model=List[dict]) # Using dict for simplicity, or import MonthlyInteraction
-async def get_interactions_trend(
-    year: str = Query(None, description="Year to filter (YYYY). If omitted, returns all time."),
+def get_interactions_trend(
+    year: str = Query(None, pattern=YEAR_PATTERN, description="Year to filter (YYYY). If omitted, returns all time."),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Get total interactions per month.
     """
     service = AnalyticsService(session)
-    return service.get_monthly_interactions(year)
+    return json_response(service.get_monthly_interactions(year, dataset))
 
-@router.get("/overtime", response_model=List[dict]) # Should use OvertimeRisk schema
-async def get_overtime_risk(
+@router.get("/overtime", response_model=List[OvertimeRisk])
+def get_overtime_risk(
+    limit: int = Query(5, ge=1, le=1000, description="Number of users to return"),
+    month: str = Query(None, pattern=MONTH_PATTERN, description="Only count overtime in this month (YYYY-MM)"),
+    role: str = Query(None, description="Only users with this role"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
-    Identify employees working outside standard business hours (Top 5).
+    Identify employees working outside the configured working calendar (Top N).
     """
     service = AnalyticsService(session)
-    return service.get_overtime_risk()
+    return json_response(service.get_overtime_risk(limit, month, role, dataset))
 
-@router.get("/project-durations", response_model=List[dict]) # Should use ProjectDuration schema
-async def get_project_durations(
+@router.get("/project-durations", response_model=List[ProjectDuration])
+def get_project_durations(
+    limit: int = Query(10, ge=1, le=1000, description="Number of longest cases to return"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    source_file: str = Query(None, deprecated=True, description="Deprecated alias of dataset"),
+    month: str = Query(None, pattern=MONTH_PATTERN, description="Only cases starting in this month (YYYY-MM)"),
     session: Session = Depends(get_db)
 ):
     """
-    Calculate the lifecycle duration of each Case (Top 10 Longest).
+    Longest running Cases from the precomputed case lifecycle summary (Top K).
     """
     service = AnalyticsService(session)
-    return service.get_project_durations()
+    return json_response(service.get_project_durations(limit, dataset or source_file, month))
 
 @router.get("/project-durations/average", response_model=float)
-async def get_average_project_duration(
+def get_average_project_duration(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    source_file: str = Query(None, deprecated=True, description="Deprecated alias of dataset"),
+    month: str = Query(None, pattern=MONTH_PATTERN, description="Only cases starting in this month (YYYY-MM)"),
     session: Session = Depends(get_db)
 ):
     """
     Get the average duration of all projects.
     """
     service = AnalyticsService(session)
-    return service.get_average_project_duration()
+    return json_response(service.get_average_project_duration(dataset or source_file, month))
+
+@router.get("/project-durations/distribution", response_model=ProjectDurationDistribution)
+def get_project_duration_distribution(
+    bins: int = Query(20, ge=1, le=200, description="Number of histogram bins"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    source_file: str = Query(None, deprecated=True, description="Deprecated alias of dataset"),
+    month: str = Query(None, pattern=MONTH_PATTERN, description="Only cases starting in this month (YYYY-MM)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Percentiles and histogram of case durations (hours).
+    """
+    service = AnalyticsService(session)
+    return json_response(service.get_project_duration_distribution(bins, dataset or source_file, month))
+
+@router.get("/datasets", response_model=List[Dataset])
+def get_datasets(
+    session: Session = Depends(get_db)
+):
+    """
+    Imported datasets (one per source file) with case/event counts and month range.
+    """
+    service = AnalyticsService(session)
+    return json_response(service.get_datasets())
 
 @router.get("/handovers", response_model=List[dict]) # Should use HandoverFlow schema
-async def get_handover_flow(
+def get_handover_flow(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Visualize the 'chain of command' or workflow efficiency.
     """
     service = AnalyticsService(session)
-    return service.get_handover_flow()
+    return json_response(service.get_handover_flow(dataset))
 
 @router.get("/utilization", response_model=List[dict]) # Should use UtilizationMetric schema
-async def get_resource_utilization(
+def get_resource_utilization(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Identify burnout risks and peak operational hours.
     """
     service = AnalyticsService(session)
-    return service.get_resource_utilization()
+    return json_response(service.get_resource_utilization(dataset))
+
+@router.get("/variants", response_model=List[ProcessVariant])
+def get_process_variants(
+    top_k: int = Query(10, ge=1, le=1000, description="Number of most frequent variants to return"),
+    prefix: List[str] = Query(None, description="Only variants whose trace starts with these activities (repeat the parameter, in order)"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Group cases by activity trace (process variants) with frequency and duration statistics.
+    """
+    service = VariantService(session)
+    return json_response(service.get_variants(top_k, prefix, dataset))
 
 @router.post("/load-data")
-async def load_data(session: Session = Depends(get_db)):
+def load_data(session: Session = Depends(get_db)):
     """
     Reset database and load data from CSV files in data-analysis folder.
     """
@@ -145,3 +205,24 @@ async def load_data(session: Session = Depends(get_db)):
         }
     except Exception as e:
         return {"success": False, "message": str(e)}
+
+@router.post("/import", response_model=ImportResult)
+async def import_event_log(
+    request: Request,
+    source_file: str = Query(None, description="Source name stored on WORKED_ON (default: multipart filename or upload-<timestamp>.csv)"),
+    project: bool = Query(True, description="Rebuild COLLABORATED_IN / INTERACTS_WITH after the import"),
+    session: Session = Depends(get_db)
+):
+    """
+    Append an event log from the request body (raw CSV, chunked, or multipart/form-data file).
+    Rows are parsed and written in batches as the body arrives; memory stays bounded by the batch size.
+    """
+    importer = DataImporter(session)
+    try:
+        chunks, name = await open_upload(request.stream(), request.headers.get("content-type", ""), source_file)
+        result = await import_stream(chunks, importer, name, project)
+    except UploadError as e:
+        # Row yang sudah ditulis sebelum error ikut dilaporkan
+        detail = {"message": str(e), "result": e.result} if e.result and e.result["written"] else str(e)
+        raise HTTPException(status_code=400, detail=detail)
+    return json_response(result)
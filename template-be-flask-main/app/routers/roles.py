@@ -2,37 +2,47 @@ from fastapi import APIRouter, Depends, Query
 from typing import List
 from neo4j import Session
 from app.db.neo4j import get_db
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
 from app.services.analytics import AnalyticsService
 from app.models.schemas import RoleInteraction
 
 router = APIRouter(
     prefix="/roles",
-    tags=["Roles"]
+    tags=["Roles"],
+    route_class=TimedRoute
 )
 
 @router.get("/interactions", response_model=List[RoleInteraction])
-async def get_role_interactions(session: Session = Depends(get_db)):
+def get_role_interactions(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
     """
     Get all role interactions.
     """
     service = AnalyticsService(session)
-    return service.get_role_interactions()
+    return json_response(service.get_role_interactions(dataset))
 
 @router.get("/top-interactions", response_model=List[RoleInteraction])
-async def get_top_interactions(
+def get_top_interactions(
     limit: int = Query(10, description="Number of top interactions to return"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Get top N strongest role interactions.
     """
     service = AnalyticsService(session)
-    return service.get_top_interactions(limit)
+    return json_response(service.get_top_interactions(limit, dataset))
 
 @router.get("/all", response_model=List[dict])
-async def get_all_roles(session: Session = Depends(get_db)):
+def get_all_roles(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
     """
     Get all existing roles.
     """
     service = AnalyticsService(session)
-    return service.get_all_roles()
+    return json_response(service.get_all_roles(dataset))
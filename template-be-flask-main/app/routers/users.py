@@ -2,29 +2,67 @@ from fastapi import APIRouter, Depends, Query
 from typing import List
 from neo4j import Session
 from app.db.neo4j import get_db
+from app.core.instrumentation import TimedRoute
+from app.core.responses import json_response
 from app.services.analytics import AnalyticsService
-from app.models.schemas import UserCollaboration
+from app.services.collaboration_network import CollaborationNetworkService
+from app.services.time_keys import MONTH_PATTERN
+from app.models.schemas import UserCollaboration, UserCentrality, CommunityResult
 
 router = APIRouter(
     prefix="/users",
-    tags=["Users"]
+    tags=["Users"],
+    route_class=TimedRoute
 )
 
 @router.get("/collaboration", response_model=List[UserCollaboration])
-async def get_user_collaboration(
-    month: str = Query(..., description="Month to filter (YYYY-MM)"),
+def get_user_collaboration(
+    month: str = Query(..., pattern=MONTH_PATTERN, description="Month to filter (YYYY-MM)"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
     session: Session = Depends(get_db)
 ):
     """
     Get user collaboration for a specific month.
     """
     service = AnalyticsService(session)
-    return service.get_user_collaboration(month)
+    return json_response(service.get_user_collaboration(month, dataset))
 
 @router.get("/all", response_model=List[dict])
-async def get_all_users(session: Session = Depends(get_db)):
+def get_all_users(
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
     """
     Get all existing users.
     """
     service = AnalyticsService(session)
-    return service.get_all_users()
+    return json_response(service.get_all_users(dataset))
+
+@router.get("/centrality", response_model=List[UserCentrality])
+def get_user_centrality(
+    start_month: str = Query(None, pattern=MONTH_PATTERN, description="Start month (YYYY-MM). If omitted, from the first month."),
+    end_month: str = Query(None, pattern=MONTH_PATTERN, description="End month (YYYY-MM). If omitted, until the last month."),
+    limit: int = Query(None, ge=1, description="Return only the top N users by PageRank"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Degree, weighted degree, betweenness, PageRank and component of each user in the collaboration network.
+    """
+    service = CollaborationNetworkService(session)
+    return json_response(service.get_centrality(start_month, end_month, limit, dataset))
+
+@router.get("/communities", response_model=CommunityResult)
+def get_user_communities(
+    start_month: str = Query(None, pattern=MONTH_PATTERN, description="Start month (YYYY-MM). If omitted, from the first month."),
+    end_month: str = Query(None, pattern=MONTH_PATTERN, description="End month (YYYY-MM). If omitted, until the last month."),
+    algorithm: str = Query("louvain", pattern="^(louvain|components)$", description="louvain or components"),
+    resolution: float = Query(1.0, gt=0, description="Louvain resolution (higher gives smaller communities)"),
+    dataset: str = Query(None, description="Only data imported from this source file (see /organization/datasets)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Detect communities in the collaboration network (Louvain or connected components).
+    """
+    service = CollaborationNetworkService(session)
+    return json_response(service.get_communities(start_month, end_month, algorithm, resolution, dataset))
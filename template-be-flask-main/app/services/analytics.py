@@ -1,58 +1,141 @@
+import functools
+import numpy as np
 from neo4j import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
+from app.core.single_flight import SingleFlight
+from app.db.query_executor import QueryExecutor
+from app.services.activity_sketch import bitset_union_count, hll_union_count
+from app.services.graph_version import VersionedCache, graph_version
+from app.services.time_keys import month_key, year_key_range
+
+_case_duration_cache = VersionedCache(max_entries=32)
+# (dataset, month_key) yang punya WORKED_ON tapi belum punya MonthActivity
+_sketch_coverage_cache = VersionedCache(max_entries=1)
+
+# Request identik yang datang bersamaan (mis. dashboard setelah import)
+# berbagi satu query; lihat /metrics/coalescing
+analytics_flight = SingleFlight()
+
+
+def coalesced(method: Callable) -> Callable:
+    """
+    Jalankan method lewat analytics_flight, key = (method, argumen, graph
+    epoch dan version). Versi ikut di key supaya caller setelah import tidak
+    menerima hasil query yang dimulai sebelum import.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())), graph_version.snapshot())
+        return analytics_flight.do(key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+def dataset_predicate(dataset: Optional[str], expression: str) -> str:
+    """
+    "AND <expression> = $dataset" jika dataset difilter, selain itu kosong.
+    Predicate hanya ditulis saat dipakai (bukan `$dataset IS NULL OR ...`)
+    supaya planner bisa memakai index partisi dataset.
+    """
+    return f"AND {expression} = $dataset" if dataset else ""
+
 
 class AnalyticsService:
     def __init__(self, session: Session):
         self.session = session
+        self.db = QueryExecutor(session)
+
+    @coalesced
+    def get_organization_evolution(
+        self,
+        start_month: str,
+        end_month: str,
+        dataset: str = None,
+        exact: bool = True
+    ) -> Dict[str, Any]:
+        # Distinct person/role dari merge sketch MonthActivity per bulan
+        # (DataImporter.update_activity_sketches): bitset (exact) atau
+        # HyperLogLog (exact=False, ukuran tetap per bulan)
+        kind = "bits" if exact else "hll"
+        query_activity = f"""
+        MATCH (a:MonthActivity)
+        WHERE a.month_key >= $start_key AND a.month_key <= $end_key {dataset_predicate(dataset, "a.dataset")}
+        RETURN a.people_{kind} as people, a.roles_{kind} as roles
+        """
+        query_interactions = f"""
+        MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
+        WHERE r.month_key >= $start_key AND r.month_key <= $end_key {dataset_predicate(dataset, "r.dataset")}
+        RETURN sum(r.weight) as total_interactions
+        """
+        keys = {"start_key": month_key(start_month), "end_key": month_key(end_month), "dataset": dataset}
+        missing = [
+            (missing_dataset, key) for missing_dataset, key in self._months_without_sketch()
+            if keys["start_key"] <= key <= keys["end_key"] and (not dataset or missing_dataset == dataset)
+        ]
+        if not missing:
+            sketches = self.db.run("analytics.organization_evolution_activity", query_activity, **keys)
+            union_count = bitset_union_count if exact else hll_union_count
+            active_users = union_count(r["people"] for r in sketches)
+            active_roles = union_count(r["roles"] for r in sketches)
+        else:
+            # Sebagian bulan di range di-load sebelum MonthActivity ada (backfill
+            # lewat DataImporter.migrate_time_keys); union sketch akan kurang
+            # hitung, jadi hitung langsung dari WORKED_ON
+            query_distinct = f"""
+            MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
+            WHERE w.month_key >= $start_key AND w.month_key <= $end_key {dataset_predicate(dataset, "w.source_file")}
+            RETURN count(DISTINCT p) as active_users, count(DISTINCT p.role) as active_roles
+            """
+            counts = self.db.single("analytics.organization_evolution_distinct", query_distinct, **keys)
+            active_users = counts["active_users"] if counts else 0
+            active_roles = counts["active_roles"] if counts else 0
+        record = self.db.single("analytics.organization_evolution_interactions", query_interactions, **keys)
+
+        return {
+            "phase": f"{start_month} to {end_month}",
+            "active_users": active_users,
+            "active_roles": active_roles,
+            "total_interactions": (record["total_interactions"] if record else None) or 0,
+            "top_roles": []
+        }
 
-    def get_organization_evolution(self, start_month: str, end_month: str) -> Dict[str, Any]:
+    def _months_without_sketch(self) -> List[tuple]:
+        """(dataset, month_key) yang punya WORKED_ON tapi tidak punya MonthActivity, per graph version"""
         query = """
-        MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
-        WHERE w.month >= $start_month AND w.month <= $end_month
-        WITH count(DISTINCT p) as active_users, count(DISTINCT p.role) as active_roles
-        
-        OPTIONAL MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
-        WHERE r.month >= $start_month AND r.month <= $end_month
-        WITH active_users, active_roles, sum(r.weight) as total_interactions
-        
-        RETURN {
-            active_users: active_users,
-            active_roles: active_roles,
-            total_interactions: coalesce(total_interactions, 0)
-        } as stats
+        MATCH ()-[w:WORKED_ON]->()
+        WITH DISTINCT w.source_file as dataset, w.month_key as month_key
+        WHERE month_key IS NOT NULL
+          AND NOT EXISTS { MATCH (a:MonthActivity {dataset: dataset, month_key: month_key}) }
+        RETURN dataset, month_key
         """
-        result = self.session.run(query, start_month=start_month, end_month=end_month)
-        record = result.single()
-        if record:
-            stats = record["stats"]
-            return {
-                "phase": f"{start_month} to {end_month}",
-                "active_users": stats["active_users"],
-                "active_roles": stats["active_roles"],
-                "total_interactions": stats["total_interactions"] or 0,
-                "top_roles": []
-            }
-        return {}
 
-    def get_organization_evolution_trend(self, start_month: str, end_month: str) -> List[Dict[str, Any]]:
-        query_users = """
+        def load() -> List[tuple]:
+            return [
+                (record["dataset"], record["month_key"])
+                for record in self.db.run("analytics.months_without_sketch", query)
+            ]
+
+        return _sketch_coverage_cache.get_or_compute("missing", load)
+
+    @coalesced
+    def get_organization_evolution_trend(self, start_month: str, end_month: str, dataset: str = None) -> List[Dict[str, Any]]:
+        query_users = f"""
         MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
-        WHERE w.month >= $start_month AND w.month <= $end_month
+        WHERE w.month_key >= $start_key AND w.month_key <= $end_key {dataset_predicate(dataset, "w.source_file")}
         WITH w.month as month, count(DISTINCT p) as active_users, count(DISTINCT p.role) as active_roles
         RETURN month, active_users, active_roles
         ORDER BY month
         """
         
-        query_interactions = """
+        query_interactions = f"""
         MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
-        WHERE r.month >= $start_month AND r.month <= $end_month
+        WHERE r.month_key >= $start_key AND r.month_key <= $end_key {dataset_predicate(dataset, "r.dataset")}
         WITH r.month as month, sum(r.weight) as total_interactions
         RETURN month, total_interactions
         ORDER BY month
         """
         
-        users_result = self.session.run(query_users, start_month=start_month, end_month=end_month)
-        interactions_result = self.session.run(query_interactions, start_month=start_month, end_month=end_month)
+        keys = {"start_key": month_key(start_month), "end_key": month_key(end_month), "dataset": dataset}
+        users_result = self.db.run("analytics.evolution_trend_users", query_users, **keys)
+        interactions_result = self.db.run("analytics.evolution_trend_interactions", query_interactions, **keys)
         
         data_map = {}
         
@@ -81,39 +164,45 @@ class AnalyticsService:
         # Convert to list and sort
         return sorted(data_map.values(), key=lambda x: x["phase"])
 
-    def get_role_interactions(self) -> List[Dict[str, Any]]:
-        query = """
+    @coalesced
+    def get_role_interactions(self, dataset: str = None) -> List[Dict[str, Any]]:
+        # INTERACTS_WITH dipartisi per dataset; tanpa filter, partisi dijumlahkan
+        query = f"""
         MATCH (r1:Role)-[i:INTERACTS_WITH]->(r2:Role)
-        RETURN r1.name as role_a, r2.name as role_b, i.total_weight as weight
+        WHERE true {dataset_predicate(dataset, "i.dataset")}
+        RETURN r1.name as role_a, r2.name as role_b, sum(i.total_weight) as weight
         ORDER BY weight DESC
         """
-        result = self.session.run(query)
+        result = self.db.run("analytics.role_interactions", query, dataset=dataset)
         return [
             {"role_a": record["role_a"], "role_b": record["role_b"], "weight": record["weight"]}
             for record in result
         ]
 
-    def get_top_interactions(self, limit: int = 10) -> List[Dict[str, Any]]:
-        query = """
+    @coalesced
+    def get_top_interactions(self, limit: int = 10, dataset: str = None) -> List[Dict[str, Any]]:
+        query = f"""
         MATCH (r1:Role)-[i:INTERACTS_WITH]->(r2:Role)
-        RETURN r1.name as role_a, r2.name as role_b, i.total_weight as weight
+        WHERE true {dataset_predicate(dataset, "i.dataset")}
+        RETURN r1.name as role_a, r2.name as role_b, sum(i.total_weight) as weight
         ORDER BY weight DESC
         LIMIT $limit
         """
-        result = self.session.run(query, limit=limit)
+        result = self.db.run("analytics.top_interactions", query, limit=limit, dataset=dataset)
         return [
             {"role_a": record["role_a"], "role_b": record["role_b"], "weight": record["weight"]}
             for record in result
         ]
 
-    def get_user_collaboration(self, month: str) -> List[Dict[str, Any]]:
-        query = """
+    @coalesced
+    def get_user_collaboration(self, month: str, dataset: str = None) -> List[Dict[str, Any]]:
+        query = f"""
         MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
-        WHERE r.month = $month
-        RETURN p1.name as user_a, p1.role as role_a, p2.name as user_b, p2.role as role_b, r.weight as weight
+        WHERE r.month_key = $month_key {dataset_predicate(dataset, "r.dataset")}
+        RETURN p1.name as user_a, p1.role as role_a, p2.name as user_b, p2.role as role_b, sum(r.weight) as weight
         ORDER BY weight DESC
         """
-        result = self.session.run(query, month=month)
+        result = self.db.run("analytics.user_collaboration", query, month_key=month_key(month), dataset=dataset)
         return [
             {
                 "user_a": record["user_a"], 
@@ -126,98 +215,235 @@ class AnalyticsService:
             for record in result
         ]
 
-    def get_bpmn_data(self) -> Dict[str, Any]:
-        query_nodes = "MATCH (r:Role) RETURN r.name as id, 'Role' as type"
-        query_edges = """
+    @coalesced
+    def get_bpmn_data(self, dataset: str = None) -> Dict[str, Any]:
+        if dataset:
+            query_nodes = """
+            MATCH (p:Person)-[w:WORKED_ON]->(:Case)
+            WHERE w.source_file = $dataset
+            RETURN DISTINCT p.role as id, 'Role' as type
+            """
+        else:
+            query_nodes = "MATCH (r:Role) RETURN r.name as id, 'Role' as type"
+        query_edges = f"""
         MATCH (r1:Role)-[i:INTERACTS_WITH]->(r2:Role)
-        RETURN r1.name as source, r2.name as target, i.total_weight as weight
+        WHERE true {dataset_predicate(dataset, "i.dataset")}
+        RETURN r1.name as source, r2.name as target, sum(i.total_weight) as weight
         """
         
-        nodes_result = self.session.run(query_nodes)
-        edges_result = self.session.run(query_edges)
+        nodes_result = self.db.run("analytics.bpmn_nodes", query_nodes, dataset=dataset)
+        edges_result = self.db.run("analytics.bpmn_edges", query_edges, dataset=dataset)
         
         nodes = [{"id": r["id"], "label": r["id"], "type": r["type"]} for r in nodes_result]
         edges = [{"source": r["source"], "target": r["target"], "label": str(r["weight"]), "weight": r["weight"]} for r in edges_result]
         
         return {"nodes": nodes, "edges": edges}
 
-    def get_monthly_interactions(self, year: str = None) -> List[Dict[str, Any]]:
+    @coalesced
+    def get_monthly_interactions(self, year: str = None, dataset: str = None) -> List[Dict[str, Any]]:
         if year:
-            query = """
+            query = f"""
             MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
-            WHERE r.month STARTS WITH $year
+            WHERE r.month_key >= $start_key AND r.month_key <= $end_key {dataset_predicate(dataset, "r.dataset")}
             RETURN r.month as month, sum(r.weight) as total_interactions
             ORDER BY month
             """
-            result = self.session.run(query, year=year)
+            start_key, end_key = year_key_range(year)
+            result = self.db.run(
+                "analytics.monthly_interactions", query, start_key=start_key, end_key=end_key, dataset=dataset
+            )
         else:
-            query = """
+            query = f"""
             MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
+            WHERE true {dataset_predicate(dataset, "r.dataset")}
             RETURN r.month as month, sum(r.weight) as total_interactions
             ORDER BY month
             """
-            result = self.session.run(query)
+            result = self.db.run("analytics.monthly_interactions", query, dataset=dataset)
             
         return [
             {"month": record["month"], "total_interactions": record["total_interactions"]}
             for record in result
         ]
 
-    def get_all_roles(self) -> List[Dict[str, str]]:
-        query = "MATCH (r:Role) RETURN r.name as name ORDER BY name"
-        result = self.session.run(query)
+    @coalesced
+    def get_all_roles(self, dataset: str = None) -> List[Dict[str, str]]:
+        if dataset:
+            query = """
+            MATCH (p:Person)-[w:WORKED_ON]->(:Case)
+            WHERE w.source_file = $dataset
+            RETURN DISTINCT p.role as name ORDER BY name
+            """
+        else:
+            query = "MATCH (r:Role) RETURN r.name as name ORDER BY name"
+        result = self.db.run("analytics.all_roles", query, dataset=dataset)
         return [{"name": record["name"]} for record in result]
 
-    def get_all_users(self) -> List[Dict[str, str]]:
-        query = "MATCH (p:Person) RETURN p.name as name ORDER BY name"
-        result = self.session.run(query)
+    @coalesced
+    def get_all_users(self, dataset: str = None) -> List[Dict[str, str]]:
+        if dataset:
+            query = """
+            MATCH (p:Person)-[w:WORKED_ON]->(:Case)
+            WHERE w.source_file = $dataset
+            RETURN DISTINCT p.name as name ORDER BY name
+            """
+        else:
+            query = "MATCH (p:Person) RETURN p.name as name ORDER BY name"
+        result = self.db.run("analytics.all_users", query, dataset=dataset)
         return [{"name": record["name"]} for record in result]
 
-    def get_overtime_risk(self) -> List[Dict[str, Any]]:
-        query = """
-        MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
-        WHERE w.timestamp.hour < 7 OR w.timestamp.hour > 18
-        RETURN p.name as name, p.role as role, count(w) as overtime_count
-        ORDER BY overtime_count DESC
-        LIMIT 5
-        """
-        result = self.session.run(query)
+    @coalesced
+    def get_overtime_risk(
+        self,
+        limit: int = 5,
+        month: str = None,
+        role: str = None,
+        dataset: str = None
+    ) -> List[Dict[str, Any]]:
+        # Counter overtime ditulis saat import (DataImporter.load_csv);
+        # OvertimeStat dipartisi per (person, month, dataset)
+        if month or dataset:
+            month_match = "{month: $month}" if month else ""
+            query = f"""
+            MATCH (s:OvertimeStat {month_match})
+            WHERE ($role IS NULL OR s.role = $role) {dataset_predicate(dataset, "s.dataset")}
+            WITH s.person as name, s.role as role, sum(s.count) as overtime_count
+            WHERE overtime_count > 0
+            RETURN name, role, overtime_count
+            ORDER BY overtime_count DESC
+            LIMIT $limit
+            """
+        else:
+            query = """
+            MATCH (p:Person)
+            WHERE p.overtime_count > 0 AND ($role IS NULL OR p.role = $role)
+            RETURN p.name as name, p.role as role, p.overtime_count as overtime_count
+            ORDER BY overtime_count DESC
+            LIMIT $limit
+            """
+        result = self.db.run("analytics.overtime_risk", query, limit=limit, month=month, role=role, dataset=dataset)
         return [
             {"name": record["name"], "role": record["role"], "overtime_count": record["overtime_count"]}
             for record in result
         ]
 
-    def get_project_durations(self) -> List[Dict[str, Any]]:
-        query = """
-        MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
-        WITH c, min(w.timestamp) as start_time, max(w.timestamp) as end_time
-        WITH c, duration.between(start_time, end_time).days as duration_days
-        RETURN c.id as case_id, duration_days
-        ORDER BY duration_days DESC
-        LIMIT 10
+    @staticmethod
+    def case_filter(month: str = None) -> str:
+        # Filter case summary (properties ditulis DataImporter.update_case_summaries);
+        # predicate bulan hanya ditulis jika dipakai, seperti dataset_predicate
+        month_filter = "AND c.start_month_key = $month_key" if month else ""
+        return f"WHERE c.duration_hours IS NOT NULL {month_filter}"
+
+    @staticmethod
+    def case_match(dataset: str = None) -> str:
+        # Dengan dataset: ringkasan per (case, dataset) supaya durasi hanya
+        # dihitung dari event file tersebut
+        return "MATCH (c:CaseSummary {dataset: $dataset})" if dataset else "MATCH (c:Case)"
+
+    @coalesced
+    def get_project_durations(self, limit: int = 10, dataset: str = None, month: str = None) -> List[Dict[str, Any]]:
+        query = f"""
+        {self.case_match(dataset)}
+        {self.case_filter(month)}
+        RETURN c.id as case_id, c.duration_days as duration_days, c.duration_hours as duration_hours,
+               c.event_count as event_count, c.people_count as people_count, c.role_count as role_count,
+               c.first_event as first_event, c.last_event as last_event
+        ORDER BY c.duration_hours DESC
+        LIMIT $limit
         """
-        result = self.session.run(query)
+        result = self.db.run(
+            "analytics.project_durations", query, limit=limit, dataset=dataset, month_key=month_key(month)
+        )
         return [
-            {"case_id": record["case_id"], "duration_days": record["duration_days"]}
+            {
+                "case_id": record["case_id"],
+                "duration_days": record["duration_days"],
+                "duration_hours": round(record["duration_hours"], 1),
+                "event_count": record["event_count"],
+                "people_count": record["people_count"],
+                "role_count": record["role_count"],
+                "first_event": record["first_event"].iso_format(),
+                "last_event": record["last_event"].iso_format()
+            }
             for record in result
         ]
 
-    def get_average_project_duration(self) -> float:
-        query = """
-        MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
-        WITH c, min(w.timestamp) as start_time, max(w.timestamp) as end_time
-        WITH duration.between(start_time, end_time).days as duration_days
-        RETURN avg(duration_days) as avg_duration
+    @coalesced
+    def get_average_project_duration(self, dataset: str = None, month: str = None) -> float:
+        query = f"""
+        {self.case_match(dataset)}
+        {self.case_filter(month)}
+        RETURN avg(c.duration_days) as avg_duration
         """
-        result = self.session.run(query)
-        record = result.single()
+        record = self.db.single(
+            "analytics.average_project_duration", query, dataset=dataset, month_key=month_key(month)
+        )
         return round(record["avg_duration"], 1) if record and record["avg_duration"] else 0.0
 
-    def get_handover_flow(self) -> List[Dict[str, Any]]:
+    @coalesced
+    def get_project_duration_distribution(
+        self,
+        bins: int = 20,
+        dataset: str = None,
+        month: str = None
+    ) -> Dict[str, Any]:
+        def load() -> np.ndarray:
+            query = f"""
+            {self.case_match(dataset)}
+            {self.case_filter(month)}
+            RETURN c.duration_hours as duration_hours
+            """
+            result = self.db.run(
+                "analytics.project_duration_values", query, dataset=dataset, month_key=month_key(month)
+            )
+            return np.fromiter((record["duration_hours"] for record in result), dtype=np.float64)
+
+        durations = _case_duration_cache.get_or_compute(("durations", dataset, month), load)
+        if not len(durations):
+            return {"count": 0, "mean_hours": 0.0, "percentiles": {}, "histogram": []}
+
+        quantiles = (50, 75, 90, 95, 99)
+        values = np.percentile(durations, quantiles)
+        counts, edges = np.histogram(durations, bins=bins)
+        return {
+            "count": int(len(durations)),
+            "mean_hours": round(float(durations.mean()), 1),
+            "percentiles": {f"p{q}": round(float(v), 1) for q, v in zip(quantiles, values)},
+            "histogram": [
+                {"lower_hours": round(float(lo), 1), "upper_hours": round(float(hi), 1), "count": int(n)}
+                for lo, hi, n in zip(edges[:-1], edges[1:], counts)
+            ]
+        }
+
+    @coalesced
+    def get_datasets(self) -> List[Dict[str, Any]]:
+        # Satu dataset per source_file; dihitung dari CaseSummary (bukan WORKED_ON)
         query = """
+        MATCH (s:CaseSummary)
+        RETURN s.dataset as name, count(s) as cases, sum(s.event_count) as events,
+               min(s.first_event) as first_event, max(s.last_event) as last_event
+        ORDER BY name
+        """
+        result = self.db.run("analytics.datasets", query)
+        return [
+            {
+                "name": record["name"],
+                "cases": record["cases"],
+                "events": record["events"],
+                "first_event": record["first_event"].iso_format(),
+                "last_event": record["last_event"].iso_format()
+            }
+            for record in result
+        ]
+
+    @coalesced
+    def get_handover_flow(self, dataset: str = None) -> List[Dict[str, Any]]:
+        query = f"""
         MATCH (c:Case)<-[w:WORKED_ON]-(p:Person)
+        WHERE true {dataset_predicate(dataset, "w.source_file")}
         WITH c, p, w ORDER BY w.timestamp
-        WITH c, collect({role: p.role, time: w.timestamp}) as activities
+        // Trace per (case, source file): log lain boleh memakai case id yang sama
+        WITH c, w.source_file as source_file, collect({{role: p.role, time: w.timestamp}}) as activities
         UNWIND range(0, size(activities)-2) as i
         WITH activities[i] as source, activities[i+1] as target
         WHERE source.role <> target.role
@@ -227,19 +453,21 @@ class AnalyticsService:
         ORDER BY avg_duration DESC
         LIMIT 20
         """
-        result = self.session.run(query)
+        result = self.db.run("analytics.handover_flow", query, dataset=dataset)
         return [
             {"source_role": record["source_role"], "target_role": record["target_role"], "avg_duration": round(record["avg_duration"], 1)}
             for record in result
         ]
 
-    def get_resource_utilization(self) -> List[Dict[str, Any]]:
-        query = """
+    @coalesced
+    def get_resource_utilization(self, dataset: str = None) -> List[Dict[str, Any]]:
+        query = f"""
         MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
+        WHERE true {dataset_predicate(dataset, "w.source_file")}
         RETURN w.timestamp.dayOfWeek as day, w.timestamp.hour as hour, count(*) as count
         ORDER BY day, hour
         """
-        result = self.session.run(query)
+        result = self.db.run("analytics.resource_utilization", query, dataset=dataset)
         return [
             {"day": record["day"], "hour": record["hour"], "count": record["count"]}
             for record in result
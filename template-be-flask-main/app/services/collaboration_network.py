@@ -0,0 +1,401 @@
+"""
+Collaboration Network
+=====================
+Graph analytics atas COLLABORATED_IN (Person - Person) tanpa plugin Neo4j GDS
+
+Edges untuk rentang bulan diambil sekali dari Neo4j, lalu dibangun
+adjacency CSR (indptr, indices, weights) dengan NumPy. Semua algoritma
+berjalan in-process di atas CSR tersebut:
+- degree dan weighted degree
+- PageRank (weighted, power iteration)
+- betweenness (Brandes, sampling source node untuk graph besar)
+- connected components (label propagation vectorized)
+- Louvain communities (modularity, weighted)
+
+Graph dan hasil algoritma di-cache per graph version.
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from neo4j import Session
+
+from app.db.query_executor import QueryExecutor
+from app.services.graph_version import VersionedCache
+from app.services.time_keys import MAX_MONTH_KEY, month_key
+
+
+@dataclass
+class CollaborationGraph:
+    """Undirected weighted graph dalam format CSR (setiap edge disimpan dua arah)"""
+
+    names: List[str]
+    roles: List[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_edges(cls, edges: List[Dict[str, Any]]) -> "CollaborationGraph":
+        """
+        Build CSR dari edges {user_a, role_a, user_b, role_b, weight}
+
+        Edge duplikat (pasangan yang sama) dijumlahkan.
+        """
+        node_of: Dict[str, int] = {}
+        roles: List[str] = []
+        sources, targets, weights = [], [], []
+        for edge in edges:
+            for name, role in ((edge["user_a"], edge["role_a"]), (edge["user_b"], edge["role_b"])):
+                if name not in node_of:
+                    node_of[name] = len(node_of)
+                    roles.append(role)
+            sources.append(node_of[edge["user_a"]])
+            targets.append(node_of[edge["user_b"]])
+            weights.append(edge["weight"] or 0)
+
+        n = len(node_of)
+        src = np.asarray(sources, dtype=np.int64)
+        dst = np.asarray(targets, dtype=np.int64)
+        w = np.asarray(weights, dtype=np.float64)
+
+        # Simetris, lalu gabungkan duplikat lewat key row * n + col
+        rows = np.concatenate((src, dst))
+        cols = np.concatenate((dst, src))
+        data = np.concatenate((w, w))
+        keys, inverse = np.unique(rows * n + cols, return_inverse=True)
+        merged = np.bincount(inverse.reshape(-1), weights=data, minlength=len(keys))
+        rows, cols = (keys // n, keys % n) if n else (keys, keys)
+
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        return cls(
+            names=list(node_of),
+            roles=roles,
+            indptr=indptr,
+            indices=cols,
+            weights=merged
+        )
+
+    def rows(self) -> np.ndarray:
+        """Row index untuk setiap entry CSR"""
+        return np.repeat(np.arange(self.node_count), np.diff(self.indptr))
+
+
+def degree_centrality(graph: CollaborationGraph) -> np.ndarray:
+    return np.diff(graph.indptr)
+
+
+def weighted_degree(graph: CollaborationGraph) -> np.ndarray:
+    return np.bincount(graph.rows(), weights=graph.weights, minlength=graph.node_count)
+
+
+def pagerank(graph: CollaborationGraph, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-10) -> np.ndarray:
+    """Weighted PageRank dengan power iteration"""
+    n = graph.node_count
+    if n == 0:
+        return np.empty(0)
+
+    rows = graph.rows()
+    out_weight = weighted_degree(graph)
+    dangling = out_weight == 0
+    transition = graph.weights / np.where(out_weight == 0, 1.0, out_weight)[rows]
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = np.bincount(graph.indices, weights=rank[rows] * transition, minlength=n)
+        new_rank = damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+        converged = np.abs(new_rank - rank).sum() < n * tol
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+
+def betweenness_centrality(graph: CollaborationGraph, samples: Optional[int] = None, seed: int = 42) -> np.ndarray:
+    """
+    Normalized betweenness (unweighted shortest paths, algoritma Brandes)
+
+    Args:
+        graph: CollaborationGraph
+        samples: Jumlah source node yang di-sample (None = semua, exact)
+        seed: Seed untuk sampling
+    """
+    n = graph.node_count
+    betweenness = np.zeros(n)
+    if n <= 2:
+        return betweenness
+
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    sources = range(n)
+    if samples is not None and samples < n:
+        sources = random.Random(seed).sample(range(n), samples)
+
+    for s in sources:
+        stack = []
+        predecessors: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0] * n
+        sigma[s] = 1
+        distance = [-1] * n
+        distance[s] = 0
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if distance[w] < 0:
+                    distance[w] = distance[v] + 1
+                    queue.append(w)
+                if distance[w] == distance[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        delta = [0.0] * n
+        while stack:
+            w = stack.pop()
+            for v in predecessors[w]:
+                delta[v] += sigma[v] / sigma[w] * (1.0 + delta[w])
+            if w != s:
+                betweenness[w] += delta[w]
+
+    scale = 1.0 / ((n - 1) * (n - 2))
+    if samples is not None and samples < n:
+        scale *= n / samples
+    return betweenness * scale
+
+
+def connected_components(graph: CollaborationGraph) -> np.ndarray:
+    """Label component per node (label = node index terkecil di component)"""
+    labels = np.arange(graph.node_count)
+    rows = graph.rows()
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, rows, labels[graph.indices])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+def louvain_communities(graph: CollaborationGraph, resolution: float = 1.0, seed: int = 42):
+    """
+    Louvain community detection (weighted modularity)
+
+    Returns:
+        Tuple (label community per node, modularity)
+    """
+    n = graph.node_count
+    if n == 0 or graph.weights.sum() == 0:
+        return np.arange(n), 0.0
+
+    rng = random.Random(seed)
+    adjacency: List[Dict[int, float]] = [{} for _ in range(n)]
+    for v, w, weight in zip(graph.rows().tolist(), graph.indices.tolist(), graph.weights.tolist()):
+        if v == w:
+            adjacency[v][v] = adjacency[v].get(v, 0.0) + weight / 2
+        else:
+            adjacency[v][w] = weight
+
+    membership = np.arange(n)
+    while True:
+        partition, moved = _louvain_one_level(adjacency, resolution, rng)
+        if not moved:
+            break
+        membership = partition[membership]
+        adjacency = _aggregate(adjacency, partition)
+
+    # Relabel 0..k-1, community terbesar dulu
+    labels, sizes = np.unique(membership, return_counts=True)
+    order = labels[np.argsort(-sizes, kind="stable")]
+    remap = np.empty(membership.max() + 1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    membership = remap[membership]
+    return membership, modularity(graph, membership, resolution)
+
+
+def _node_degree(neighbors: Dict[int, float], node: int) -> float:
+    # Self-loop dihitung dua kali seperti konvensi degree pada graph undirected
+    return sum(neighbors.values()) + neighbors.get(node, 0.0)
+
+
+def _louvain_one_level(adjacency: List[Dict[int, float]], resolution: float, rng: random.Random):
+    n = len(adjacency)
+    degrees = [_node_degree(adjacency[v], v) for v in range(n)]
+    two_m = sum(degrees)
+    community = list(range(n))
+    total = degrees[:]
+
+    moved_any = False
+    improved = True
+    order = list(range(n))
+    while improved:
+        improved = False
+        rng.shuffle(order)
+        for v in order:
+            current = community[v]
+            k_v = degrees[v]
+
+            links: Dict[int, float] = {}
+            for w, weight in adjacency[v].items():
+                if w != v:
+                    links[community[w]] = links.get(community[w], 0.0) + weight
+
+            total[current] -= k_v
+            best = current
+            best_gain = links.get(current, 0.0) - resolution * total[current] * k_v / two_m
+            for candidate, weight in links.items():
+                gain = weight - resolution * total[candidate] * k_v / two_m
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+            total[best] += k_v
+
+            if best != current:
+                community[v] = best
+                improved = moved_any = True
+
+    # Relabel community menjadi 0..k-1
+    labels = {c: i for i, c in enumerate(dict.fromkeys(community))}
+    return np.array([labels[c] for c in community]), moved_any
+
+
+def _aggregate(adjacency: List[Dict[int, float]], partition: np.ndarray) -> List[Dict[int, float]]:
+    size = int(partition.max()) + 1
+    aggregated: List[Dict[int, float]] = [{} for _ in range(size)]
+    for v, neighbors in enumerate(adjacency):
+        cv = int(partition[v])
+        for w, weight in neighbors.items():
+            cw = int(partition[w])
+            if v == w:
+                aggregated[cv][cv] = aggregated[cv].get(cv, 0.0) + weight
+            elif cv == cw:
+                # Edge internal terlihat dua kali (v->w dan w->v)
+                aggregated[cv][cv] = aggregated[cv].get(cv, 0.0) + weight / 2
+            else:
+                aggregated[cv][cw] = aggregated[cv].get(cw, 0.0) + weight
+    return aggregated
+
+
+def modularity(graph: CollaborationGraph, membership: np.ndarray, resolution: float = 1.0) -> float:
+    """Weighted modularity dari partition"""
+    rows = graph.rows()
+    two_m = graph.weights.sum()
+    if two_m == 0:
+        return 0.0
+    internal = np.bincount(
+        membership[rows], weights=graph.weights * (membership[rows] == membership[graph.indices])
+    )
+    totals = np.bincount(membership, weights=weighted_degree(graph))
+    return float((internal / two_m - resolution * (totals / two_m) ** 2).sum())
+
+
+_network_cache = VersionedCache(max_entries=64)
+
+
+class CollaborationNetworkService:
+    # Di atas jumlah node ini betweenness dihitung dengan sampling
+    EXACT_BETWEENNESS_LIMIT = 500
+    BETWEENNESS_SAMPLES = 200
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.db = QueryExecutor(session)
+
+    def get_graph(
+        self,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        dataset: Optional[str] = None
+    ) -> CollaborationGraph:
+        def load() -> CollaborationGraph:
+            dataset_filter = "AND r.dataset = $dataset" if dataset else ""
+            query = f"""
+            MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
+            WHERE p1.name < p2.name
+              AND r.month_key >= $start_key AND r.month_key <= $end_key {dataset_filter}
+            RETURN p1.name as user_a, p1.role as role_a, p2.name as user_b, p2.role as role_b,
+                   sum(r.weight) as weight
+            """
+            # Bound terbuka diganti key ekstrem supaya predicate tetap range index
+            start_key = month_key(start_month) if start_month else 0
+            end_key = month_key(end_month) if end_month else MAX_MONTH_KEY
+            result = self.db.run("collaboration.edges", query, start_key=start_key, end_key=end_key, dataset=dataset)
+            return CollaborationGraph.from_edges([dict(record) for record in result])
+
+        return _network_cache.get_or_compute(("graph", start_month, end_month, dataset), load)
+
+    def get_centrality(
+        self,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        limit: Optional[int] = None,
+        dataset: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        def compute() -> List[Dict[str, Any]]:
+            graph = self.get_graph(start_month, end_month, dataset)
+            samples = None
+            if graph.node_count > self.EXACT_BETWEENNESS_LIMIT:
+                samples = self.BETWEENNESS_SAMPLES
+
+            degree = degree_centrality(graph).tolist()
+            strength = weighted_degree(graph).tolist()
+            betweenness = betweenness_centrality(graph, samples).tolist()
+            ranks = pagerank(graph).tolist()
+            components = connected_components(graph).tolist()
+
+            metrics = [
+                {
+                    "name": graph.names[i],
+                    "role": graph.roles[i],
+                    "degree": degree[i],
+                    "weighted_degree": strength[i],
+                    "betweenness": round(betweenness[i], 6),
+                    "pagerank": round(ranks[i], 6),
+                    "component": components[i]
+                }
+                for i in range(graph.node_count)
+            ]
+            return sorted(metrics, key=lambda m: m["pagerank"], reverse=True)
+
+        metrics = _network_cache.get_or_compute(("centrality", start_month, end_month, dataset), compute)
+        return metrics[:limit] if limit else metrics
+
+    def get_communities(
+        self,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        algorithm: str = "louvain",
+        resolution: float = 1.0,
+        dataset: Optional[str] = None
+    ) -> Dict[str, Any]:
+        def compute() -> Dict[str, Any]:
+            graph = self.get_graph(start_month, end_month, dataset)
+            if algorithm == "components":
+                labels = connected_components(graph)
+                score = modularity(graph, labels) if graph.node_count else 0.0
+            else:
+                labels, score = louvain_communities(graph, resolution)
+
+            groups: Dict[int, List[Dict[str, str]]] = {}
+            for i, label in enumerate(labels.tolist()):
+                groups.setdefault(label, []).append({"name": graph.names[i], "role": graph.roles[i]})
+
+            communities = sorted(groups.values(), key=len, reverse=True)
+            return {
+                "algorithm": algorithm,
+                "modularity": round(score, 6),
+                "communities": [
+                    {"id": idx, "size": len(members), "members": members}
+                    for idx, members in enumerate(communities)
+                ]
+            }
+
+        return _network_cache.get_or_compute(
+            ("communities", start_month, end_month, algorithm, resolution, dataset), compute
+        )
@@ -0,0 +1,105 @@
+"""
+Dashboard
+=========
+Semua panel dashboard dalam satu request
+
+Setiap panel dihitung di thread pool bersama dengan session Neo4j
+sendiri (dari connection pool driver), jadi wall time ~ panel paling
+lambat. Panel yang gagal tidak menggagalkan panel lain: hasilnya
+{"ok": false, "error": ...}. Panel tetap lewat AnalyticsService, jadi
+ikut coalescing dengan request per-panel yang berjalan bersamaan.
+
+Panel yang melewati DASHBOARD_PANEL_TIMEOUT tidak bisa dihentikan dan
+tetap memakai worker _executor; state-nya ("running"/"queued") ikut
+dilaporkan. Dashboard dengan panel gagal tidak boleh di-cache (lihat
+is_degraded).
+
+Filter bersama:
+    start_month, end_month  evolution, evolution_trend
+    role                    overtime
+    dataset                 semua panel
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from neo4j import Session
+
+from app.config import settings
+from app.services.analytics import AnalyticsService
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.DASHBOARD_MAX_WORKERS, thread_name_prefix="dashboard")
+
+Panel = Callable[[AnalyticsService], Any]
+
+
+class DashboardService:
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def panels(
+        self,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        role: Optional[str] = None,
+        dataset: Optional[str] = None
+    ) -> Dict[str, Panel]:
+        panels: Dict[str, Panel] = {}
+        if start_month and end_month:
+            panels["evolution"] = lambda s: s.get_organization_evolution(start_month, end_month, dataset)
+            panels["evolution_trend"] = lambda s: s.get_organization_evolution_trend(start_month, end_month, dataset)
+        panels.update({
+            "top_interactions": lambda s: s.get_top_interactions(10, dataset),
+            "overtime": lambda s: s.get_overtime_risk(5, None, role, dataset),
+            "project_durations": lambda s: s.get_project_durations(10, dataset),
+            "average_duration": lambda s: s.get_average_project_duration(dataset),
+            "handovers": lambda s: s.get_handover_flow(dataset),
+            "utilization": lambda s: s.get_resource_utilization(dataset),
+        })
+        return panels
+
+    def _run_panel(self, name: str, panel: Panel) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            with self.session_factory() as session:
+                data = panel(AnalyticsService(session))
+            return {"ok": True, "data": data, "ms": round((time.perf_counter() - started) * 1000, 2)}
+        except Exception as e:  # noqa: BLE001 - partial failure per panel
+            logger.warning("dashboard panel %s failed: %s", name, e)
+            return {"ok": False, "error": str(e), "ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def get_dashboard(
+        self,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        role: Optional[str] = None,
+        dataset: Optional[str] = None
+    ) -> Dict[str, Any]:
+        panels = self.panels(start_month, end_month, role, dataset)
+        futures = {name: _executor.submit(self._run_panel, name, panel) for name, panel in panels.items()}
+        done, _ = wait(futures.values(), timeout=settings.DASHBOARD_PANEL_TIMEOUT)
+
+        results = {}
+        for name, future in futures.items():
+            if future in done or future.done():
+                results[name] = future.result()
+            else:
+                results[name] = {
+                    "ok": False,
+                    "error": "timeout",
+                    "state": "running" if future.running() else "queued",
+                    "ms": settings.DASHBOARD_PANEL_TIMEOUT * 1000,
+                }
+        return {
+            "filters": {"start_month": start_month, "end_month": end_month, "role": role, "dataset": dataset},
+            "panels": results
+        }
+
+    @staticmethod
+    def is_degraded(dashboard: Dict[str, Any]) -> bool:
+        """True jika ada panel yang gagal atau timeout"""
+        return not all(panel["ok"] for panel in dashboard["panels"].values())
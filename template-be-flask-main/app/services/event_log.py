@@ -0,0 +1,150 @@
+"""
+Event Log
+=========
+Representasi event log ter-encode (dictionary encoding) untuk analytics in-process
+
+Setiap kolom string (case, activity, resource, role) disimpan sebagai
+int32 codes + vocabulary, timestamp sebagai epoch seconds (int64).
+Event diurutkan per case lalu per timestamp, sehingga algoritma process
+mining cukup satu pass berurutan atas arrays.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from neo4j import Session
+
+from app.db.query_executor import QueryExecutor
+from app.services.graph_version import VersionedCache
+
+
+@dataclass
+class EventLog:
+    """Event log dengan kolom ter-encode, terurut (case, timestamp)"""
+
+    case_codes: np.ndarray
+    activity_codes: np.ndarray
+    resource_codes: np.ndarray
+    role_codes: np.ndarray
+    timestamps: np.ndarray
+    # Case id dari CSV, atau (source_file, case id) dari fetch_event_log
+    cases: List[Any]
+    activities: List[str]
+    resources: List[str]
+    roles: List[str]
+    # Posisi asli (urutan row di sumber) setiap event setelah diurutkan
+    positions: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.case_codes)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, int, str, str]]) -> "EventLog":
+        """
+        Build event log dari rows (case_id, activity, epoch_seconds, resource, role)
+
+        Rows tidak harus terurut; hasil diurutkan dengan lexsort.
+        """
+        vocabularies: List[Dict[str, int]] = [{}, {}, {}, {}]
+        columns: List[List[int]] = [[], [], [], []]
+        timestamps: List[int] = []
+
+        for case_id, activity, ts, resource, role in rows:
+            for vocab, column, value in zip(vocabularies, columns, (case_id, activity, resource, role)):
+                code = vocab.get(value)
+                if code is None:
+                    code = vocab[value] = len(vocab)
+                column.append(code)
+            timestamps.append(ts)
+
+        case_codes, activity_codes, resource_codes, role_codes = (
+            np.asarray(column, dtype=np.int32) for column in columns
+        )
+        return cls.from_codes(
+            case_codes, activity_codes, resource_codes, role_codes,
+            np.asarray(timestamps, dtype=np.int64),
+            *(list(vocab) for vocab in vocabularies)
+        )
+
+    @classmethod
+    def from_codes(
+        cls,
+        case_codes: np.ndarray,
+        activity_codes: np.ndarray,
+        resource_codes: np.ndarray,
+        role_codes: np.ndarray,
+        timestamps: np.ndarray,
+        cases: List[Any],
+        activities: List[str],
+        resources: List[str],
+        roles: List[str]
+    ) -> "EventLog":
+        """Build event log dari kolom yang sudah ter-encode; diurutkan (case, timestamp)"""
+        order = np.lexsort((timestamps, case_codes))
+        return cls(
+            case_codes=case_codes[order],
+            activity_codes=activity_codes[order],
+            resource_codes=resource_codes[order],
+            role_codes=role_codes[order],
+            timestamps=timestamps[order],
+            cases=cases,
+            activities=activities,
+            resources=resources,
+            roles=roles,
+            positions=order
+        )
+
+    def source_order(self) -> np.ndarray:
+        """Index event dalam urutan row sumber (urutan terurut jika positions tidak ada)"""
+        if self.positions is None:
+            return np.arange(len(self))
+        return np.argsort(self.positions, kind="stable")
+
+    def case_boundaries(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Posisi event pertama dan terakhir setiap case
+
+        Returns:
+            Tuple (starts, ends) berisi index ke arrays event (ends inklusif)
+        """
+        if not len(self):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        change = np.flatnonzero(self.case_codes[1:] != self.case_codes[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        ends = np.concatenate((change - 1, [len(self) - 1]))
+        return starts, ends
+
+
+# Satu entry per dataset (None = semua dataset)
+_event_log_cache = VersionedCache(max_entries=4)
+
+
+def fetch_event_log(session: Session, dataset: Optional[str] = None) -> EventLog:
+    """
+    Ambil event WORKED_ON dari Neo4j sebagai EventLog, opsional hanya dari
+    satu dataset (source_file)
+
+    Case di-key dengan (source_file, case id): log berbeda boleh memakai
+    case id yang sama, dan event-nya tidak boleh digabung jadi satu trace.
+    Hasil di-cache per graph version dan dataset.
+    """
+    def load() -> EventLog:
+        dataset_filter = "WHERE w.source_file = $dataset" if dataset else ""
+        query = f"""
+        MATCH (p:Person)-[w:WORKED_ON]->(c:Case)
+        {dataset_filter}
+        RETURN w.source_file as source_file, c.id as case_id, w.activity as activity,
+               coalesce(w.ts_epoch, w.timestamp.epochSeconds) as ts, p.name as resource, p.role as role
+        """
+        result = QueryExecutor(session).run("event_log.worked_on", query, dataset=dataset)
+        return EventLog.from_rows(
+            (
+                (record["source_file"], record["case_id"]), record["activity"], record["ts"],
+                record["resource"], record["role"]
+            )
+            for record in result
+        )
+
+    return _event_log_cache.get_or_compute(('event_log', dataset), load)
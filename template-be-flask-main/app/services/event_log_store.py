@@ -0,0 +1,201 @@
+"""
+Event Log Store
+===============
+Cache columnar on-disk untuk event log CSV yang sudah di-parse
+
+CSV di-parse sekali (csv + strptime + dictionary encoding) menjadi
+EventLog, lalu disimpan di direktori `.<nama file>.columns/` di samping
+file sumber (atau di EVENT_LOG_CACHE_DIR):
+
+    case.npy, activity.npy, resource.npy, role.npy   int32 codes
+    ts.npy                                           int64 epoch seconds
+    position.npy                                     int64 posisi row di CSV
+    meta.json                                        vocabulary, jumlah row,
+                                                     row yang di-skip, dan
+                                                     key sumber (size, mtime, hash)
+
+Load berikutnya memory-map arrays (np.load mmap_mode='r'). Cache valid
+jika size dan mtime sama; jika mtime berubah tapi blake2b isi file sama,
+cache tetap dipakai dan mtime di meta diperbarui. meta.json ditulis
+terakhir, jadi cache yang setengah tertulis tidak pernah dianggap valid.
+
+Dengan EVENT_LOG_CACHE_DIR, nama direktori cache memuat hash path absolut
+CSV supaya file dengan nama sama dari folder berbeda tidak berbagi cache.
+"""
+
+import calendar
+import csv
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.event_log import EventLog
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+TIMESTAMP_FORMAT = "%m-%d-%y %H:%M"  # 4-24-19 15:00 (MM-DD-YY HH:MM)
+CODE_COLUMNS = ("case", "activity", "resource", "role")
+VOCABULARIES = ("cases", "activities", "resources", "roles")
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_csv(path: str) -> Tuple[EventLog, int]:
+    """
+    Parse event log CSV (delimiter ';') menjadi EventLog
+
+    Row tanpa CaseID/timestamp/Resource atau dengan timestamp tidak valid
+    di-skip, sama seperti DataImporter.
+
+    Returns:
+        Tuple (EventLog, jumlah row yang di-skip)
+    """
+    epochs: Dict[str, Optional[int]] = {}
+    rows = []
+    skipped = 0
+    with open(path, "r") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            if not row["CaseID"] or not row["timestamp"] or not row["Resource"]:
+                skipped += 1
+                continue
+            raw = row["timestamp"]
+            epoch = epochs.get(raw, -1)
+            if epoch == -1:
+                try:
+                    epoch = calendar.timegm(datetime.strptime(raw, TIMESTAMP_FORMAT).timetuple())
+                except ValueError:
+                    epoch = None
+                epochs[raw] = epoch
+            if epoch is None:
+                skipped += 1
+                continue
+            rows.append((row["CaseID"], row["NameActivity"], epoch, row["Resource"], row["Role"]))
+    return EventLog.from_rows(rows), skipped
+
+
+def cache_dir_for(path: str) -> str:
+    absolute = os.path.abspath(path)
+    name = os.path.basename(path)
+    if not settings.EVENT_LOG_CACHE_DIR:
+        return os.path.join(os.path.dirname(absolute), f".{name}.columns")
+    path_hash = hashlib.blake2b(absolute.encode(), digest_size=6).hexdigest()
+    return os.path.join(settings.EVENT_LOG_CACHE_DIR, f".{name}.{path_hash}.columns")
+
+
+def _source_key(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_meta(cache_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(cache_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_FORMAT_VERSION else None
+
+
+def _write_meta(cache_dir: str, meta: Dict[str, Any]) -> None:
+    tmp = os.path.join(cache_dir, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(cache_dir, "meta.json"))
+
+
+def _is_fresh(path: str, cache_dir: str, meta: Dict[str, Any]) -> bool:
+    source = meta["source"]
+    key = _source_key(path)
+    if key == {"size": source["size"], "mtime_ns": source["mtime_ns"]}:
+        return True
+    if key["size"] != source["size"] or file_digest(path) != source["blake2b"]:
+        return False
+    # File di-touch/copy tanpa perubahan isi: simpan mtime baru
+    meta["source"].update(key)
+    try:
+        _write_meta(cache_dir, meta)
+    except OSError:
+        pass
+    return True
+
+
+def _load_columns(cache_dir: str, meta: Dict[str, Any]) -> EventLog:
+    columns = [np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in CODE_COLUMNS]
+    timestamps = np.load(os.path.join(cache_dir, "ts.npy"), mmap_mode="r")
+    positions = np.load(os.path.join(cache_dir, "position.npy"), mmap_mode="r")
+    if any(len(column) != meta["rows"] for column in (*columns, timestamps, positions)):
+        raise ValueError(f"Corrupt event log cache: {cache_dir}")
+    # Disimpan sudah terurut (case, timestamp), tidak perlu from_codes
+    return EventLog(*columns, timestamps, *(meta[vocab] for vocab in VOCABULARIES), positions=positions)
+
+
+def save(path: str, log: EventLog, skipped: int) -> str:
+    """Tulis EventLog hasil parse `path` ke cache dir-nya, return direktori cache"""
+    cache_dir = cache_dir_for(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Invalidate dulu: meta.json hanya ada jika semua kolom lengkap
+    try:
+        os.remove(os.path.join(cache_dir, "meta.json"))
+    except FileNotFoundError:
+        pass
+
+    codes = (log.case_codes, log.activity_codes, log.resource_codes, log.role_codes)
+    for name, column in zip(CODE_COLUMNS, codes):
+        np.save(os.path.join(cache_dir, f"{name}.npy"), np.ascontiguousarray(column, dtype=np.int32))
+    np.save(os.path.join(cache_dir, "ts.npy"), np.ascontiguousarray(log.timestamps, dtype=np.int64))
+    positions = log.positions if log.positions is not None else np.arange(len(log))
+    np.save(os.path.join(cache_dir, "position.npy"), np.ascontiguousarray(positions, dtype=np.int64))
+
+    meta = {
+        "version": CACHE_FORMAT_VERSION,
+        "source": {**_source_key(path), "blake2b": file_digest(path)},
+        "rows": len(log),
+        "skipped": skipped,
+        **{vocab: getattr(log, vocab) for vocab in VOCABULARIES},
+    }
+    _write_meta(cache_dir, meta)
+    return cache_dir
+
+
+def load(path: str) -> Tuple[EventLog, int]:
+    """
+    EventLog untuk CSV `path`: dari cache jika masih valid, selain itu
+    parse ulang lalu tulis cache (gagal tulis hanya di-log)
+
+    Returns:
+        Tuple (EventLog, jumlah row yang di-skip saat parse)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    if not settings.EVENT_LOG_CACHE_ENABLED:
+        return parse_csv(path)
+
+    cache_dir = cache_dir_for(path)
+    meta = _read_meta(cache_dir)
+    if meta is not None and _is_fresh(path, cache_dir, meta):
+        try:
+            log = _load_columns(cache_dir, meta)
+            logger.debug("event log cache hit: %s (%d rows)", path, len(log))
+            return log, meta["skipped"]
+        except (OSError, ValueError) as e:
+            logger.warning("event log cache unreadable, reparsing %s: %s", path, e)
+
+    log, skipped = parse_csv(path)
+    try:
+        save(path, log, skipped)
+    except OSError as e:
+        logger.warning("could not write event log cache for %s: %s", path, e)
+    return log, skipped
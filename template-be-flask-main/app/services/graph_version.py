@@ -0,0 +1,150 @@
+"""
+Graph Version
+=============
+Counter versi data graph di Neo4j
+
+Versi naik setiap kali DataImporter mengubah data (clear, load, project).
+Hasil analytics yang mahal di-cache per versi lewat VersionedCache, jadi
+otomatis invalid setelah /organization/load-data.
+
+Versi disimpan di node (:GraphMeta {name: "graph"}) dan dinaikkan oleh
+importer lewat session-nya, jadi import dari worker lain atau dari
+run_analysis.py ikut terlihat: setiap worker mem-poll node tersebut
+(GRAPH_VERSION_POLL_SECONDS) dan memanggil listener saat versinya berubah.
+Epoch (randomUUID saat node dibuat) membedakan versi setelah database
+dikosongkan di luar importer.
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUMP_QUERY = """
+MERGE (m:GraphMeta {name: 'graph'})
+ON CREATE SET m.version = 0, m.epoch = randomUUID()
+SET m.version = m.version + 1
+RETURN m.version as version, m.epoch as epoch
+"""
+READ_QUERY = "MATCH (m:GraphMeta {name: 'graph'}) RETURN m.version as version, m.epoch as epoch"
+
+
+class GraphVersion:
+    """Counter versi (shared lewat Neo4j) + listeners yang dipanggil saat versi berubah"""
+
+    def __init__(self):
+        # (epoch, version) diganti sekaligus supaya pembaca tidak melihat campuran
+        self._state: Tuple[str, int] = (uuid.uuid4().hex, 0)
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int], None]] = []
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def value(self) -> int:
+        return self._state[1]
+
+    @property
+    def epoch(self) -> str:
+        return self._state[0]
+
+    def snapshot(self) -> Tuple[str, int]:
+        """(epoch, version) yang konsisten satu sama lain"""
+        return self._state
+
+    def _set(self, epoch: str, value: int) -> bool:
+        with self._lock:
+            if (epoch, value) == self._state:
+                return False
+            self._state = (epoch, value)
+        for listener in self._listeners:
+            listener(value)
+        return True
+
+    def bump(self, session=None) -> int:
+        """
+        Naikkan versi. Dengan session, versi dinaikkan di GraphMeta (dipakai
+        DataImporter); tanpa session hanya counter proses ini.
+        """
+        if session is not None:
+            record = session.run(BUMP_QUERY).single()
+            self._set(record["epoch"], record["version"])
+        else:
+            with self._lock:
+                epoch, value = self._state
+            self._set(epoch, value + 1)
+        return self.value
+
+    def refresh(self, session) -> bool:
+        """Baca versi dari GraphMeta; True jika berubah (listeners dipanggil)"""
+        record = session.run(READ_QUERY).single()
+        if record is None:
+            return False
+        return self._set(record["epoch"], record["version"])
+
+    def start_polling(self, session_factory: Callable[[], Any], interval: float) -> None:
+        """Thread daemon yang me-refresh versi setiap interval detik"""
+        if self._stop is not None or interval <= 0:
+            return
+        stop = self._stop = threading.Event()
+
+        def poll() -> None:
+            while True:
+                try:
+                    with session_factory() as session:
+                        self.refresh(session)
+                except Exception as e:  # noqa: BLE001 - coba lagi di interval berikutnya
+                    logger.debug("graph version poll failed: %s", e)
+                if stop.wait(interval):
+                    return
+
+        threading.Thread(target=poll, name="graph-version-poll", daemon=True).start()
+
+    def stop_polling(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def on_change(self, listener: Callable[[int], None]) -> None:
+        self._listeners.append(listener)
+
+
+graph_version = GraphVersion()
+
+
+class VersionedCache:
+    """
+    LRU cache yang di-clear saat graph version berubah
+
+    Dipakai untuk hasil komputasi in-process (event log, DFG, dll). Key
+    versi adalah (epoch, version): setelah GraphMeta dibuat ulang versi
+    mulai lagi dari 1, jadi angka versi saja bisa sama dengan yang lama.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version = graph_version.snapshot()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        version = graph_version.snapshot()
+        with self._lock:
+            if self._version != version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = compute()
+
+        with self._lock:
+            # Jangan simpan hasil jika versi sudah berubah selama compute
+            if self._version == version == graph_version.snapshot():
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
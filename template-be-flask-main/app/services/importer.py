@@ -1,68 +1,403 @@
-import csv
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from neo4j import Session
+from app.services import event_log_store
+from app.services.activity_sketch import bitset_from_ids, hll_from_ids
+from app.services.event_log import EventLog
+from app.services.graph_version import graph_version
+from app.services.time_keys import datetime_keys
+from app.services.work_calendar import WorkCalendar
+
+# Constraint/index yang dibutuhkan import (MERGE by key) dan query case summary
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.name IS UNIQUE",
+    "CREATE CONSTRAINT role_name IF NOT EXISTS FOR (r:Role) REQUIRE r.name IS UNIQUE",
+    "CREATE CONSTRAINT graph_meta_name IF NOT EXISTS FOR (m:GraphMeta) REQUIRE m.name IS UNIQUE",
+    "CREATE CONSTRAINT case_id IF NOT EXISTS FOR (c:Case) REQUIRE c.id IS UNIQUE",
+    "CREATE INDEX case_duration_hours IF NOT EXISTS FOR (c:Case) ON (c.duration_hours)",
+    "CREATE INDEX case_start_month_key IF NOT EXISTS FOR (c:Case) ON (c.start_month_key)",
+    "CREATE INDEX person_overtime_count IF NOT EXISTS FOR (p:Person) ON (p.overtime_count)",
+    "CREATE INDEX overtime_stat_month IF NOT EXISTS FOR (s:OvertimeStat) ON (s.month, s.person)",
+    # Range filter bulan/waktu (app/services/time_keys.py)
+    "CREATE INDEX worked_on_month_key IF NOT EXISTS FOR ()-[w:WORKED_ON]-() ON (w.month_key)",
+    "CREATE INDEX worked_on_ts_epoch IF NOT EXISTS FOR ()-[w:WORKED_ON]-() ON (w.ts_epoch)",
+    "CREATE INDEX collaborated_in_month_key IF NOT EXISTS FOR ()-[r:COLLABORATED_IN]-() ON (r.month_key)",
+    # Partisi per dataset (= source file): filter dataset + range bulan
+    "CREATE INDEX worked_on_dataset_month_key IF NOT EXISTS FOR ()-[w:WORKED_ON]-() ON (w.source_file, w.month_key)",
+    "CREATE INDEX collaborated_in_dataset_month_key IF NOT EXISTS FOR ()-[r:COLLABORATED_IN]-() ON (r.dataset, r.month_key)",
+    "CREATE INDEX interacts_with_dataset IF NOT EXISTS FOR ()-[i:INTERACTS_WITH]-() ON (i.dataset)",
+    "CREATE INDEX overtime_stat_dataset_month IF NOT EXISTS FOR (s:OvertimeStat) ON (s.dataset, s.month)",
+    "CREATE INDEX case_summary_dataset IF NOT EXISTS FOR (s:CaseSummary) ON (s.dataset, s.id)",
+    "CREATE INDEX case_summary_dataset_month_key IF NOT EXISTS FOR (s:CaseSummary) ON (s.dataset, s.start_month_key)",
+    # Sketch distinct person/role per (dataset, bulan)
+    "CREATE INDEX month_activity_month_key IF NOT EXISTS FOR (a:MonthActivity) ON (a.month_key)",
+    "CREATE INDEX month_activity_dataset_month_key IF NOT EXISTS FOR (a:MonthActivity) ON (a.dataset, a.month_key)",
+]
+
+# Aggregates per case (WORKED_ON w, Person p) dan property yang ditulis
+# ke Case / CaseSummary oleh update_case_summaries
+CASE_SUMMARY_AGGREGATES = """min(w.timestamp) as first_event, max(w.timestamp) as last_event, count(w) as event_count,
+             count(DISTINCT p) as people_count, count(DISTINCT p.role) as role_count,
+             min(w.month) as start_month, min(w.month_key) as start_month_key"""
+CASE_SUMMARY_FIELDS = """{node}.first_event = first_event,
+            {node}.last_event = last_event,
+            {node}.event_count = event_count,
+            {node}.people_count = people_count,
+            {node}.role_count = role_count,
+            {node}.start_month = start_month,
+            {node}.start_month_key = start_month_key,
+            {node}.duration_hours = duration.inSeconds(first_event, last_event).seconds / 3600.0,
+            {node}.duration_days = duration.inDays(first_event, last_event).days"""
+
+IMPORT_BATCH_SIZE = 5000
+RECLASSIFY_BATCH_SIZE = 10000
+MIGRATION_BATCH_SIZE = 10000
+# Satu row MonthActivity ~8 KB (dua HyperLogLog)
+SKETCH_BATCH_SIZE = 200
+
+EPOCH = datetime(1970, 1, 1)
+
+# Satu event per row; dijalankan per batch oleh DataImporter.import_rows
+IMPORT_QUERY = """
+UNWIND $rows as row
+MERGE (p:Person {name: row.resource})
+SET p.role = row.role
+MERGE (r:Role {name: row.role})
+MERGE (c:Case {id: row.case_id})
+CREATE (p)-[:WORKED_ON {
+    activity: row.activity,
+    timestamp: datetime(row.timestamp),
+    month: row.month,
+    month_key: row.month_key,
+    ts_epoch: row.ts_epoch,
+    source_file: $source_file,
+    overtime: row.overtime_bucket IS NOT NULL,
+    overtime_bucket: row.overtime_bucket
+}]->(c)
+FOREACH (_ IN CASE WHEN row.overtime_bucket IS NULL THEN [] ELSE [1] END |
+    SET p.overtime_count = coalesce(p.overtime_count, 0) + 1
+    MERGE (s:OvertimeStat {person: row.resource, month: row.month, dataset: $source_file})
+    ON CREATE SET s.role = row.role, s.count = 0
+    SET s.count = s.count + 1
+)
+"""
 
 class DataImporter:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, calendar: WorkCalendar = None):
         self.session = session
+        self.calendar = calendar or WorkCalendar.from_settings()
 
     def parse_timestamp(self, ts_str):
         # Format: 4-24-19 15:00 (MM-DD-YY HH:MM)
         try:
-            dt = datetime.strptime(ts_str, "%m-%d-%y %H:%M")
+            dt = datetime.strptime(ts_str, event_log_store.TIMESTAMP_FORMAT)
             return dt.isoformat(), dt.strftime("%Y-%m")
         except ValueError:
             return None, None
 
     def clear_database(self):
-        self.session.run("MATCH (n) DETACH DELETE n")
+        # GraphMeta tetap ada supaya versi terus naik (ETag/cache lama invalid)
+        self.session.run("MATCH (n) WHERE NOT n:GraphMeta DETACH DELETE n")
+        graph_version.bump(self.session)
+
+    def ensure_schema(self):
+        for statement in SCHEMA_STATEMENTS:
+            self.session.run(statement)
+
+    def update_case_summaries(self, source_file: str = None):
+        """
+        Tulis ringkasan lifecycle ke setiap Case: first/last event, jumlah
+        event, people dan roles, durasi, source files dan bulan mulai.
+        Ringkasan yang sama per dataset ditulis ke (:CaseSummary {id, dataset})
+        dari event file itu saja, untuk filter dataset di project-durations.
+
+        Jika source_file diberikan, hanya case yang punya event dari file
+        tersebut yang dihitung ulang (dari semua event-nya), jadi summary
+        tetap benar saat file baru di-append ke case yang sudah ada.
+        """
+        query = f"""
+        MATCH (c:Case)
+        WHERE $source_file IS NULL OR EXISTS {{ (c)<-[:WORKED_ON {{source_file: $source_file}}]-() }}
+        MATCH (c)<-[w:WORKED_ON]-(p:Person)
+        WITH c, {CASE_SUMMARY_AGGREGATES},
+             collect(DISTINCT w.source_file) as source_files
+        SET c.source_files = source_files,
+            {CASE_SUMMARY_FIELDS.format(node="c")}
+        """
+        self.session.run(query, source_file=source_file)
+
+        query_partitions = f"""
+        MATCH (c:Case)<-[w:WORKED_ON]-(p:Person)
+        WHERE $source_file IS NULL OR w.source_file = $source_file
+        WITH c, w.source_file as dataset, {CASE_SUMMARY_AGGREGATES}
+        MERGE (s:CaseSummary {{id: c.id, dataset: dataset}})
+        SET {CASE_SUMMARY_FIELDS.format(node="s")}
+        """
+        self.session.run(query_partitions, source_file=source_file)
+
+    def assign_dense_ids(self):
+        """Beri uid padat (lanjutan dari uid terbesar) ke Person/Role yang belum punya"""
+        for label in ("Person", "Role"):
+            self.session.run(f"""
+            MATCH (n:{label}) WITH coalesce(max(n.uid), -1) as last
+            MATCH (n:{label}) WHERE n.uid IS NULL
+            WITH last, n ORDER BY n.name
+            WITH last, collect(n) as nodes
+            UNWIND range(0, size(nodes) - 1) as i
+            WITH nodes[i] as n, last + 1 + i as uid
+            SET n.uid = uid
+            """)
+
+    def update_activity_sketches(self, source_file: str = None):
+        """
+        Tulis (:MonthActivity {dataset, month_key}) berisi bitset dan
+        HyperLogLog uid person/role yang aktif di bulan tersebut
+        (lihat activity_sketch). Jika source_file diberikan hanya bulan
+        dataset tersebut yang dihitung ulang, ditambah dataset lain milik
+        person yang role-nya berubah sejak sketch terakhir: sketch role
+        memakai p.role saat ini, sama seperti count(DISTINCT p.role).
+        """
+        self.assign_dense_ids()
+        role_ids = {
+            record["name"]: record["uid"]
+            for record in self.session.run("MATCH (r:Role) RETURN r.name as name, r.uid as uid")
+        }
+        datasets = None
+        if source_file is not None:
+            # p.sketch_role = role yang dipakai saat sketch person ini terakhir ditulis
+            changed = self.session.run("""
+            MATCH (p:Person) WHERE p.sketch_role IS NULL OR p.sketch_role <> p.role
+            MATCH (p)-[w:WORKED_ON]->()
+            RETURN DISTINCT w.source_file as dataset
+            """)
+            datasets = sorted({source_file, *(record["dataset"] for record in changed)})
+        result = self.session.run("""
+        MATCH (p:Person)-[w:WORKED_ON]->()
+        WHERE $datasets IS NULL OR w.source_file IN $datasets
+        RETURN w.source_file as dataset, w.month_key as month_key, w.month as month,
+               collect(DISTINCT p.uid) as people, collect(DISTINCT p.role) as roles
+        """, datasets=datasets)
+        rows = []
+        for record in result:
+            roles = [role_ids[name] for name in record["roles"]]
+            rows.append({
+                "dataset": record["dataset"],
+                "month_key": record["month_key"],
+                "month": record["month"],
+                "people_bits": bitset_from_ids(record["people"]),
+                "roles_bits": bitset_from_ids(roles),
+                "people_hll": hll_from_ids(record["people"]),
+                "roles_hll": hll_from_ids(roles),
+            })
+        query = """
+        UNWIND $rows as row
+        MERGE (a:MonthActivity {dataset: row.dataset, month_key: row.month_key})
+        SET a.month = row.month,
+            a.people_bits = row.people_bits,
+            a.roles_bits = row.roles_bits,
+            a.people_hll = row.people_hll,
+            a.roles_hll = row.roles_hll
+        """
+        for start in range(0, len(rows), SKETCH_BATCH_SIZE):
+            self.session.run(query, rows=rows[start:start + SKETCH_BATCH_SIZE])
+        self.session.run("""
+        MATCH (p:Person)-[w:WORKED_ON]->()
+        WHERE $datasets IS NULL OR w.source_file IN $datasets
+        WITH DISTINCT p
+        SET p.sketch_role = p.role
+        """, datasets=datasets)
+
+    def reclassify_overtime(self):
+        """
+        Klasifikasi ulang semua WORKED_ON dengan kalender aktif lalu bangun
+        ulang counter overtime. Dipakai setelah kalender diubah atau untuk
+        data yang di-load sebelum klasifikasi overtime ada.
+        """
+        result = self.session.run(
+            "MATCH ()-[w:WORKED_ON]->() RETURN elementId(w) as id, w.timestamp as ts"
+        )
+        rows = [
+            {"id": record["id"], "bucket": self.calendar.classify(record["ts"].to_native())}
+            for record in result
+        ]
+        update_query = """
+        UNWIND $rows as row
+        MATCH ()-[w:WORKED_ON]->() WHERE elementId(w) = row.id
+        SET w.overtime_bucket = row.bucket, w.overtime = row.bucket IS NOT NULL
+        """
+        for start in range(0, len(rows), RECLASSIFY_BATCH_SIZE):
+            self.session.run(update_query, rows=rows[start:start + RECLASSIFY_BATCH_SIZE])
+
+        self.session.run("MATCH (s:OvertimeStat) DETACH DELETE s")
+        self.session.run("MATCH (p:Person) SET p.overtime_count = 0")
+        self.session.run("""
+        MATCH (p:Person)-[w:WORKED_ON {overtime: true}]->()
+        WITH p, w.month as month, w.source_file as dataset, count(*) as n
+        MERGE (s:OvertimeStat {person: p.name, month: month, dataset: dataset})
+        SET s.role = p.role, s.count = n
+        WITH p, sum(n) as total
+        SET p.overtime_count = total
+        """)
+        graph_version.bump(self.session)
+
+    def migrate_time_keys(self):
+        """
+        Isi month_key/ts_epoch untuk data yang di-load sebelum time key ada.
+        Hanya relationship/case yang belum punya key yang diupdate, per
+        batch MIGRATION_BATCH_SIZE, jadi aman dijalankan berulang. Dataset
+        yang punya bulan tanpa MonthActivity ikut dibangun sketch-nya.
+
+        Returns:
+            Dict jumlah WORKED_ON, COLLABORATED_IN dan Case yang diupdate,
+            dan jumlah dataset yang sketch-nya dibangun ulang
+        """
+        self.ensure_schema()
+        statements = {
+            "worked_on": """
+            MATCH ()-[w:WORKED_ON]->() WHERE w.month_key IS NULL
+            WITH w LIMIT $batch
+            SET w.month_key = w.timestamp.year * 12 + w.timestamp.month,
+                w.ts_epoch = w.timestamp.epochSeconds
+            RETURN count(w) as updated
+            """,
+            "collaborated_in": """
+            MATCH ()-[r:COLLABORATED_IN]->() WHERE r.month_key IS NULL
+            WITH r LIMIT $batch
+            SET r.month_key = toInteger(substring(r.month, 0, 4)) * 12 + toInteger(substring(r.month, 5, 2))
+            RETURN count(r) as updated
+            """,
+            "cases": """
+            MATCH (c:Case) WHERE c.start_month IS NOT NULL AND c.start_month_key IS NULL
+            WITH c LIMIT $batch
+            SET c.start_month_key = toInteger(substring(c.start_month, 0, 4)) * 12 + toInteger(substring(c.start_month, 5, 2))
+            RETURN count(c) as updated
+            """,
+        }
+        totals = {}
+        for name, statement in statements.items():
+            totals[name] = 0
+            while True:
+                updated = self.session.run(statement, batch=MIGRATION_BATCH_SIZE).single()["updated"]
+                totals[name] += updated
+                if updated < MIGRATION_BATCH_SIZE:
+                    break
+
+        result = self.session.run("""
+        MATCH ()-[w:WORKED_ON]->()
+        WITH DISTINCT w.source_file as dataset, w.month_key as month_key
+        WHERE dataset IS NOT NULL
+          AND NOT EXISTS { MATCH (a:MonthActivity {dataset: dataset, month_key: month_key}) }
+        RETURN DISTINCT dataset
+        """)
+        missing = [record["dataset"] for record in result]
+        for dataset in missing:
+            self.update_activity_sketches(dataset)
+        totals["activity_sketches"] = len(missing)
+
+        if any(totals.values()):
+            graph_version.bump(self.session)
+        return totals
 
     def load_csv(self, file_path: str):
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        """
+        Import satu event log CSV. Hasil parse diambil dari cache columnar
+        (event_log_store), jadi CSV yang tidak berubah tidak di-parse ulang.
+        """
+        log, _ = event_log_store.load(file_path)
+        self.ensure_schema()
+
+        source_file = os.path.basename(file_path)
+        count = self.load_event_log(log, source_file)
+        self.update_case_summaries(source_file)
+        self.update_activity_sketches(source_file)
+        graph_version.bump(self.session)
+        return count
+
+    def load_event_log(self, log: EventLog, source_file: str) -> int:
+        """
+        Import EventLog (hasil parse/cache) sebagai WORKED_ON, return jumlah event
 
+        Event ditulis dalam urutan row CSV (bukan urutan case/timestamp
+        EventLog), jadi `SET p.role` tetap memakai role dari row terakhir
+        person tersebut di file, sama seperti loader per row.
+        """
+        order = log.source_order()
+
+        def rows() -> Iterator[Tuple[str, str, datetime, str, str]]:
+            for start in range(0, len(log), IMPORT_BATCH_SIZE):
+                index = order[start:start + IMPORT_BATCH_SIZE]
+                for case, activity, ts, resource, role in zip(
+                    log.case_codes[index].tolist(),
+                    log.activity_codes[index].tolist(),
+                    log.timestamps[index].tolist(),
+                    log.resource_codes[index].tolist(),
+                    log.role_codes[index].tolist()
+                ):
+                    yield (log.cases[case], log.activities[activity], EPOCH + timedelta(seconds=ts),
+                           log.resources[resource], log.roles[role])
+
+        return self.import_rows(rows(), source_file)
+
+    def import_rows(self, rows: Iterable[Tuple[str, str, datetime, str, str]], source_file: str) -> int:
+        """
+        Tulis event (case_id, activity, timestamp, resource, role) ke graph
+        per batch IMPORT_BATCH_SIZE dengan satu query UNWIND per batch.
+
+        Overtime diklasifikasi di sini; counter per person dan per
+        (person, month) dinaikkan incremental oleh IMPORT_QUERY.
+        """
+        # Derivasi per timestamp (iso, month, keys, overtime) di-memo:
+        # banyak event berbagi timestamp yang sama
+        derived: Dict[datetime, Dict[str, Any]] = {}
+        batch: List[Dict[str, Any]] = []
         count = 0
-        with open(file_path, 'r') as f:
-            reader = csv.DictReader(f, delimiter=';')
-            for row in reader:
-                if not row['CaseID'] or not row['timestamp'] or not row['Resource']:
-                    continue
-
-                iso_time, month = self.parse_timestamp(row['timestamp'])
-                if not iso_time:
-                    continue
-
-                query = """
-                MERGE (p:Person {name: $resource})
-                SET p.role = $role
-                MERGE (r:Role {name: $role})
-                MERGE (c:Case {id: $case_id})
-                CREATE (p)-[:WORKED_ON {
-                    activity: $activity,
-                    timestamp: datetime($timestamp),
-                    month: $month,
-                    source_file: $source_file
-                }]->(c)
-                """
-                self.session.run(query, 
-                            resource=row['Resource'],
-                            role=row['Role'],
-                            case_id=row['CaseID'],
-                            activity=row['NameActivity'],
-                            timestamp=iso_time,
-                            month=month,
-                            source_file=os.path.basename(file_path))
-                count += 1
+        for case_id, activity, dt, resource, role in rows:
+            fields = derived.get(dt)
+            if fields is None:
+                month_key, ts_epoch = datetime_keys(dt)
+                fields = derived[dt] = {
+                    "timestamp": dt.isoformat(),
+                    "month": dt.strftime("%Y-%m"),
+                    "month_key": month_key,
+                    "ts_epoch": ts_epoch,
+                    "overtime_bucket": self.calendar.classify(dt),
+                }
+            batch.append({"case_id": case_id, "activity": activity, "resource": resource, "role": role, **fields})
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                self.session.run(IMPORT_QUERY, rows=batch, source_file=source_file)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.session.run(IMPORT_QUERY, rows=batch, source_file=source_file)
+            count += len(batch)
         return count
 
+    def finish_import(self, source_file: str, project: bool = True):
+        """Setelah import_rows untuk satu sumber: case summary, projection, bump versi"""
+        self.update_case_summaries(source_file)
+        self.update_activity_sketches(source_file)
+        if project:
+            self.project_graph()
+        graph_version.bump(self.session)
+
     def project_graph(self):
+        """
+        Bangun ulang COLLABORATED_IN dan INTERACTS_WITH dari semua WORKED_ON.
+        Relationship lama dihapus dulu, jadi aman dipanggil lagi setelah append.
+
+        Edge dipartisi per dataset (source file): hanya pasangan event dari
+        file yang sama yang dihitung, dan setiap edge membawa property
+        dataset. Tanpa filter dataset, analytics menjumlahkan semua partisi.
+        """
+        self.session.run("MATCH ()-[i:INTERACTS_WITH]->() DELETE i")
+        self.session.run("MATCH ()-[r:COLLABORATED_IN]->() DELETE r")
 
         query_collab = """
         MATCH (p1:Person)-[w1:WORKED_ON]->(c:Case)<-[w2:WORKED_ON]-(p2:Person)
-        WHERE p1 <> p2 AND w1.month = w2.month
-        MERGE (p1)-[r:COLLABORATED_IN {month: w1.month}]-(p2)
-        ON CREATE SET r.weight = 1
+        WHERE p1 <> p2 AND w1.month = w2.month AND w1.source_file = w2.source_file
+        MERGE (p1)-[r:COLLABORATED_IN {month: w1.month, dataset: w1.source_file}]-(p2)
+        ON CREATE SET r.weight = 1, r.month_key = w1.month_key
         ON MATCH SET r.weight = r.weight + 1
         """
         self.session.run(query_collab)
@@ -72,8 +407,9 @@ class DataImporter:
         MATCH (r1:Role {name: p1.role})
         MATCH (r2:Role {name: p2.role})
         WHERE r1 <> r2
-        MERGE (r1)-[i:INTERACTS_WITH]->(r2)
+        MERGE (r1)-[i:INTERACTS_WITH {dataset: r.dataset}]->(r2)
         ON CREATE SET i.total_weight = r.weight
         ON MATCH SET i.total_weight = i.total_weight + r.weight
         """
         self.session.run(query_roles)
+        graph_version.bump(self.session)
@@ -0,0 +1,117 @@
+"""
+Notifications
+=============
+Push "graph-version" ke client SSE (/events) setiap data graph berubah
+
+DataImporter menaikkan graph_version beberapa kali dalam satu load
+(clear, tiap file, project_graph). Listener di sini men-debounce bump
+tersebut (EVENTS_DEBOUNCE_MS) sehingga client menerima satu event setelah
+import/append selesai:
+
+    event: graph-version
+    data: {"version": 7, "aggregates": {...}}
+
+Jika EVENTS_PUSH_AGGREGATES aktif, aggregates top-level dihitung sekali
+per event (bukan per client) di thread pool lalu ikut dikirim.
+
+uvicorn baru menjalankan event shutdown setelah semua response selesai,
+jadi stream SSE diakhiri saat SIGINT/SIGTERM diterima (handler server
+tetap dipanggil sesudahnya).
+"""
+
+import asyncio
+import logging
+import signal
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.core.broadcast import Broadcaster
+from app.db.neo4j import neo4j_driver
+from app.services.analytics import AnalyticsService
+from app.services.graph_version import graph_version
+
+logger = logging.getLogger(__name__)
+
+graph_events = Broadcaster()
+
+_pending: Optional[asyncio.TimerHandle] = None
+_listening = False
+
+
+def compute_aggregates() -> Dict[str, Any]:
+    """Aggregates ringan untuk header dashboard (dijalankan di thread pool)"""
+    with neo4j_driver.get_session() as session:
+        service = AnalyticsService(session)
+        return {
+            "top_interactions": service.get_top_interactions(5),
+            "average_project_duration": service.get_average_project_duration(),
+            "overtime": service.get_overtime_risk(5),
+        }
+
+
+async def _publish(version: int) -> None:
+    data: Dict[str, Any] = {"version": version}
+    if settings.EVENTS_PUSH_AGGREGATES:
+        try:
+            data["aggregates"] = await asyncio.get_running_loop().run_in_executor(None, compute_aggregates)
+        except Exception as e:  # noqa: BLE001 - event versi tetap dikirim
+            logger.warning("could not compute aggregates for version %d: %s", version, e)
+    # Versi bisa sudah naik lagi selama aggregates dihitung
+    if version == graph_version.value:
+        graph_events.publish(_event_id(), "graph-version", data)
+
+
+def _event_id() -> str:
+    # Epoch ikut di id: setelah GraphMeta dibuat ulang angka versi bisa sama
+    # dengan Last-Event-ID client
+    epoch, version = graph_version.snapshot()
+    return f"{epoch}:{version}"
+
+
+def _schedule(version: int) -> None:
+    global _pending
+    if _pending is not None:
+        _pending.cancel()
+    _pending = graph_events.loop.call_later(
+        settings.EVENTS_DEBOUNCE_MS / 1000, lambda: asyncio.ensure_future(_publish(version))
+    )
+
+
+def _on_graph_change(version: int) -> None:
+    # Dipanggil dari thread importer
+    loop = graph_events.loop
+    if loop is not None and not loop.is_closed():
+        loop.call_soon_threadsafe(_schedule, version)
+
+
+def start_notifications(loop: asyncio.AbstractEventLoop) -> None:
+    """Bind broadcaster ke event loop aplikasi dan dengarkan graph_version"""
+    global _listening
+    graph_events.bind(loop)
+    graph_events.publish(_event_id(), "graph-version", {"version": graph_version.value})
+    if not _listening:
+        graph_version.on_change(_on_graph_change)
+        _listening = True
+
+
+def close_on_exit_signals(loop: asyncio.AbstractEventLoop) -> None:
+    """Tutup broadcaster saat SIGINT/SIGTERM, sebelum handler yang sudah terpasang"""
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            continue
+
+        def handler(received, frame, previous=previous):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(stop_notifications)
+            previous(received, frame)
+
+        try:
+            signal.signal(signum, handler)
+        except ValueError:
+            # Bukan main thread (mis. test client); close() tetap dipanggil saat shutdown
+            return
+
+
+def stop_notifications() -> None:
+    graph_events.close()
@@ -0,0 +1,161 @@
+"""
+Process Discovery
+=================
+Directly-follows graph (DFG) miner atas urutan WORKED_ON.activity per Case
+
+Edge a -> b berarti activity b langsung mengikuti a dalam case yang sama.
+Graph dihitung dalam satu pass atas event log terurut: pasangan berurutan
+di-encode menjadi key src * n + dst, lalu np.unique memberi sparse count
+matrix (urut row-major seperti CSR) beserta total durasi per edge.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from neo4j import Session
+
+from app.services.event_log import EventLog, fetch_event_log
+from app.services.graph_version import VersionedCache
+
+
+@dataclass
+class DirectlyFollowsGraph:
+    """DFG dalam bentuk sparse arrays, index mengacu ke activities"""
+
+    activities: List[str]
+    activity_counts: np.ndarray
+    start_counts: np.ndarray
+    end_counts: np.ndarray
+    edge_sources: np.ndarray
+    edge_targets: np.ndarray
+    edge_counts: np.ndarray
+    edge_mean_duration_hours: np.ndarray
+
+
+def mine_dfg(log: EventLog) -> DirectlyFollowsGraph:
+    """
+    Mine directly-follows graph dari event log
+
+    Args:
+        log: EventLog terurut (case, timestamp)
+
+    Returns:
+        DirectlyFollowsGraph dengan frequency dan mean duration per edge
+    """
+    n = len(log.activities)
+    codes = log.activity_codes.astype(np.int64)
+
+    same_case = log.case_codes[1:] == log.case_codes[:-1]
+    sources = codes[:-1][same_case]
+    targets = codes[1:][same_case]
+    durations = np.diff(log.timestamps)[same_case]
+
+    keys, inverse, counts = np.unique(sources * n + targets, return_inverse=True, return_counts=True)
+    duration_sums = np.bincount(inverse.reshape(-1), weights=durations, minlength=len(keys))
+
+    starts, ends = log.case_boundaries()
+    return DirectlyFollowsGraph(
+        activities=log.activities,
+        activity_counts=np.bincount(codes, minlength=n),
+        start_counts=np.bincount(codes[starts], minlength=n),
+        end_counts=np.bincount(codes[ends], minlength=n),
+        edge_sources=keys // n if n else keys,
+        edge_targets=keys % n if n else keys,
+        edge_counts=counts,
+        edge_mean_duration_hours=duration_sums / np.maximum(counts, 1) / 3600.0
+    )
+
+
+def filter_dfg(
+    dfg: DirectlyFollowsGraph,
+    min_activity_frequency: int = 1,
+    min_edge_frequency: int = 1,
+    edge_ratio: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Prune DFG lalu format untuk React Flow (nodes/edges)
+
+    Args:
+        dfg: Hasil mine_dfg
+        min_activity_frequency: Activity dengan frekuensi di bawah ini dibuang
+        min_edge_frequency: Edge dengan frekuensi di bawah ini dibuang
+        edge_ratio: Edge dibuang jika frekuensinya < edge_ratio * edge
+            terkuat yang keluar dari activity sumber (0 = nonaktif)
+
+    Returns:
+        Dict berisi nodes, edges, start_activities, end_activities
+    """
+    keep_activity = dfg.activity_counts >= min_activity_frequency
+
+    keep_edge = (
+        keep_activity[dfg.edge_sources]
+        & keep_activity[dfg.edge_targets]
+        & (dfg.edge_counts >= min_edge_frequency)
+    )
+    if edge_ratio > 0 and len(dfg.edge_counts):
+        max_outgoing = np.zeros(len(dfg.activities), dtype=np.int64)
+        np.maximum.at(max_outgoing, dfg.edge_sources, dfg.edge_counts)
+        keep_edge &= dfg.edge_counts >= edge_ratio * max_outgoing[dfg.edge_sources]
+
+    activities = dfg.activities
+    nodes = [
+        {
+            "id": activities[i],
+            "label": activities[i],
+            "type": "Activity",
+            "frequency": int(dfg.activity_counts[i])
+        }
+        for i in np.flatnonzero(keep_activity)
+    ]
+
+    edges = [
+        {
+            "source": activities[src],
+            "target": activities[dst],
+            "label": str(count),
+            "weight": count,
+            "mean_duration_hours": round(duration, 1)
+        }
+        for src, dst, count, duration in zip(
+            dfg.edge_sources[keep_edge].tolist(),
+            dfg.edge_targets[keep_edge].tolist(),
+            dfg.edge_counts[keep_edge].tolist(),
+            dfg.edge_mean_duration_hours[keep_edge].tolist()
+        )
+    ]
+
+    def endpoint_activities(counts: np.ndarray) -> List[Dict[str, Any]]:
+        selected = np.flatnonzero((counts > 0) & keep_activity)
+        selected = selected[np.argsort(-counts[selected], kind="stable")]
+        return [{"activity": activities[i], "count": int(counts[i])} for i in selected]
+
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "start_activities": endpoint_activities(dfg.start_counts),
+        "end_activities": endpoint_activities(dfg.end_counts)
+    }
+
+
+_dfg_cache = VersionedCache(max_entries=32)
+
+
+class ProcessDiscoveryService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_directly_follows_graph(
+        self,
+        min_activity_frequency: int = 1,
+        min_edge_frequency: int = 1,
+        edge_ratio: float = 0.0,
+        dataset: Optional[str] = None
+    ) -> Dict[str, Any]:
+        dfg = _dfg_cache.get_or_compute(
+            ("dfg", dataset), lambda: mine_dfg(fetch_event_log(self.session, dataset))
+        )
+        params = (min_activity_frequency, min_edge_frequency, edge_ratio)
+        return _dfg_cache.get_or_compute(
+            ("dfg_filtered", dataset) + params, lambda: filter_dfg(dfg, *params)
+        )
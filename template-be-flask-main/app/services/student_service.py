@@ -12,7 +12,7 @@ Service layer berisi:
 Tidak ada detail HTTP/REST di layer ini.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from app.models.student import Student
 from app.repositories.student_repository import student_repository
 
@@ -94,6 +94,45 @@ class StudentService:
         """
         return self.repository.find_all()
 
+    def get_students_page(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        sort: str = 'id',
+        order: str = 'asc',
+        gpa_min: Optional[float] = None,
+        gpa_max: Optional[float] = None,
+        attendance_min: Optional[float] = None,
+        attendance_max: Optional[float] = None,
+        name: Optional[str] = None
+    ) -> Tuple[List[Student], int]:
+        """
+        Get students per halaman dengan filter dan sorting
+
+        Args:
+            page: Nomor halaman (mulai dari 1)
+            per_page: Jumlah student per halaman
+            sort: Field untuk sorting
+            order: 'asc' atau 'desc'
+            gpa_min, gpa_max: Range GPA
+            attendance_min, attendance_max: Range attendance rate
+            name: Prefix nama
+
+        Returns:
+            Tuple (students di halaman, total students yang match)
+        """
+        return self.repository.find_page(
+            offset=(page - 1) * per_page,
+            limit=per_page,
+            sort_by=sort,
+            descending=(order == 'desc'),
+            gpa_min=gpa_min,
+            gpa_max=gpa_max,
+            attendance_min=attendance_min,
+            attendance_max=attendance_max,
+            name_prefix=name
+        )
+
     def update_student(self, student_id: int, data: Dict[str, Any]) -> Optional[Student]:
         """
         Update existing student
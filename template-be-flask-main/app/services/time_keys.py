@@ -0,0 +1,51 @@
+"""
+Time Keys
+=========
+Representasi waktu integer untuk filter range yang bisa dilayani index
+
+    month_key  year * 12 + month (mis. 2019-04 -> 24232), disimpan di
+               WORKED_ON, COLLABORATED_IN dan Case.start_month_key
+    ts_epoch   epoch seconds (UTC) di WORKED_ON
+
+Bulan berurutan punya key berurutan, jadi range 'YYYY-MM' menjadi
+predicate integer `key >= $start_key AND key <= $end_key`. Property string
+`month` tetap disimpan untuk output.
+"""
+
+import calendar
+from datetime import datetime
+from typing import Optional, Tuple
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+YEAR_PATTERN = r"^\d{4}$"
+
+# Key untuk bulan 9999-12; batas atas range yang terbuka
+MAX_MONTH_KEY = 9999 * 12 + 12
+
+
+def month_key(month: Optional[str]) -> Optional[int]:
+    """'YYYY-MM' -> year * 12 + month; None tetap None"""
+    if month is None:
+        return None
+    year, _, mon = month.partition("-")
+    value = int(mon)
+    if not 1 <= value <= 12:
+        raise ValueError(f"Invalid month: {month!r}")
+    return int(year) * 12 + value
+
+
+def month_from_key(key: int) -> str:
+    """Kebalikan month_key: 24232 -> '2019-04'"""
+    year, mon = divmod(key - 1, 12)
+    return f"{year:04d}-{mon + 1:02d}"
+
+
+def year_key_range(year: str) -> Tuple[int, int]:
+    """Range month_key (inklusif) untuk satu tahun 'YYYY'"""
+    base = int(year) * 12
+    return base + 1, base + 12
+
+
+def datetime_keys(dt: datetime) -> Tuple[int, int]:
+    """(month_key, ts_epoch) untuk timestamp; naive dianggap UTC seperti datetime() Cypher"""
+    return dt.year * 12 + dt.month, calendar.timegm(dt.utctimetuple())
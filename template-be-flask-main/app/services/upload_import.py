@@ -0,0 +1,308 @@
+"""
+Upload Import
+=============
+Import event log CSV dari request body secara streaming
+
+Body dibaca per chunk (request.stream()), di-decode dan di-parse per
+baris begitu chunk datang, lalu dikirim ke DataImporter.import_rows per
+batch IMPORT_BATCH_SIZE. Chunk berikutnya baru dibaca setelah batch
+ditulis, jadi memory terbatas ~ satu batch + satu chunk berapapun ukuran
+upload, dan tidak ada file sementara.
+
+Format body:
+    text/csv (atau apa saja selain multipart)  CSV mentah, boleh chunked
+    multipart/form-data                        part pertama yang punya
+                                               filename dipakai sebagai CSV
+
+CSV sama dengan data-analysis: delimiter ';', header
+CaseID;NameActivity;timestamp;Resource;Role, timestamp MM-DD-YY HH:MM.
+Field dengan newline di dalam quote tidak didukung.
+
+Jika stream gagal di tengah (body rusak, baris terlalu panjang, error
+Neo4j), batch yang sudah ter-commit tetap dirangkum lewat finish_import
+(case summary, sketch, projection, bump versi) dan jumlahnya dilaporkan.
+"""
+
+import codecs
+import csv
+import logging
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.event_log_store import TIMESTAMP_FORMAT
+from app.services.importer import IMPORT_BATCH_SIZE, DataImporter
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("CaseID", "NameActivity", "timestamp", "Resource", "Role")
+MAX_ERROR_SAMPLES = 20
+MAX_MULTIPART_HEADER_SIZE = 16 * 1024
+# Baris yang belum selesai ditampung sampai newline; di atas ini upload ditolak
+MAX_LINE_LENGTH = 64 * 1024
+# Event berurutan sering berbagi timestamp; memo strptime dibatasi
+TIMESTAMP_MEMO_SIZE = 4096
+
+Row = Tuple[str, str, datetime, str, str]
+
+
+class UploadError(ValueError):
+    """
+    Body upload tidak bisa diproses (header CSV, multipart rusak, dll)
+
+    result berisi ringkasan import_stream (termasuk row yang sudah ditulis)
+    jika error terjadi setelah import dimulai.
+    """
+
+    def __init__(self, message: str, result: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.result = result
+
+
+class EventCsvParser:
+    """
+    Parser CSV incremental: feed(chunk) -> rows lengkap di chunk tersebut
+
+    Row yang tidak valid tidak menghentikan import; dihitung per alasan
+    dan MAX_ERROR_SAMPLES pertama disimpan beserta nomor barisnya.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._tail = ""
+        self._columns: Optional[Dict[str, int]] = None
+        self._timestamps: Dict[str, Optional[datetime]] = {}
+        self.line_no = 0
+        self.accepted = 0
+        self.rejected: Counter = Counter()
+        self.errors: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: bytes) -> List[Row]:
+        self._check_tail()
+        text = self._tail + self._decoder.decode(chunk)
+        lines = text.split("\n")
+        self._tail = lines.pop()
+        # Baris terlalu panjang baru ditolak di feed/close berikutnya,
+        # supaya rows lengkap dari chunk ini tetap dikembalikan
+        return self._parse(lines)
+
+    def _check_tail(self) -> None:
+        if len(self._tail) > MAX_LINE_LENGTH:
+            raise UploadError(f"Line {self.line_no + 1} is longer than {MAX_LINE_LENGTH} characters")
+
+    def close(self) -> List[Row]:
+        self._check_tail()
+        text = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        rows = self._parse([text] if text.strip() else [])
+        if self._columns is None:
+            raise UploadError("Empty upload: no CSV header")
+        return rows
+
+    def _reject(self, reason: str) -> None:
+        self.rejected[reason] += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append({"line": self.line_no, "reason": reason})
+
+    def _timestamp(self, raw: str) -> Optional[datetime]:
+        if raw not in self._timestamps:
+            if len(self._timestamps) >= TIMESTAMP_MEMO_SIZE:
+                self._timestamps.clear()
+            try:
+                self._timestamps[raw] = datetime.strptime(raw, TIMESTAMP_FORMAT)
+            except ValueError:
+                self._timestamps[raw] = None
+        return self._timestamps[raw]
+
+    def _parse(self, lines: List[str]) -> List[Row]:
+        rows: List[Row] = []
+        for fields in csv.reader((line.rstrip("\r") for line in lines), delimiter=";"):
+            self.line_no += 1
+            if self._columns is None:
+                missing = [name for name in REQUIRED_COLUMNS if name not in fields]
+                if missing:
+                    raise UploadError(f"CSV header is missing columns: {', '.join(missing)}")
+                self._columns = {name: fields.index(name) for name in REQUIRED_COLUMNS}
+                continue
+            if not fields:
+                continue
+            if len(fields) <= max(self._columns.values()):
+                self._reject("wrong column count")
+                continue
+            case_id, activity, raw_ts, resource, role = (fields[self._columns[name]] for name in REQUIRED_COLUMNS)
+            if not case_id or not raw_ts or not resource:
+                self._reject("missing CaseID, timestamp or Resource")
+                continue
+            dt = self._timestamp(raw_ts)
+            if dt is None:
+                self._reject("invalid timestamp")
+                continue
+            rows.append((case_id, activity, dt, resource, role))
+            self.accepted += 1
+        return rows
+
+
+def multipart_boundary(content_type: str) -> Optional[bytes]:
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    return match.group(1).encode("latin-1") if match else None
+
+
+class MultipartFileReader:
+    """
+    Stream isi part pertama yang punya filename dari body multipart/form-data,
+    tanpa menampung body (part lain dilewati)
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], boundary: bytes):
+        self.stream = stream
+        self.delimiter = b"\r\n--" + boundary
+        self.filename: Optional[str] = None
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        delimiter = self.delimiter
+        keep = len(delimiter) - 1
+        # Prefix CRLF supaya boundary pertama cocok dengan delimiter yang sama
+        buf = b"\r\n"
+        state = "skip"
+        async for data in self.stream:
+            buf += data
+            while True:
+                if state == "skip":
+                    i = buf.find(delimiter)
+                    if i < 0:
+                        buf = buf[-keep:]
+                        break
+                    buf = buf[i + len(delimiter):]
+                    state = "delimiter"
+                if state == "delimiter":
+                    if len(buf) < 2:
+                        break
+                    if buf.startswith(b"--"):
+                        raise UploadError("No file part in multipart body")
+                    j = buf.find(b"\r\n")
+                    if j < 0:
+                        break
+                    buf = buf[j + 2:]
+                    state = "headers"
+                if state == "headers":
+                    j = buf.find(b"\r\n\r\n")
+                    if j < 0:
+                        if len(buf) > MAX_MULTIPART_HEADER_SIZE:
+                            raise UploadError("Multipart part headers too large")
+                        break
+                    match = re.search(r'filename="([^"]*)"', buf[:j].decode("latin-1"), re.IGNORECASE)
+                    buf = buf[j + 4:]
+                    if match:
+                        self.filename = os.path.basename(match.group(1)) or None
+                        state = "body"
+                    else:
+                        state = "skip"
+                    continue
+                if state == "body":
+                    i = buf.find(delimiter)
+                    if i >= 0:
+                        if i:
+                            yield buf[:i]
+                        return
+                    if len(buf) > keep:
+                        yield buf[:-keep]
+                        buf = buf[-keep:]
+                    break
+        raise UploadError("Unexpected end of multipart body")
+
+
+async def open_upload(
+    stream: AsyncIterator[bytes],
+    content_type: str,
+    source_file: Optional[str] = None
+) -> Tuple[AsyncIterator[bytes], str]:
+    """
+    Return (chunks CSV, source_file) untuk body request. Untuk multipart,
+    filename part dipakai sebagai source_file jika tidak diberikan.
+    """
+    default = f"upload-{datetime.now():%Y%m%d-%H%M%S}.csv"
+    if not content_type.startswith("multipart/form-data"):
+        return stream, source_file or default
+
+    boundary = multipart_boundary(content_type)
+    if boundary is None:
+        raise UploadError("multipart/form-data without boundary")
+    reader = MultipartFileReader(stream, boundary)
+    chunks = reader.chunks()
+    # Baca sampai header part file supaya filename diketahui
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        # Part file kosong; parser melaporkan "Empty upload"
+        first = b""
+
+    async def chained() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return chained(), source_file or reader.filename or default
+
+
+async def import_stream(
+    chunks: AsyncIterator[bytes],
+    importer: DataImporter,
+    source_file: str,
+    project: bool = True
+) -> Dict[str, Any]:
+    """
+    Parse dan import CSV dari chunks; query Neo4j dijalankan di threadpool
+
+    Returns:
+        Ringkasan: accepted/rejected/written rows, alasan reject dan contoh error
+
+    Raises:
+        UploadError: body tidak valid; e.result berisi ringkasan row yang
+            sudah ditulis (row yang diterima sebelum error tetap diimport)
+    """
+    parser = EventCsvParser()
+    await run_in_threadpool(importer.ensure_schema)
+
+    pending: List[Row] = []
+    written = 0
+    failure: Optional[UploadError] = None
+    try:
+        try:
+            async for chunk in chunks:
+                pending.extend(parser.feed(chunk))
+                if len(pending) >= IMPORT_BATCH_SIZE:
+                    written += await run_in_threadpool(importer.import_rows, pending, source_file)
+                    pending = []
+            pending.extend(parser.close())
+        except UploadError as e:
+            failure = e
+        if pending:
+            written += await run_in_threadpool(importer.import_rows, pending, source_file)
+    except Exception:
+        # Batch yang sudah ter-commit tidak di-rollback; rangkum supaya graph konsisten
+        if written:
+            logger.warning("import of %s failed after %d rows; finishing the written rows", source_file, written)
+            try:
+                await run_in_threadpool(importer.finish_import, source_file, project)
+            except Exception as e:  # noqa: BLE001 - error asli yang dilaporkan
+                logger.warning("finish_import for %s failed: %s", source_file, e)
+        raise
+
+    if written:
+        await run_in_threadpool(importer.finish_import, source_file, project)
+    result = {
+        "source_file": source_file,
+        "accepted": parser.accepted,
+        "rejected": sum(parser.rejected.values()),
+        "rejected_reasons": dict(parser.rejected),
+        "errors": parser.errors,
+        "written": written,
+        "projected": bool(written and project),
+    }
+    if failure is not None:
+        raise UploadError(str(failure), result) from failure
+    return result
@@ -0,0 +1,135 @@
+"""
+Process Variants
+================
+Kelompokkan case berdasarkan trace activity (variant)
+
+Trace setiap case di-encode sebagai tuple activity codes lalu di-hash ke
+variant table dalam satu pass berurutan atas event log. Statistik durasi
+(mean, p50, p95) dihitung vectorized per variant setelah pass selesai.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from neo4j import Session
+
+from app.services.event_log import EventLog, fetch_event_log
+from app.services.graph_version import VersionedCache
+
+
+@dataclass
+class VariantIndex:
+    """Variant table, urut dari variant paling sering"""
+
+    activities: List[str]
+    traces: List[Tuple[int, ...]]
+    counts: np.ndarray
+    mean_hours: np.ndarray
+    p50_hours: np.ndarray
+    p95_hours: np.ndarray
+    total_cases: int
+
+
+def _sorted_percentile(sorted_values: np.ndarray, offsets: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Percentile q tiap segmen sorted_values[offsets[i]:offsets[i] + counts[i]] (counts >= 1)"""
+    position = (counts - 1) * (q / 100.0)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts - 1)
+    low_values = sorted_values[offsets + lower]
+    high_values = sorted_values[offsets + upper]
+    return low_values + (high_values - low_values) * (position - lower)
+
+
+def build_variant_index(log: EventLog) -> VariantIndex:
+    """
+    Build variant table dari event log
+
+    Args:
+        log: EventLog terurut (case, timestamp)
+
+    Returns:
+        VariantIndex dengan frequency dan durasi per variant
+    """
+    starts, ends = log.case_boundaries()
+    codes = log.activity_codes.tolist()
+    case_durations = (log.timestamps[ends] - log.timestamps[starts]) / 3600.0
+
+    variant_of: Dict[Tuple[int, ...], int] = {}
+    case_variant = np.empty(len(starts), dtype=np.int64)
+    for case_idx, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        trace = tuple(codes[start:end + 1])
+        variant_id = variant_of.get(trace)
+        if variant_id is None:
+            variant_id = variant_of[trace] = len(variant_of)
+        case_variant[case_idx] = variant_id
+
+    traces = list(variant_of)
+    n_variants = len(traces)
+    counts = np.bincount(case_variant, minlength=n_variants)
+    mean_hours = np.bincount(case_variant, weights=case_durations, minlength=n_variants) / np.maximum(counts, 1)
+
+    # Percentile per variant: urutkan durasi per (variant, durasi), lalu
+    # interpolasi linear (sama dengan np.percentile) lewat offsets per variant
+    order = np.lexsort((case_durations, case_variant))
+    sorted_durations = case_durations[order]
+    offsets = np.cumsum(counts) - counts
+    p50_hours = _sorted_percentile(sorted_durations, offsets, counts, 50)
+    p95_hours = _sorted_percentile(sorted_durations, offsets, counts, 95)
+
+    rank = np.argsort(-counts, kind="stable")
+    return VariantIndex(
+        activities=log.activities,
+        traces=[traces[v] for v in rank.tolist()],
+        counts=counts[rank],
+        mean_hours=mean_hours[rank],
+        p50_hours=p50_hours[rank],
+        p95_hours=p95_hours[rank],
+        total_cases=len(starts)
+    )
+
+
+_variant_cache = VersionedCache(max_entries=4)
+
+
+class VariantService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_variants(
+        self,
+        top_k: int = 10,
+        prefix: Optional[List[str]] = None,
+        dataset: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        index = _variant_cache.get_or_compute(
+            ("variants", dataset), lambda: build_variant_index(fetch_event_log(self.session, dataset))
+        )
+
+        selected = range(len(index.traces))
+        if prefix:
+            codes = {activity: code for code, activity in enumerate(index.activities)}
+            if any(activity not in codes for activity in prefix):
+                return []
+            prefix_codes = tuple(codes[activity] for activity in prefix)
+            selected = (
+                v for v in selected
+                if index.traces[v][:len(prefix_codes)] == prefix_codes
+            )
+
+        variants = []
+        for v in selected:
+            if len(variants) >= top_k:
+                break
+            trace = index.traces[v]
+            variants.append({
+                "rank": v + 1,
+                "activities": [index.activities[code] for code in trace],
+                "length": len(trace),
+                "frequency": int(index.counts[v]),
+                "case_share": round(index.counts[v] / index.total_cases, 4),
+                "mean_duration_hours": round(float(index.mean_hours[v]), 1),
+                "p50_duration_hours": round(float(index.p50_hours[v]), 1),
+                "p95_duration_hours": round(float(index.p95_hours[v]), 1)
+            })
+        return variants
@@ -0,0 +1,81 @@
+"""
+Work Calendar
+=============
+Klasifikasi overtime berdasarkan kalender kerja yang bisa dikonfigurasi
+
+Event dianggap overtime jika jatuh di luar jam kerja, di hari weekend
+atau di hari libur. Klasifikasi dilakukan sekali saat import dan disimpan
+sebagai bucket di WORKED_ON:
+
+    holiday  tanggal termasuk OVERTIME_HOLIDAYS
+    weekend  hari (ISO, 1=Senin) termasuk OVERTIME_WEEKEND_DAYS
+    early    jam < OVERTIME_WORK_START_HOUR
+    late     jam > OVERTIME_WORK_END_HOUR
+
+Default (07-18, tanpa weekend/holiday) sama dengan aturan lama
+`hour < 7 OR hour > 18`.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import FrozenSet, Optional
+
+from app.config import settings
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover - Python < 3.9
+    ZoneInfo = None
+
+
+def _parse_int_set(value: str) -> FrozenSet[int]:
+    return frozenset(int(part) for part in value.split(",") if part.strip())
+
+
+def _parse_date_set(value: str) -> FrozenSet[date]:
+    return frozenset(date.fromisoformat(part.strip()) for part in value.split(",") if part.strip())
+
+
+@dataclass(frozen=True)
+class WorkCalendar:
+    """Jam kerja, weekend, holiday dan timezone untuk klasifikasi overtime"""
+
+    work_start_hour: int = 7
+    work_end_hour: int = 18
+    weekend_days: FrozenSet[int] = field(default_factory=frozenset)
+    holidays: FrozenSet[date] = field(default_factory=frozenset)
+    timezone: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls) -> "WorkCalendar":
+        return cls(
+            work_start_hour=settings.OVERTIME_WORK_START_HOUR,
+            work_end_hour=settings.OVERTIME_WORK_END_HOUR,
+            weekend_days=_parse_int_set(settings.OVERTIME_WEEKEND_DAYS),
+            holidays=_parse_date_set(settings.OVERTIME_HOLIDAYS),
+            timezone=settings.OVERTIME_TIMEZONE or None
+        )
+
+    def localize(self, dt: datetime) -> datetime:
+        """
+        Konversi ke timezone kalender. Timestamp naive dianggap UTC jika
+        timezone diset; tanpa timezone, timestamp dipakai apa adanya.
+        """
+        if not self.timezone:
+            return dt
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(ZoneInfo(self.timezone))
+
+    def classify(self, dt: datetime) -> Optional[str]:
+        """Return bucket overtime ('holiday', 'weekend', 'early', 'late') atau None"""
+        local = self.localize(dt)
+        if local.date() in self.holidays:
+            return "holiday"
+        if local.isoweekday() in self.weekend_days:
+            return "weekend"
+        if local.hour < self.work_start_hour:
+            return "early"
+        if local.hour > self.work_end_hour:
+            return "late"
+        return None
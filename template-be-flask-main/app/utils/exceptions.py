@@ -50,3 +50,10 @@ class ConflictException(AppException):
 
     def __init__(self, message: str = "Conflict"):
         super().__init__(message, status_code=409)
+
+
+class ServiceUnavailableException(AppException):
+    """Exception untuk service yang sementara tidak tersedia (timeout, overload)"""
+
+    def __init__(self, message: str = "Service unavailable"):
+        super().__init__(message, status_code=503)
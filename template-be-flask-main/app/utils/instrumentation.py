@@ -0,0 +1,60 @@
+"""
+Request Instrumentation (Flask)
+===============================
+Hook before/after/teardown request untuk Flask app
+
+Padanan RequestTimingMiddleware di sisi FastAPI:
+- Header Server-Timing (validation, service, serialization, total)
+- Histogram latency per url_rule dan counter in-flight (route_metrics)
+- ?profile=1 saat PROFILING_ENABLED: response diganti folded stacks
+
+Phase validation dan serialization diisi oleh TimedSchema dan
+_json_response; service adalah sisa waktu request.
+"""
+
+from flask import g, request
+
+from app.core.tracing import SamplingProfiler, end_request_timing, route_metrics, start_request_timing
+
+
+def init_request_instrumentation(app):
+    """Pasang hooks instrumentation ke Flask app"""
+
+    @app.before_request
+    def _start_request_timing():
+        g.request_timing, g.request_timing_token = start_request_timing()
+        route_metrics.request_started()
+        if app.config.get('PROFILING_ENABLED') and request.args.get('profile') == '1':
+            g.request_profiler = SamplingProfiler(
+                interval_ms=app.config.get('PROFILE_INTERVAL_MS', 1.0)
+            ).start()
+
+    @app.after_request
+    def _finish_request_timing(response):
+        timing = g.get('request_timing')
+        if timing is None:
+            return response
+
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            response = app.response_class(profiler.folded(), mimetype='text/plain')
+            response.headers['Cache-Control'] = 'no-store'
+
+        total_ms = timing.elapsed_ms()
+        timing.add('service', max(total_ms - sum(timing.phases.values()), 0.0))
+        response.headers['Server-Timing'] = timing.server_timing(total_ms)
+
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        route_metrics.observe(request.method, route, response.status_code, total_ms)
+        return response
+
+    @app.teardown_request
+    def _end_request_timing(exc):
+        profiler = g.pop('request_profiler', None)
+        if profiler is not None:
+            profiler.stop()
+        token = g.pop('request_timing_token', None)
+        if token is not None:
+            route_metrics.request_finished()
+            end_request_timing(token)
@@ -2,9 +2,29 @@
 Response Helpers
 ================
 Helper untuk membuat response yang konsisten
+
+Jika orjson ter-install, body di-serialize dengan orjson (jauh lebih cepat
+untuk payload besar) dan langsung dibungkus response_class Flask.
+Tanpa orjson, fallback ke jsonify.
 """
 
-from flask import jsonify
+from flask import current_app, jsonify
+
+from app.core.tracing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson optional
+    orjson = None
+
+
+def _json_response(payload, status_code):
+    """Serialize payload ke JSON response (orjson fast path)"""
+    with timed('serialization'):
+        if orjson is None:
+            return jsonify(payload), status_code
+        body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return current_app.response_class(body, mimetype='application/json'), status_code
 
 
 def success_response(data=None, message="Success", status_code=200):
@@ -15,7 +35,7 @@ def success_response(data=None, message="Success", status_code=200):
     }
     if data is not None:
         response['data'] = data
-    return jsonify(response), status_code
+    return _json_response(response, status_code)
 
 
 def error_response(message="Error", status_code=400, errors=None):
@@ -26,13 +46,13 @@ def error_response(message="Error", status_code=400, errors=None):
     }
     if errors:
         response['errors'] = errors
-    return jsonify(response), status_code
+    return _json_response(response, status_code)
 
 
 def paginated_response(items, total, page, per_page, message="Success"):
     """Create paginated response"""
     total_pages = (total + per_page - 1) // per_page
-    return jsonify({
+    return _json_response({
         'success': True,
         'message': message,
         'data': items,
@@ -42,4 +62,4 @@ def paginated_response(items, total, page, per_page, message="Success"):
             'per_page': per_page,
             'total_pages': total_pages
         }
-    }), 200
+    }, 200)
@@ -0,0 +1,125 @@
+"""
+Serialization Benchmark
+=======================
+Bandingkan jalur serialisasi response lama vs orjson fast path
+
+FastAPI:
+    - validated: TypeAdapter(List[Model]).validate_python + dump_json
+      (setara response_model + JSONResponse default)
+    - orjson:    FastJSONResponse.render langsung (json_response bypass)
+
+Flask:
+    - jsonify:   success_response lama
+    - orjson:    success_response dengan orjson fast path
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_serialization.py --rows 100000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse
+from app.models.schemas import UserCollaboration
+
+
+def make_utilization(rows: int) -> List[Dict]:
+    return [
+        {"day": i % 7 + 1, "hour": i % 24, "count": random.randint(1, 500)}
+        for i in range(rows)
+    ]
+
+
+def make_collaboration(rows: int) -> List[Dict]:
+    roles = ["Analyst", "Manager", "Engineer", "Clerk"]
+    return [
+        {
+            "user_a": f"user_{random.randint(0, 999)}",
+            "role_a": random.choice(roles),
+            "user_b": f"user_{random.randint(0, 999)}",
+            "role_b": random.choice(roles),
+            "weight": random.randint(1, 50),
+            "month": f"2024-{random.randint(1, 12):02d}"
+        }
+        for _ in range(rows)
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(timings), 2), "min_ms": round(min(timings), 2)}
+
+
+def bench_fastapi(payloads: Dict[str, List[Dict]], repeat: int) -> Dict[str, Dict]:
+    adapters = {
+        "utilization": TypeAdapter(List[dict]),
+        "collaboration": TypeAdapter(List[UserCollaboration]),
+    }
+    results = {}
+    for name, payload in payloads.items():
+        adapter = adapters[name]
+        results[name] = {
+            "validated": measure(lambda: adapter.dump_json(adapter.validate_python(payload)), repeat),
+            "orjson": measure(lambda: FastJSONResponse(payload).body, repeat),
+        }
+    return results
+
+
+def bench_flask(payloads: Dict[str, List[Dict]], repeat: int) -> Dict[str, Dict]:
+    try:
+        from flask import Flask, jsonify
+    except ImportError:
+        return {"skipped": "flask not installed"}
+
+    from app.utils import response as response_helpers
+
+    app = Flask(__name__)
+    results = {}
+    with app.app_context():
+        for name, payload in payloads.items():
+            results[name] = {
+                "jsonify": measure(
+                    lambda: jsonify({"success": True, "message": "Success", "data": payload}).get_data(),
+                    repeat
+                ),
+                "orjson": measure(
+                    lambda: response_helpers.success_response(payload)[0].get_data(),
+                    repeat
+                ),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    payloads = {
+        "utilization": make_utilization(args.rows),
+        "collaboration": make_collaboration(args.rows),
+    }
+    report = {
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "fastapi": bench_fastapi(payloads, args.repeat),
+        "flask": bench_flask(payloads, args.repeat),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Benchmark Suite
+===============
+Benchmark reproducible untuk import, projection dan analytics
+
+Untuk setiap ukuran log (default 10k, 100k, 1M event sintetis):
+
+    In-process (selalu jalan, tanpa Neo4j):
+        parse_csv           CSV -> rows (parse timestamp seperti DataImporter)
+        load_cached         EventLog dari cache columnar (event_log_store, mmap)
+        event_log           EventLog.from_rows (dictionary encoding + sort)
+        dfg                 mine_dfg + filter_dfg
+        variants            build_variant_index
+        collaboration       projection co-work per (case, month) + CSR graph
+        centrality          pagerank + betweenness (sampled)
+        communities         louvain_communities
+
+    Neo4j (jika NEO4J_URI bisa dihubungi dan ukuran <= --neo4j-max-rows):
+        load_csv, project_graph, lalu setiap method get_* AnalyticsService
+
+Setiap step diulang --repeat kali; report JSON berisi p50/p99 latency dan
+rows/s (terhadap p50). Setiap ukuran jalan di proses baru (spawn), jadi
+peak_rss_mb adalah high-water mark ukuran itu saja, bukan sisa ukuran
+sebelumnya. Step in-process juga mencatat alloc_peak_mb: puncak alokasi
+(tracemalloc, termasuk buffer numpy) selama satu run tambahan di luar
+pengukuran latency; --skip-alloc mematikannya.
+
+Usage:
+    PYTHONPATH=. python benchmarks/run_benchmarks.py --sizes 10000 100000 --out report.json
+"""
+
+import argparse
+import csv
+import multiprocessing
+import inspect
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import combinations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic_log import write_log
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q)) if samples else 0.0
+
+
+def alloc_peak_mb(fn: Callable[[], Any]) -> float:
+    """Puncak memori yang dialokasikan selama satu pemanggilan fn"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 1)
+
+
+def measure(fn: Callable[[], Any], repeat: int, rows: Optional[int] = None,
+            alloc: bool = False) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Jalankan fn sebanyak repeat; return (hasil terakhir, statistik)
+
+    Jika alloc aktif, fn dijalankan sekali lagi di bawah tracemalloc (tidak
+    ikut latency) untuk alloc_peak_mb.
+    """
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    p50 = statistics.median(samples)
+    stats = {
+        "runs": repeat,
+        "p50_ms": round(p50, 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "min_ms": round(min(samples), 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if alloc:
+        stats["alloc_peak_mb"] = alloc_peak_mb(fn)
+    if rows is not None:
+        stats["rows"] = rows
+        stats["rows_per_s"] = round(rows / (p50 / 1000), 1) if p50 else None
+    return result, stats
+
+
+def dataset(rows: int, seed: int) -> str:
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"agile_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        write_log(path, rows, seed)
+    return path
+
+
+def parse_csv(path: str) -> List[Tuple[str, str, int, str, str]]:
+    """Baca CSV seperti DataImporter.load_csv, hasil rows untuk EventLog"""
+    from app.services.importer import DataImporter
+
+    importer = DataImporter(session=None)
+    rows = []
+    with open(path, "r") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            if not row["CaseID"] or not row["timestamp"] or not row["Resource"]:
+                continue
+            iso_time, _ = importer.parse_timestamp(row["timestamp"])
+            if not iso_time:
+                continue
+            epoch = int(datetime.fromisoformat(iso_time).replace(tzinfo=timezone.utc).timestamp())
+            rows.append((row["CaseID"], row["NameActivity"], epoch, row["Resource"], row["Role"]))
+    return rows
+
+
+def project_collaboration(log) -> List[Dict[str, Any]]:
+    """
+    Padanan in-process project_graph: pasangan resource yang mengerjakan
+    case yang sama di bulan yang sama, weight = jumlah pasangan event
+    """
+    months = (log.timestamps // (30 * 24 * 3600)).tolist()
+    starts, ends = log.case_boundaries()
+    resources = log.resource_codes.tolist()
+    weights: Dict[Tuple[int, int], int] = defaultdict(int)
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        groups: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for i in range(start, end + 1):
+            groups[months[i]][resources[i]] += 1
+        for per_resource in groups.values():
+            for (a, na), (b, nb) in combinations(sorted(per_resource.items()), 2):
+                weights[(a, b)] += na * nb
+
+    role_of = dict(zip(resources, log.role_codes.tolist()))
+    return [
+        {
+            "user_a": log.resources[a], "role_a": log.roles[role_of[a]],
+            "user_b": log.resources[b], "role_b": log.roles[role_of[b]],
+            "weight": weight,
+        }
+        for (a, b), weight in weights.items()
+    ]
+
+
+def bench_in_process(path: str, rows: int, repeat: int, alloc: bool = True) -> Dict[str, Any]:
+    from app.services.collaboration_network import (
+        CollaborationGraph,
+        betweenness_centrality,
+        louvain_communities,
+        pagerank,
+    )
+    from app.services import event_log_store
+    from app.services.event_log import EventLog
+    from app.services.process_discovery import filter_dfg, mine_dfg
+    from app.services.variants import build_variant_index
+
+    steps = {}
+    parsed, steps["parse_csv"] = measure(lambda: parse_csv(path), repeat, rows, alloc)
+    log, steps["event_log"] = measure(lambda: EventLog.from_rows(parsed), repeat, rows, alloc)
+    event_log_store.load(path)  # isi cache, step berikut selalu cache hit
+    _, steps["load_cached"] = measure(lambda: event_log_store.load(path), repeat, rows, alloc)
+    _, steps["dfg"] = measure(lambda: filter_dfg(mine_dfg(log), edge_ratio=0.05), repeat, rows, alloc)
+    _, steps["variants"] = measure(lambda: build_variant_index(log), repeat, rows, alloc)
+    graph, steps["collaboration"] = measure(
+        lambda: CollaborationGraph.from_edges(project_collaboration(log)), repeat, rows, alloc
+    )
+    _, steps["centrality"] = measure(
+        lambda: (pagerank(graph), betweenness_centrality(graph, samples=200)), repeat, alloc=alloc
+    )
+    _, steps["communities"] = measure(lambda: louvain_communities(graph), repeat, alloc=alloc)
+    return steps
+
+
+def neo4j_session():
+    """Return (driver, None) jika Neo4j reachable, atau (None, alasan)"""
+    try:
+        from app.db.neo4j import neo4j_driver
+        neo4j_driver.driver.verify_connectivity()
+        return neo4j_driver, None
+    except Exception as e:  # noqa: BLE001 - alasan skip dicatat di report
+        return None, f"Neo4j unreachable: {e}"
+
+
+def analytics_arguments(log_months: List[str]) -> Dict[str, Any]:
+    return {
+        "start_month": log_months[0],
+        "end_month": log_months[-1],
+        "month": log_months[len(log_months) // 2],
+        "year": log_months[0][:4],
+        "limit": 10,
+    }
+
+
+def bench_neo4j(driver, path: str, rows: int, repeat: int) -> Dict[str, Any]:
+    from app.services.analytics import AnalyticsService
+    from app.services.importer import DataImporter
+
+    steps = {}
+    with driver.get_session() as session:
+        importer = DataImporter(session)
+        importer.clear_database()
+        _, steps["load_csv"] = measure(lambda: importer.load_csv(path), 1, rows)
+        _, steps["project_graph"] = measure(importer.project_graph, 1, rows)
+
+        months = [r["month"] for r in session.run(
+            "MATCH ()-[w:WORKED_ON]->() RETURN DISTINCT w.month as month ORDER BY month"
+        )]
+        arguments = analytics_arguments(months)
+        service = AnalyticsService(session)
+        for name, method in inspect.getmembers(service, inspect.ismethod):
+            if not name.startswith("get_"):
+                continue
+            params = inspect.signature(method).parameters
+            kwargs = {p: arguments[p] for p in params if p in arguments}
+            _, steps[f"analytics.{name[4:]}"] = measure(lambda: method(**kwargs), repeat)
+    return steps
+
+
+def bench_size(rows: int, args: argparse.Namespace, use_neo4j: bool) -> Dict[str, Any]:
+    """Semua step untuk satu ukuran; dijalankan di proses baru oleh main()"""
+    path = dataset(rows, args.seed)
+    print(f"[{rows} rows] in-process ...", flush=True)
+    result = {
+        "dataset": os.path.basename(path),
+        "in_process": bench_in_process(path, rows, args.repeat, alloc=not args.skip_alloc),
+    }
+    if use_neo4j and rows <= args.neo4j_max_rows:
+        driver, _ = neo4j_session()
+        if driver is not None:
+            print(f"[{rows} rows] neo4j ...", flush=True)
+            result["neo4j"] = bench_neo4j(driver, path, rows, args.repeat)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--neo4j-max-rows", type=int, default=100_000,
+                        help="Ukuran terbesar yang di-import ke Neo4j (load_csv per row lambat)")
+    parser.add_argument("--skip-neo4j", action="store_true")
+    parser.add_argument("--skip-alloc", action="store_true", help="Tanpa run tambahan tracemalloc per step")
+    parser.add_argument("--out", default="benchmark-report.json")
+    args = parser.parse_args()
+
+    driver, neo4j_skip = (None, "disabled (--skip-neo4j)") if args.skip_neo4j else neo4j_session()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+        },
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "neo4j": neo4j_skip or "enabled",
+        "sizes": {},
+    }
+
+    # Satu proses per ukuran: ru_maxrss tidak pernah turun dalam satu proses
+    context = multiprocessing.get_context("spawn")
+    for rows in args.sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            report["sizes"][str(rows)] = pool.submit(bench_size, rows, args, driver is not None).result()
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
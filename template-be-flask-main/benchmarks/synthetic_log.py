@@ -0,0 +1,122 @@
+"""
+Synthetic Agile Event Log
+=========================
+Generator event log sintetis dengan format yang sama seperti
+"Agile Event Log.csv": CaseID;NameActivity;timestamp;Resource;Role
+(timestamp MM-DD-YY HH:MM).
+
+Setiap case adalah satu user story yang berjalan melalui alur Agile dengan
+rework acak (review/test gagal kembali ke Develop). Output deterministik
+untuk seed yang sama.
+
+Usage:
+    PYTHONPATH=. python benchmarks/synthetic_log.py --rows 100000 --out /tmp/agile_100k.csv
+"""
+
+import argparse
+import csv
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+ROLES = {
+    "Product Owner": 4,
+    "Scrum Master": 3,
+    "Developer": 30,
+    "QA Engineer": 10,
+    "DevOps Engineer": 4,
+    "UX Designer": 5,
+}
+
+# (activity, role yang mengerjakan)
+FLOW = [
+    ("Create Story", "Product Owner"),
+    ("Refine Backlog", "Scrum Master"),
+    ("Design UI", "UX Designer"),
+    ("Estimate Story", "Developer"),
+    ("Develop", "Developer"),
+    ("Code Review", "Developer"),
+    ("Test", "QA Engineer"),
+    ("Deploy", "DevOps Engineer"),
+    ("Accept Story", "Product Owner"),
+]
+OPTIONAL = {"Design UI": 0.4, "Estimate Story": 0.8}
+REWORK_PROBABILITY = {"Code Review": 0.2, "Test": 0.25}
+
+HEADER = ["CaseID", "NameActivity", "timestamp", "Resource", "Role"]
+
+
+def _resources() -> List[Tuple[str, str]]:
+    return [(f"{role.split()[0]}_{i:03d}", role) for role, count in ROLES.items() for i in range(count)]
+
+
+def generate_events(rows: int, seed: int = 42, start: datetime = datetime(2019, 1, 7, 9)) -> Iterator[List[str]]:
+    """
+    Hasilkan tepat `rows` event (list kolom sesuai HEADER)
+
+    Args:
+        rows: Jumlah event
+        seed: Random seed
+        start: Waktu mulai case pertama
+    """
+    rng = random.Random(seed)
+    by_role = {}
+    for name, role in _resources():
+        by_role.setdefault(role, []).append(name)
+
+    emitted = 0
+    case_no = 0
+    case_start = start
+    while emitted < rows:
+        case_no += 1
+        case_id = f"US-{case_no:07d}"
+        case_start += timedelta(minutes=rng.randint(5, 90))
+        ts = case_start
+        # Satu developer memegang story dari Develop sampai Code Review
+        owner = rng.choice(by_role["Developer"])
+
+        step = 0
+        while step < len(FLOW) and emitted < rows:
+            activity, role = FLOW[step]
+            if activity in OPTIONAL and rng.random() > OPTIONAL[activity]:
+                step += 1
+                continue
+
+            if activity in ("Develop", "Estimate Story"):
+                resource = owner
+            elif activity == "Code Review":
+                resource = rng.choice([d for d in by_role["Developer"][:10] if d != owner] or [owner])
+            else:
+                resource = rng.choice(by_role[role])
+
+            ts += timedelta(hours=rng.expovariate(1 / 20), minutes=rng.randint(0, 59))
+            yield [case_id, activity, ts.strftime("%m-%d-%y %H:%M"), resource, role]
+            emitted += 1
+
+            if activity in REWORK_PROBABILITY and rng.random() < REWORK_PROBABILITY[activity]:
+                step = next(i for i, (a, _) in enumerate(FLOW) if a == "Develop")
+            else:
+                step += 1
+
+
+def write_log(path: str, rows: int, seed: int = 42) -> str:
+    """Tulis event log sintetis ke CSV (delimiter ';'), return path"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(HEADER)
+        writer.writerows(generate_events(rows, seed))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    write_log(args.out, args.rows, args.seed)
+    print(f"Wrote {args.rows} events to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,14 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 
     # ML Models Path
-    ML_MODELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_models')
+    ML_MODELS_PATH = os.getenv(
+        'ML_MODELS_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_models')
+    )
+
+    # Request instrumentation: ?profile=1 sampling profiler
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', '1'))
 
     # ===========================================
     # Database (Optional - uncomment jika perlu)
@@ -43,6 +50,7 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'true').lower() == 'true'
 
 
 class ProductionConfig(Config):
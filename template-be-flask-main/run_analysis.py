@@ -1,8 +1,7 @@
-import csv
 import os
-from datetime import datetime
 from app.db.neo4j import neo4j_driver
 from app.services.analytics import AnalyticsService
+from app.services.importer import DataImporter
 
 DATA_DIR = "../data-analysis"
 FILES = [
@@ -11,80 +10,17 @@ FILES = [
     "Uncomplete Agile Event Log.csv"
 ]
 
-def parse_timestamp(ts_str):
-    # Format: 4-24-19 15:00 (MM-DD-YY HH:MM)
-    try:
-        dt = datetime.strptime(ts_str, "%m-%d-%y %H:%M")
-        # Neo4j prefers ISO 8601
-        return dt.isoformat(), dt.strftime("%Y-%m")
-    except ValueError:
-        return None, None
-
-def load_data(session, file_path):
+def load_data(importer, file_path):
     print(f"Loading {file_path}...")
-    count = 0
-    with open(file_path, 'r') as f:
-        reader = csv.DictReader(f, delimiter=';')
-        for row in reader:
-            # Data Quality Check
-            if not row['CaseID'] or not row['timestamp'] or not row['Resource']:
-                continue
-
-            iso_time, month = parse_timestamp(row['timestamp'])
-            if not iso_time:
-                continue
-
-            query = """
-            MERGE (p:Person {name: $resource})
-            SET p.role = $role
-            MERGE (r:Role {name: $role})
-            MERGE (c:Case {id: $case_id})
-            CREATE (p)-[:WORKED_ON {
-                activity: $activity,
-                timestamp: datetime($timestamp),
-                month: $month,
-                source_file: $source_file
-            }]->(c)
-            """
-            session.run(query, 
-                        resource=row['Resource'],
-                        role=row['Role'],
-                        case_id=row['CaseID'],
-                        activity=row['NameActivity'],
-                        timestamp=iso_time,
-                        month=month,
-                        source_file=os.path.basename(file_path))
-            count += 1
+    # Parse dari cache columnar jika CSV tidak berubah sejak load terakhir
+    count = importer.load_csv(file_path)
     print(f"Loaded {count} rows from {file_path}")
 
-def project_graph(session):
+def project_graph(importer):
     print("Projecting Graph Relationships...")
-    
-    # 1. User Collaborations (Person -> Person)
-    # People working on the same Case in the same Month
-    print("  - Creating COLLABORATED_IN relationships...")
-    query_collab = """
-    MATCH (p1:Person)-[w1:WORKED_ON]->(c:Case)<-[w2:WORKED_ON]-(p2:Person)
-    WHERE p1 <> p2 AND w1.month = w2.month
-    MERGE (p1)-[r:COLLABORATED_IN {month: w1.month}]-(p2)
-    ON CREATE SET r.weight = 1
-    ON MATCH SET r.weight = r.weight + 1
-    """
-    session.run(query_collab)
-
-    # 2. Role Interactions (Role -> Role)
-    # Derived from User Collaborations
-    print("  - Creating INTERACTS_WITH relationships...")
-    query_roles = """
-    MATCH (p1:Person)-[r:COLLABORATED_IN]-(p2:Person)
-    MATCH (r1:Role {name: p1.role})
-    MATCH (r2:Role {name: p2.role})
-    WHERE r1 <> r2
-    MERGE (r1)-[i:INTERACTS_WITH]->(r2)
-    ON CREATE SET i.total_weight = r.weight
-    ON MATCH SET i.total_weight = i.total_weight + r.weight
-    """
-    session.run(query_roles)
+    # COLLABORATED_IN (Person -> Person, same Case in the same Month)
+    # lalu INTERACTS_WITH (Role -> Role) dari COLLABORATED_IN
+    importer.project_graph()
 
 def analyze_data(session):
     print("\n=== ANALYSIS RESULTS ===")
@@ -127,20 +63,22 @@ def analyze_data(session):
 
 def main():
     with neo4j_driver.get_session() as session:
+        importer = DataImporter(session)
+
         # Clear DB for clean analysis
         print("Clearing Database...")
-        session.run("MATCH (n) DETACH DELETE n")
+        importer.clear_database()
 
-        # Load
+        # Load (case lifecycle summary dan counter overtime ditulis saat import)
         for filename in FILES:
             file_path = os.path.join(DATA_DIR, filename)
             if os.path.exists(file_path):
-                load_data(session, file_path)
+                load_data(importer, file_path)
             else:
                 print(f"File not found: {file_path}")
 
         # Project
-        project_graph(session)
+        project_graph(importer)
 
         # Analyze
         analyze_data(session)
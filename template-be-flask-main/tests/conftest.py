@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Sample event log di repo (dipakai run_analysis.py)
+SAMPLE_DIR = os.path.join(ROOT, "..", "data-analysis")
+SAMPLE_FILES = [
+    "Agile Event Log.csv",
+    "Similar Agile Event Log.csv",
+    "Uncomplete Agile Event Log.csv",
+]
+
+
+@pytest.fixture
+def sample_paths():
+    paths = [os.path.join(SAMPLE_DIR, name) for name in SAMPLE_FILES]
+    if not all(os.path.exists(path) for path in paths):
+        pytest.skip("sample event logs not found in ../data-analysis")
+    return paths
+
+
+@pytest.fixture
+def neo4j_session():
+    """
+    Session ke database test kosong. Test integrasi menghapus seluruh isi
+    database, jadi hanya jalan jika NEO4J_TEST_URI diset secara eksplisit.
+    """
+    uri = os.environ.get("NEO4J_TEST_URI")
+    if not uri:
+        pytest.skip("NEO4J_TEST_URI not set")
+
+    from neo4j import GraphDatabase
+
+    from app.config import settings
+
+    driver = GraphDatabase.driver(uri, auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD))
+    try:
+        driver.verify_connectivity()
+    except Exception as e:  # noqa: BLE001
+        driver.close()
+        pytest.skip(f"Neo4j unreachable: {e}")
+    try:
+        with driver.session() as session:
+            yield session
+    finally:
+        driver.close()
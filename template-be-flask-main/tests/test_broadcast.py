@@ -0,0 +1,45 @@
+import asyncio
+
+from app.core.broadcast import Broadcaster
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, timeout=2))
+
+
+def test_publish_during_send_is_not_delayed_until_keepalive():
+    async def scenario():
+        broadcaster = Broadcaster(keepalive_seconds=60)
+        broadcaster.bind(asyncio.get_running_loop())
+        broadcaster.publish("1", "graph-version", {"version": 1})
+        stream = broadcaster.subscribe()
+        await stream.__anext__()  # retry
+        first = await stream.__anext__()
+        # Subscriber masih tertahan di yield event 1
+        broadcaster.publish("2", "graph-version", {"version": 2})
+        second = await stream.__anext__()
+        broadcaster.close()
+        return first, second
+
+    first, second = run(scenario())
+    assert first.startswith(b"id: 1\n")
+    assert second.startswith(b"id: 2\n")
+
+
+def test_close_ends_waiting_subscribers():
+    async def scenario():
+        broadcaster = Broadcaster(keepalive_seconds=60)
+        broadcaster.bind(asyncio.get_running_loop())
+
+        async def drain():
+            return [chunk async for chunk in broadcaster.subscribe()]
+
+        tasks = [asyncio.create_task(drain()) for _ in range(10)]
+        await asyncio.sleep(0)
+        broadcaster.close()
+        streams = await asyncio.gather(*tasks)
+        return streams, broadcaster.subscribers
+
+    streams, subscribers = run(scenario())
+    assert all(chunks == [b"retry: 3000\n\n"] for chunks in streams)
+    assert subscribers == 0
@@ -0,0 +1,30 @@
+from app.services.activity_sketch import bitset_union_count
+from app.services.importer import DataImporter
+
+
+def test_role_sketches_follow_role_changes_across_files(neo4j_session, sample_paths):
+    # Beberapa person pindah role antar file (mis. Tester <-> Developer);
+    # sketch dataset lama harus ikut memakai role terbaru
+    importer = DataImporter(neo4j_session)
+    importer.clear_database()
+    for path in sample_paths:
+        importer.load_csv(path)
+
+    sketches = {}
+    for record in neo4j_session.run(
+        "MATCH (a:MonthActivity) RETURN a.month as month, a.people_bits as people, a.roles_bits as roles"
+    ):
+        sketches.setdefault(record["month"], []).append(record)
+
+    expected = {
+        record["month"]: (record["people"], record["roles"])
+        for record in neo4j_session.run("""
+        MATCH (p:Person)-[w:WORKED_ON]->()
+        RETURN w.month as month, count(DISTINCT p) as people, count(DISTINCT p.role) as roles
+        """)
+    }
+    assert set(sketches) == set(expected)
+    for month, records in sketches.items():
+        people = bitset_union_count(r["people"] for r in records)
+        roles = bitset_union_count(r["roles"] for r in records)
+        assert (people, roles) == expected[month], month
@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def wait_for_coalesced(flight, count):
+    """Tunggu sampai `count` caller tergabung ke leader yang sedang berjalan"""
+    for _ in range(500):
+        if flight.snapshot()["coalesced"] == count:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"only {flight.snapshot()['coalesced']} callers coalesced")
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "k", compute) for _ in range(8)]
+        wait_for_coalesced(flight, 7)
+        release.set()
+        results = [future.result(5) for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.snapshot() == {"executed": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_error_is_shared_and_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("neo4j down")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "k", fail) for _ in range(4)]
+        wait_for_coalesced(flight, 3)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="neo4j down"):
+                future.result(5)
+
+    # Tidak ada caching: panggilan berikutnya menjalankan fn lagi
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.snapshot()["executed"] == 2
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    assert [flight.do(key, lambda key=key: key * 2) for key in (1, 2, 1)] == [2, 4, 2]
+    assert flight.snapshot() == {"executed": 3, "coalesced": 0, "in_flight": 0}
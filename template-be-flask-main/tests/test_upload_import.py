@@ -0,0 +1,197 @@
+import asyncio
+import calendar
+import random
+
+import pytest
+
+from app.services import event_log_store
+from app.services.upload_import import (
+    MAX_LINE_LENGTH,
+    EventCsvParser,
+    MultipartFileReader,
+    UploadError,
+    open_upload,
+)
+
+BOUNDARY = b"----test-boundary-7MA4YWxk"
+CONTENT_TYPE = "multipart/form-data; boundary=" + BOUNDARY.decode()
+
+
+def expected_rows(path):
+    """Rows event_log_store.parse_csv dalam urutan file: (case, activity, epoch, resource, role)"""
+    log, _ = event_log_store.parse_csv(path)
+    order = log.source_order()
+    return [
+        (log.cases[case], log.activities[activity], ts, log.resources[resource], log.roles[role])
+        for case, activity, ts, resource, role in zip(
+            log.case_codes[order].tolist(),
+            log.activity_codes[order].tolist(),
+            log.timestamps[order].tolist(),
+            log.resource_codes[order].tolist(),
+            log.role_codes[order].tolist(),
+        )
+    ]
+
+
+def as_epoch(rows):
+    return [
+        (case, activity, calendar.timegm(dt.timetuple()), resource, role)
+        for case, activity, dt, resource, role in rows
+    ]
+
+
+def fixed_chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def random_chunks(data, seed):
+    rng = random.Random(seed)
+    chunks, i = [], 0
+    while i < len(data):
+        size = rng.randint(1, 300)
+        chunks.append(data[i:i + size])
+        i += size
+    return chunks
+
+
+async def stream(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def parse(chunks):
+    parser = EventCsvParser()
+    rows = []
+    for chunk in chunks:
+        rows.extend(parser.feed(chunk))
+    rows.extend(parser.close())
+    return parser, rows
+
+
+def multipart_body(csv_bytes, filename="events.csv"):
+    # Field biasa sebelum dan sesudah part file harus dilewati
+    return b"".join([
+        b"--" + BOUNDARY + b"\r\n",
+        b'Content-Disposition: form-data; name="note"\r\n\r\n',
+        b"not a file\r\n",
+        b"--" + BOUNDARY + b"\r\n",
+        b'Content-Disposition: form-data; name="file"; filename="' + filename.encode() + b'"\r\n',
+        b"Content-Type: text/csv\r\n\r\n",
+        csv_bytes,
+        b"\r\n--" + BOUNDARY + b"\r\n",
+        b'Content-Disposition: form-data; name="project"\r\n\r\n',
+        b"true\r\n",
+        b"--" + BOUNDARY + b"--\r\n",
+    ])
+
+
+def read_multipart(chunks):
+    async def collect():
+        csv_chunks, source_file = await open_upload(stream(chunks), CONTENT_TYPE)
+        return b"".join([chunk async for chunk in csv_chunks]), source_file
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("split", ["whole", "bytes", "random"])
+def test_parser_matches_parse_csv(sample_paths, split):
+    for path in sample_paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        chunks = {
+            "whole": [data],
+            "bytes": fixed_chunks(data, 1),
+            "random": random_chunks(data, seed=len(data)),
+        }[split]
+        _, rows = parse(chunks)
+        assert as_epoch(rows) == expected_rows(path), path
+
+
+@pytest.mark.parametrize("split", ["bytes", "random"])
+def test_multipart_file_part_matches_parse_csv(sample_paths, split):
+    path = sample_paths[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    body = multipart_body(data)
+    chunks = fixed_chunks(body, 1) if split == "bytes" else random_chunks(body, seed=7)
+
+    csv_bytes, source_file = read_multipart(chunks)
+    assert source_file == "events.csv"
+    assert csv_bytes == data
+    _, rows = parse(random_chunks(csv_bytes, seed=11))
+    assert as_epoch(rows) == expected_rows(path)
+
+
+def test_multipart_boundary_split_across_every_offset():
+    csv_bytes = b"CaseID;NameActivity;timestamp;Resource;Role\r\nc1;A;04-08-19 0:02;Diana;Customer\r\n"
+    body = multipart_body(csv_bytes)
+    for cut in range(1, len(body)):
+        assert read_multipart([body[:cut], body[cut:]]) == (csv_bytes, "events.csv"), cut
+
+
+def test_multipart_empty_file_part_reports_empty_upload():
+    csv_bytes, _ = read_multipart([multipart_body(b"")])
+    assert csv_bytes == b""
+    with pytest.raises(UploadError, match="Empty upload"):
+        parse([csv_bytes])
+
+
+def test_multipart_without_file_part():
+    body = (
+        b"--" + BOUNDARY + b"\r\n"
+        b'Content-Disposition: form-data; name="note"\r\n\r\n'
+        b"hello\r\n"
+        b"--" + BOUNDARY + b"--\r\n"
+    )
+    with pytest.raises(UploadError, match="No file part"):
+        read_multipart(fixed_chunks(body, 3))
+
+
+def test_multipart_truncated_body():
+    body = multipart_body(b"CaseID;NameActivity;timestamp;Resource;Role\r\n")
+    with pytest.raises(UploadError, match="Unexpected end"):
+        read_multipart([body[:body.index(b"Role") + 4]])
+
+
+def test_multipart_reader_keeps_delimiter_lookalikes_in_body():
+    csv_bytes = b"a\r\n--" + BOUNDARY[:-1] + b"x\r\nb"
+    body = multipart_body(csv_bytes)
+
+    async def collect():
+        reader = MultipartFileReader(stream(fixed_chunks(body, 5)), BOUNDARY)
+        return b"".join([chunk async for chunk in reader.chunks()])
+
+    assert asyncio.run(collect()) == csv_bytes
+
+
+def test_overlong_line_is_rejected_after_complete_rows():
+    header = b"CaseID;NameActivity;timestamp;Resource;Role\n"
+    good = b"c1;A;04-08-19 0:02;Diana;Customer\n"
+    parser = EventCsvParser()
+    rows = parser.feed(header + good + b"x" * (MAX_LINE_LENGTH + 1))
+    assert len(rows) == 1
+    with pytest.raises(UploadError, match="longer than"):
+        parser.feed(b"more")
+
+
+def test_invalid_rows_are_counted_not_fatal():
+    data = (
+        b"CaseID;NameActivity;timestamp;Resource;Role\n"
+        b"c1;A;04-08-19 0:02;Diana;Customer\n"
+        b"c2;A;not a date;Diana;Customer\n"
+        b"c3;A;04-08-19 0:02;;Customer\n"
+        b"c4;A\n"
+    )
+    parser, rows = parse(fixed_chunks(data, 4))
+    assert len(rows) == 1
+    assert parser.rejected == {
+        "invalid timestamp": 1,
+        "missing CaseID, timestamp or Resource": 1,
+        "wrong column count": 1,
+    }
+    assert [error["line"] for error in parser.errors] == [3, 4, 5]
+
+
+def test_missing_header_column():
+    with pytest.raises(UploadError, match="missing columns: Role"):
+        parse([b"CaseID;NameActivity;timestamp;Resource\n"])
@@ -1,45 +1,286 @@
-import httpx
+"""
+API smoke test & load generator
+
+    python verify_api.py                       # smoke test: satu request per endpoint
+    python verify_api.py load -c 32 -d 30      # load test 32 concurrent client, 30 detik
+    python verify_api.py load --mix organization=4,users=2,roles=1,bpmn=1
+    python verify_api.py load --ramp --ramp-start 4 --ramp-max 256 -d 10
+
+Load mode melaporkan throughput, latency percentiles dan error rate per
+endpoint. Ramp mode menaikkan concurrency (x2 per step) sampai throughput
+berhenti naik, p99 melewati --max-p99-ms atau error rate melewati
+--max-error-rate, lalu melaporkan titik saturasi.
+"""
+
+import argparse
 import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
 
 BASE_URL = "http://localhost:8000"
 
-async def test_endpoints():
+# (group, path, params); group dipakai untuk bobot --mix
+ENDPOINTS: List[Tuple[str, str, Dict[str, object]]] = [
+    ("organization", "/organization/evolution", {"start_month": "2024-01", "end_month": "2024-03"}),
+    ("organization", "/organization/evolution-trend", {"start_month": "2024-01", "end_month": "2024-12"}),
+    ("organization", "/organization/interactions-trend", {}),
+    ("organization", "/organization/overtime", {}),
+    ("organization", "/organization/project-durations", {}),
+    ("organization", "/organization/project-durations/average", {}),
+    ("organization", "/organization/handovers", {}),
+    ("organization", "/organization/utilization", {}),
+    ("organization", "/organization/variants", {"top_k": 10}),
+    ("roles", "/roles/interactions", {}),
+    ("roles", "/roles/top-interactions", {"limit": 5}),
+    ("roles", "/roles/all", {}),
+    ("users", "/users/collaboration", {"month": "2024-04"}),
+    ("users", "/users/all", {}),
+    ("users", "/users/centrality", {"limit": 20}),
+    ("users", "/users/communities", {}),
+    ("bpmn", "/bpmn/data", {}),
+    ("bpmn", "/bpmn/roles", {}),
+    ("dashboard", "/dashboard", {"start_month": "2024-01", "end_month": "2024-12"}),
+]
+
+DEFAULT_MIX = "organization=4,roles=1,users=2,bpmn=1"
+
+async def test_endpoints(base_url: str = BASE_URL):
     async with httpx.AsyncClient() as client:
         print("Testing API Endpoints...")
         
         # 1. Root
         try:
-            resp = await client.get(f"{BASE_URL}/")
+            resp = await client.get(f"{base_url}/")
             print(f"GET /: {resp.status_code}")
         except Exception as e:
-            print(f"Failed to connect to {BASE_URL}. Is the server running?")
+            print(f"Failed to connect to {base_url}. Is the server running?")
             return
 
         # 2. Organization Evolution
-        resp = await client.get(f"{BASE_URL}/organization/evolution", params={"start_month": "2024-01", "end_month": "2024-03"})
+        resp = await client.get(f"{base_url}/organization/evolution", params={"start_month": "2024-01", "end_month": "2024-03"})
         print(f"GET /organization/evolution: {resp.status_code}")
         if resp.status_code == 200:
             print(f"  -> {resp.json()}")
 
         # 3. Role Interactions
-        resp = await client.get(f"{BASE_URL}/roles/interactions")
+        resp = await client.get(f"{base_url}/roles/interactions")
         print(f"GET /roles/interactions: {resp.status_code}")
         
         # 4. Top Interactions
-        resp = await client.get(f"{BASE_URL}/roles/top-interactions", params={"limit": 5})
+        resp = await client.get(f"{base_url}/roles/top-interactions", params={"limit": 5})
         print(f"GET /roles/top-interactions: {resp.status_code}")
         if resp.status_code == 200:
             print(f"  -> {resp.json()[:2]} ...")
 
         # 5. User Collaboration
-        resp = await client.get(f"{BASE_URL}/users/collaboration", params={"month": "2024-04"})
+        resp = await client.get(f"{base_url}/users/collaboration", params={"month": "2024-04"})
         print(f"GET /users/collaboration: {resp.status_code}")
         if resp.status_code == 200:
             print(f"  -> {resp.json()[:2]} ...")
 
         # 6. BPMN Data
-        resp = await client.get(f"{BASE_URL}/bpmn/data")
+        resp = await client.get(f"{base_url}/bpmn/data")
         print(f"GET /bpmn/data: {resp.status_code}")
 
+
+def parse_mix(mix: str) -> List[float]:
+    """
+    Bobot per endpoint dari "group=weight,..."; bobot group dibagi rata ke endpoint-nya
+
+    Raises:
+        ValueError: group tidak dikenal, bobot bukan angka/negatif, atau total bobot 0
+    """
+    per_group = defaultdict(int)
+    for group, _, _ in ENDPOINTS:
+        per_group[group] += 1
+    group_weights = {}
+    for part in mix.split(","):
+        group, _, weight = part.partition("=")
+        group = group.strip()
+        if group not in per_group:
+            raise ValueError(f"unknown group {group!r} in --mix (known: {', '.join(per_group)})")
+        try:
+            group_weights[group] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"invalid weight {weight!r} for group {group!r} in --mix") from None
+        if group_weights[group] < 0:
+            raise ValueError(f"negative weight for group {group!r} in --mix")
+    if not any(group_weights.values()):
+        raise ValueError("--mix gives every endpoint weight 0")
+    return [group_weights.get(group, 0.0) / per_group[group] for group, _, _ in ENDPOINTS]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(int(round(q / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+class LoadStats:
+    """Latency (ms) dan error per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, path: str, ms: float, status: Optional[int]) -> None:
+        self.latencies[path].append(ms)
+        self.status[path][str(status) if status is not None else "error"] += 1
+        if status is None or status >= 400:
+            self.errors[path] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, object]:
+        endpoints = {}
+        all_latencies = []
+        for path, values in sorted(self.latencies.items()):
+            values.sort()
+            all_latencies.extend(values)
+            endpoints[path] = self._describe(values, self.errors[path], elapsed)
+            endpoints[path]["status"] = dict(self.status[path])
+        all_latencies.sort()
+        total = self._describe(all_latencies, sum(self.errors.values()), elapsed)
+        return {"elapsed_s": round(elapsed, 2), "total": total, "endpoints": endpoints}
+
+    @staticmethod
+    def _describe(values: List[float], errors: int, elapsed: float) -> Dict[str, object]:
+        count = len(values)
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 1) if elapsed else 0.0,
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "p50_ms": round(percentile(values, 50), 2),
+            "p90_ms": round(percentile(values, 90), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+        }
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, weights: List[float],
+                   timeout: float, seed: Optional[int] = None) -> Dict[str, object]:
+    """Jalankan `concurrency` worker selama `duration` detik"""
+    stats = LoadStats()
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                _, path, params = rng.choices(ENDPOINTS, weights)[0]
+                started = time.perf_counter()
+                try:
+                    resp = await client.get(path, params=params)
+                    await resp.aread()
+                    status = resp.status_code
+                except httpx.HTTPError:
+                    status = None
+                stats.record(path, (time.perf_counter() - started) * 1000, status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result = stats.summary(elapsed)
+    result["concurrency"] = concurrency
+    return result
+
+
+async def run_ramp(args, weights: List[float]) -> Dict[str, object]:
+    """Naikkan concurrency sampai throughput/latency/error menunjukkan saturasi"""
+    steps = []
+    best = None
+    concurrency = args.ramp_start
+    reason = f"reached --ramp-max {args.ramp_max}"
+    while concurrency <= args.ramp_max:
+        result = await run_load(args.base_url, concurrency, args.duration, weights, args.timeout, args.seed)
+        total = result["total"]
+        steps.append({"concurrency": concurrency, **total})
+        print_step(concurrency, total)
+
+        if total["error_rate"] > args.max_error_rate:
+            reason = f"error rate {total['error_rate']:.2%} > {args.max_error_rate:.2%}"
+            break
+        if total["p99_ms"] > args.max_p99_ms:
+            reason = f"p99 {total['p99_ms']} ms > {args.max_p99_ms} ms"
+            break
+        if best is not None and total["rps"] < best["rps"] * (1 + args.min_gain):
+            reason = f"throughput gain < {args.min_gain:.0%}"
+            if total["rps"] > best["rps"]:
+                best = {"concurrency": concurrency, **total}
+            break
+        best = {"concurrency": concurrency, **total}
+        concurrency *= 2
+
+    return {"steps": steps, "saturation": best, "stop_reason": reason}
+
+
+def print_step(concurrency: int, total: Dict[str, object]) -> None:
+    print(f"  c={concurrency:<4} rps={total['rps']:<8} p50={total['p50_ms']:<8} "
+          f"p99={total['p99_ms']:<8} errors={total['error_rate']:.2%}")
+
+
+def print_report(result: Dict[str, object]) -> None:
+    print(f"\n{'endpoint':<42} {'req':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["total"])]
+    for path, s in rows:
+        print(f"{path:<42} {s['requests']:>7} {s['rps']:>8} {s['error_rate'] * 100:>6.2f} "
+              f"{s['p50_ms']:>8} {s['p90_ms']:>8} {s['p99_ms']:>8} {s['max_ms']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    sub = parser.add_subparsers(dest="command")
+
+    load = sub.add_parser("load", help="Concurrent load test")
+    # SUPPRESS: tanpa flag ini di subcommand, nilai --base-url top-level tetap dipakai
+    load.add_argument("--base-url", default=argparse.SUPPRESS)
+    load.add_argument("-c", "--concurrency", type=int, default=16)
+    load.add_argument("-d", "--duration", type=float, default=30, help="Detik per run (per step saat --ramp)")
+    load.add_argument("--mix", default=DEFAULT_MIX, help="Bobot per group route, mis. organization=4,users=2")
+    load.add_argument("--timeout", type=float, default=30)
+    load.add_argument("--seed", type=int)
+    load.add_argument("--json", dest="json_out", help="Tulis hasil ke file JSON")
+    load.add_argument("--ramp", action="store_true", help="Cari titik saturasi")
+    load.add_argument("--ramp-start", type=int, default=4)
+    load.add_argument("--ramp-max", type=int, default=512)
+    load.add_argument("--min-gain", type=float, default=0.05, help="Kenaikan rps minimal per step")
+    load.add_argument("--max-p99-ms", type=float, default=2000)
+    load.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    if args.command != "load":
+        asyncio.run(test_endpoints(args.base_url))
+        return
+
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        load.error(str(e))
+    if args.ramp:
+        print(f"Ramp test against {args.base_url} ({args.duration}s per step, mix {args.mix})")
+        result = asyncio.run(run_ramp(args, weights))
+        sat = result["saturation"]
+        print(f"\nStopped: {result['stop_reason']}")
+        if sat:
+            print(f"Saturation point: concurrency {sat['concurrency']} -> {sat['rps']} rps, p99 {sat['p99_ms']} ms")
+    else:
+        print(f"Load test against {args.base_url}: {args.concurrency} clients, {args.duration}s, mix {args.mix}")
+        result = asyncio.run(run_load(args.base_url, args.concurrency, args.duration, weights, args.timeout, args.seed))
+        print_report(result)
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Result written to {args.json_out}")
+
+
 if __name__ == "__main__":
-    asyncio.run(test_endpoints())
+    main()